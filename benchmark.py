@@ -0,0 +1,788 @@
+import os
+import sys
+import gc
+import json
+import math
+import time
+import random
+import shutil
+import socket
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+import tracemalloc
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5 import QtWidgets, QtGui, QtCore
+
+import pointer_app
+
+RESOLUTIONS = [(1280, 720), (1920, 1080), (2560, 1440), (3840, 2160)]
+ROTATIONS = [0, -7, -15]
+CURSOR_PATHS = ['circle', 'zigzag', 'random_walk']
+DEFAULT_OUTPUT = 'benchmark_results.json'
+FILTER_SAMPLE_MS = 8
+FILTER_JITTER_PX = 1.5
+FILTER_CONFIGS = [
+    ('raw', None),
+    ('one_euro', {'filter_min_cutoff': 1.0, 'filter_beta': 0.007, 'prediction_ms': 0}),
+    ('one_euro_predict_16ms', {'filter_min_cutoff': 1.0, 'filter_beta': 0.007, 'prediction_ms': 16}),
+]
+STYLE_CONFIGS = [
+    ('pointer', {}),
+    ('spotlight_r140', {'pointer_style': 'spotlight', 'spotlight_radius': 140}),
+    ('spotlight_r280', {'pointer_style': 'spotlight', 'spotlight_radius': 280}),
+    ('magnifier_200', {'pointer_style': 'magnifier', 'magnifier_size': 200}),
+    ('magnifier_400', {'pointer_style': 'magnifier', 'magnifier_size': 400}),
+]
+STYLE_RESOLUTIONS = [(1280, 720), (3840, 2160)]
+BACKDROP_ZOOMS = [('fit', None), ('1:1', 1.0), ('4:1', 4.0)]
+BACKDROP_CACHE_MB = 32
+BACKDROP_DECODE_LIMIT = 16 * 1024 * 1024
+EFFECT_CONFIGS = [
+    ('off', False, 1),
+    ('on_1_click_per_frame', True, 1),
+    ('on_5_clicks_per_frame', True, 5),
+]
+
+class NullClickSound(QtCore.QObject):
+    sound_started = QtCore.pyqtSignal(float)
+
+    def __init__(self, sound_path, volume, voices=pointer_app.CLICK_VOICES, parent=None):
+        super().__init__(parent)
+        self.plays = 0
+
+    def set_volume(self, volume):
+        pass
+
+    def play(self):
+        self.plays += 1
+        self.sound_started.emit(0.0)
+
+    def stop(self):
+        pass
+
+class NullHoldSound(QtCore.QObject):
+    def __init__(self, sound_path, volume, parent=None):
+        super().__init__(parent)
+        self.memory_bytes = 0
+        self.playing = False
+
+    def set_volume(self, volume):
+        pass
+
+    def play(self):
+        self.playing = True
+
+    def release(self):
+        self.playing = False
+
+    def stop(self):
+        self.playing = False
+
+def stub_audio():
+    pointer_app.ClickSoundEngine = NullClickSound
+    pointer_app.HoldLoopPlayer = NullHoldSound
+
+def isolate_user_data(root):
+    pointer_app.SETTINGS_FILE = os.path.join(root, 'settings.json')
+    pointer_app.CACHE_PATH = os.path.join(root, 'cache')
+    pointer_app.PACKS_PATH = os.path.join(root, 'packs')
+    pointer_app.TRACES_PATH = os.path.join(root, 'traces')
+    pointer_app.RECORDINGS_PATH = os.path.join(root, 'recordings')
+    pointer_app._asset_cache = None
+
+def stage_app(root):
+    source = os.path.dirname(os.path.abspath(pointer_app.__file__))
+    script = os.path.join(root, 'pointer_app.py')
+    shutil.copy2(os.path.join(source, 'pointer_app.py'), script)
+    if os.path.exists(pointer_app.ICON_PATH):
+        shutil.copy2(pointer_app.ICON_PATH, os.path.join(root, 'icon.ico'))
+    shutil.copytree(pointer_app.ASSETS_PATH, os.path.join(root, 'src', 'assets'))
+    return script
+
+def bench_settings(**overrides):
+    settings = dict(pointer_app.DEFAULT_SETTINGS)
+    settings['input_backend'] = 'poll'
+    settings.update(overrides)
+    return settings
+
+def rss_bytes():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def describe(samples):
+    samples = sorted(samples)
+    return {
+        'count': len(samples),
+        'mean_ms': statistics.fmean(samples),
+        'median_ms': statistics.median(samples),
+        'p95_ms': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        'min_ms': samples[0],
+        'max_ms': samples[-1],
+    }
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return describe(samples)
+
+def cursor_path(kind, count, width, height, seed=1):
+    rng = random.Random(seed)
+    x, y = width // 2, height // 2
+    for i in range(count):
+        if kind == 'circle':
+            angle = 2 * math.pi * i / 240
+            x = int(width / 2 + math.cos(angle) * width / 3)
+            y = int(height / 2 + math.sin(angle) * height / 3)
+        elif kind == 'zigzag':
+            x = (i * 17) % width
+            y = height // 4 + (i * 9) % (height // 2)
+        else:
+            x = min(max(x + rng.randint(-12, 12), 0), width - 1)
+            y = min(max(y + rng.randint(-12, 12), 0), height - 1)
+        yield QtCore.QPoint(x, y)
+
+def pump(app):
+    app.processEvents()
+
+def make_overlay(settings=None):
+    return pointer_app.CursorOverlay(
+        os.path.join(pointer_app.ASSETS_PATH, pointer_app.CURSORS[0][1]),
+        pointer_app.SOUND_CLICK, pointer_app.SOUND_LOOP, settings or bench_settings()
+    )
+
+def repaint(overlay, image, region, flags):
+    painter = QtGui.QPainter(image)
+    painter.setCompositionMode(QtGui.QPainter.CompositionMode_Source)
+    painter.setClipRegion(region)
+    painter.fillRect(region.boundingRect(), QtCore.Qt.transparent)
+    painter.end()
+    overlay.render(image, QtCore.QPoint(), region, flags)
+
+def bench_paint(app, repeat):
+    results = []
+    overlay = make_overlay()
+    overlay.resources.input_source.stop()
+    for width, height in RESOLUTIONS:
+        overlay.resize(width, height)
+        image = QtGui.QImage(width, height, QtGui.QImage.Format_ARGB32_Premultiplied)
+        image.fill(QtCore.Qt.transparent)
+        flags = QtWidgets.QWidget.RenderFlags(QtWidgets.QWidget.DrawChildren)
+        for rotation in ROTATIONS:
+            overlay.rotation = rotation
+            overlay.cursor_pos = QtCore.QPoint(width // 2, height // 2)
+            overlay.update_pointer()
+            dirty = QtGui.QRegion(overlay._painted_rect)
+            full = QtGui.QRegion(0, 0, width, height)
+            results.append({
+                'resolution': f'{width}x{height}',
+                'rotation': rotation,
+                'dirty_area': overlay._painted_rect.width() * overlay._painted_rect.height(),
+                'dirty': timed(lambda: repaint(overlay, image, dirty, flags), repeat),
+                'full': timed(lambda: repaint(overlay, image, full, flags), max(1, repeat // 10)),
+            })
+            pump(app)
+    overlay.close_overlay()
+    return results
+
+def bench_pointer_style(app, moves):
+    screen = QtWidgets.QApplication.primaryScreen()
+    results = {
+        'grab_full_ms': timed(lambda: screen.grabWindow(0), 10),
+        'grab_region_ms': timed(lambda: screen.grabWindow(0, 0, 0, 100, 100), 10),
+        'styles': [],
+    }
+    flags = QtWidgets.QWidget.RenderFlags(QtWidgets.QWidget.DrawChildren)
+    for name, overrides in STYLE_CONFIGS:
+        overlay = make_overlay(bench_settings(**overrides))
+        overlay.resources.input_source.stop()
+        pump(app)
+        for width, height in STYLE_RESOLUTIONS:
+            captures = overlay.resources.style_buffers.captures
+            overlay.resize(width, height)
+            image = QtGui.QImage(width, height, QtGui.QImage.Format_ARGB32_Premultiplied)
+            image.fill(QtCore.Qt.transparent)
+            samples = []
+            areas = []
+            for point in cursor_path('random_walk', moves, width, height):
+                start = time.perf_counter()
+                previous = overlay._painted_rect
+                overlay.cursor_pos = point
+                overlay.update_pointer()
+                dirty = previous.united(overlay._painted_rect)
+                overlay.render(image, QtCore.QPoint(), QtGui.QRegion(dirty), flags)
+                samples.append((time.perf_counter() - start) * 1000)
+                areas.append(dirty.width() * dirty.height())
+            results['styles'].append({
+                'style': name,
+                'resolution': f'{width}x{height}',
+                'move_ms': describe(samples),
+                'dirty_area': statistics.fmean(areas),
+                'captures': overlay.resources.style_buffers.captures - captures,
+            })
+            pump(app)
+        overlay.close_overlay()
+    pump(app)
+    return results
+
+def bench_poll(app, samples):
+    results = []
+    overlay = make_overlay()
+    source = overlay.resources.input_source
+    source.stop()
+    geometry = QtWidgets.QApplication.primaryScreen().geometry()
+    for kind in CURSOR_PATHS:
+        points = list(cursor_path(kind, samples, geometry.width(), geometry.height()))
+        start = time.perf_counter()
+        for point in points:
+            QtGui.QCursor.setPos(point)
+            source.poll()
+            pump(app)
+        elapsed = time.perf_counter() - start
+        handler_start = time.perf_counter()
+        for point in points:
+            overlay.handle_pointer_move(point)
+        handler_elapsed = time.perf_counter() - handler_start
+        results.append({
+            'path': kind,
+            'samples': samples,
+            'polls_per_second': samples / elapsed,
+            'poll_and_paint_ms': elapsed * 1000 / samples,
+            'handle_pointer_move_ms': handler_elapsed * 1000 / samples,
+        })
+    overlay.close_overlay()
+    return results
+
+def bench_annotation(app, strokes, points_per_stroke=40):
+    overlay = make_overlay(bench_settings(annotation_mode=True))
+    overlay.resources.input_source.stop()
+    width, height = overlay.width(), overlay.height()
+    image = QtGui.QImage(width, height, QtGui.QImage.Format_ARGB32_Premultiplied)
+    flags = QtWidgets.QWidget.RenderFlags(QtWidgets.QWidget.DrawChildren)
+    rng = random.Random(1)
+    checkpoints = []
+    samples = []
+    for i in range(strokes):
+        x, y = rng.randrange(width), rng.randrange(height)
+        overlay.cursor_pos = QtCore.QPoint(x, y)
+        overlay.handle_mouse_press()
+        for _ in range(points_per_stroke):
+            x = min(max(x + rng.randint(-15, 15), 0), width - 1)
+            y = min(max(y + rng.randint(-15, 15), 0), height - 1)
+            start = time.perf_counter()
+            overlay.cursor_pos = QtCore.QPoint(x, y)
+            overlay.extend_stroke()
+            overlay.update_pointer()
+            overlay.render(image, QtCore.QPoint(), QtGui.QRegion(overlay._painted_rect), flags)
+            samples.append((time.perf_counter() - start) * 1000)
+        overlay.handle_mouse_release()
+        overlay.tilt_animation.stop()
+        if (i + 1) % max(1, strokes // 5) == 0:
+            checkpoints.append({
+                'strokes': i + 1,
+                'segment_ms': describe(samples),
+                'layer_bytes': overlay.layer.memory_bytes(),
+                'undo_ms': timed(overlay.undo_annotation, 1)['mean_ms'],
+            })
+            samples = []
+    overlay.close_overlay()
+    pump(app)
+    return checkpoints
+
+def bench_remote(app, frames, burst=20):
+    probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    probe.bind(('127.0.0.1', 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    source = pointer_app.RemoteInputSource('127.0.0.1', port, 'bench')
+    source.start()
+    client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    emitted = []
+    source.moved.connect(lambda pos: emitted.append(time.perf_counter()))
+    latencies = []
+    seq = 0
+    for frame in range(frames):
+        sent = time.perf_counter()
+        for i in range(burst):
+            seq += 1
+            message = {'seq': seq, 'type': 'move', 'x': 10 + (frame * burst + i) % 500, 'y': 10 + frame % 300, 'token': 'bench'}
+            client.sendto(json.dumps(message).encode(), ('127.0.0.1', port))
+        stale = {'seq': seq - burst, 'type': 'move', 'x': 0, 'y': 0, 'token': 'bench'}
+        client.sendto(json.dumps(stale).encode(), ('127.0.0.1', port))
+        count = len(emitted)
+        deadline = sent + 0.5
+        while len(emitted) == count and time.perf_counter() < deadline:
+            app.processEvents(QtCore.QEventLoop.AllEvents, 1)
+        if len(emitted) > count:
+            latencies.append((emitted[-1] - sent) * 1000)
+        while source.pending and time.perf_counter() < deadline:
+            app.processEvents(QtCore.QEventLoop.AllEvents, 1)
+    client.close()
+    source.close()
+    return {
+        'frames': frames,
+        'packets_per_frame': burst,
+        'received': source.received,
+        'dropped_stale': source.dropped,
+        'moved_emits': len(emitted),
+        'latency_ms': describe(latencies),
+    }
+
+def bench_cursor_image(app, repeat):
+    overlay = make_overlay()
+    overlay.resources.input_source.stop()
+
+    def cold():
+        pointer_app.asset_cache().clear()
+        overlay.resources.frame_cache.clear()
+        overlay.update_cursor_image()
+
+    disk = pointer_app.asset_cache().disk
+    pointer_app.asset_cache().disk = None
+    try:
+        uncached = timed(cold, repeat)
+    finally:
+        pointer_app.asset_cache().disk = disk
+    results = {
+        'cold_uncached': uncached,
+        'cold': timed(cold, repeat),
+        'warm': timed(overlay.update_cursor_image, repeat * 10),
+    }
+    overlay.close_overlay()
+    pump(app)
+    return results
+
+def jerk(points):
+    total = 0.0
+    for (x0, y0), (x1, y1), (x2, y2) in zip(points, points[1:], points[2:]):
+        total += (x2 - 2 * x1 + x0) ** 2 + (y2 - 2 * y1 + y0) ** 2
+    return math.sqrt(total / max(1, len(points) - 2))
+
+def recorded_path(path):
+    return [(x, y) for t, kind, x, y in pointer_app.iter_recording(path) if kind == pointer_app.RECORD_MOVE]
+
+def bench_motion_filter(samples, lag_ms=0, seed=1, replay=None):
+    results = []
+    width, height = RESOLUTIONS[1]
+    rng = random.Random(seed)
+    lag = int(lag_ms / FILTER_SAMPLE_MS)
+    paths = {kind: [(p.x(), p.y()) for p in cursor_path(kind, samples, width, height)] for kind in CURSOR_PATHS}
+    if replay:
+        paths['recording'] = recorded_path(replay)
+    for kind, clean in paths.items():
+        noisy = [(x + rng.gauss(0, FILTER_JITTER_PX), y + rng.gauss(0, FILTER_JITTER_PX)) for x, y in clean]
+        for name, config in FILTER_CONFIGS:
+            motion_filter = None
+            if config is not None:
+                motion_filter = pointer_app.MotionFilter(config['filter_min_cutoff'], config['filter_beta'], config['prediction_ms'])
+            output = []
+            start = time.perf_counter()
+            for i, (x, y) in enumerate(noisy):
+                if motion_filter is not None:
+                    x, y = motion_filter.filter(x, y, i * FILTER_SAMPLE_MS / 1000)
+                output.append((x, y))
+            elapsed = time.perf_counter() - start
+            retained = 0
+            if motion_filter is not None:
+                motion_filter.reset()
+                tracemalloc.start()
+                for i, (x, y) in enumerate(noisy):
+                    motion_filter.filter(x, y, i * FILTER_SAMPLE_MS / 1000)
+                retained = tracemalloc.get_traced_memory()[0]
+                tracemalloc.stop()
+            shown = output[:len(output) - lag] if lag else output
+            target = clean[lag:]
+            error = [math.hypot(x - tx, y - ty) for (x, y), (tx, ty) in zip(shown, target)]
+            results.append({
+                'path': kind,
+                'filter': name,
+                'jitter_px': jerk(output),
+                'mean_error_px': statistics.fmean(error),
+                'p95_error_px': sorted(error)[int(len(error) * 0.95)],
+                'filter_us': elapsed * 1e6 / max(1, len(noisy)),
+                'retained_bytes': retained,
+            })
+    return results
+
+def bench_replay(app, path):
+    events = list(pointer_app.iter_recording(path))
+    overlay = make_overlay()
+    overlay.resources.input_source.stop()
+    start = time.perf_counter()
+    for event_time, kind, x, y in events:
+        if kind == pointer_app.RECORD_MOVE:
+            overlay.handle_pointer_move(QtCore.QPoint(x, y))
+        else:
+            overlay.handle_left_button(kind == pointer_app.RECORD_BUTTON_DOWN)
+        pump(app)
+    elapsed = time.perf_counter() - start
+    overlay.close_overlay()
+    pump(app)
+    return {
+        'file': os.path.basename(path),
+        'events': len(events),
+        'duration_s': events[-1][0] if events else 0.0,
+        'file_bytes': os.path.getsize(path),
+        'bytes_per_event': os.path.getsize(path) / max(1, len(events)),
+        'replay_ms_per_event': elapsed * 1000 / max(1, len(events)),
+    }
+
+def make_window(**overrides):
+    window = pointer_app.PointerApp()
+    window.settings.update(bench_settings(**overrides))
+    return window
+
+def bench_start_pointer(app, repeat, resident=False):
+    window = make_window(tray_mode=resident)
+    window.show()
+    window.prewarm_overlay()
+    pump(app)
+    first_frame = []
+    original_paint = pointer_app.CursorOverlay.paintEvent
+
+    def paint_event(overlay, event):
+        original_paint(overlay, event)
+        if not first_frame:
+            first_frame.append(time.perf_counter())
+
+    pointer_app.CursorOverlay.paintEvent = paint_event
+    samples = []
+    try:
+        for _ in range(repeat):
+            first_frame.clear()
+            start = time.perf_counter()
+            window.start_pointer()
+            deadline = start + 5
+            while not first_frame and time.perf_counter() < deadline:
+                pump(app)
+            if first_frame:
+                samples.append((first_frame[0] - start) * 1000)
+            window.toggle_pointer()
+            pump(app)
+    finally:
+        pointer_app.CursorOverlay.paintEvent = original_paint
+        if window.overlay:
+            window.overlay.close_overlay()
+        window.settings.close()
+        window.close()
+    return describe(samples) if samples else None
+
+def synthetic_backdrop(path, side):
+    image = QtGui.QImage(side, side, QtGui.QImage.Format_RGB32)
+    image.fill(QtGui.QColor('#ffffff'))
+    painter = QtGui.QPainter(image)
+    rng = random.Random(1)
+    for i in range(0, side, 64):
+        painter.setPen(QtGui.QColor(rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+        painter.drawLine(i, 0, side - i, side)
+        painter.drawLine(0, i, side, side - i)
+        painter.drawText(i, rng.randrange(side), f'{i}')
+    painter.end()
+    image.save(path, 'JPG', 90)
+
+def wait_for(app, condition, timeout=300):
+    end = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < end:
+        app.processEvents(QtCore.QEventLoop.AllEvents, 20)
+        time.sleep(0.002)
+
+def bench_backdrop(app, side, frames):
+    root = tempfile.mkdtemp()
+    path = os.path.join(root, 'backdrop.jpg')
+    synthetic_backdrop(path, side)
+    rss_before = rss_bytes()
+    start = time.perf_counter()
+    backdrop = pointer_app.BackdropPyramid(path, BACKDROP_CACHE_MB * 1024 * 1024, root=root, decode_limit=BACKDROP_DECODE_LIMIT)
+    levels = {}
+    backdrop.level_ready.connect(lambda level: levels.setdefault(level, (time.perf_counter() - start) * 1000))
+    backdrop.start()
+    wait_for(app, lambda: backdrop.ready == backdrop.finest or backdrop.error)
+    build_rss = rss_bytes()
+    overlay = make_overlay()
+    overlay.resources.input_source.stop()
+    pump(app)
+    overlay.showNormal()
+    overlay.resize(1920, 1080)
+    overlay.set_backdrop(backdrop)
+    wait_for(app, lambda: backdrop.tile((backdrop.top, 0, 0)) is not None)
+    image = QtGui.QImage(overlay.size(), QtGui.QImage.Format_ARGB32_Premultiplied)
+    flags = QtWidgets.QWidget.RenderFlags(QtWidgets.QWidget.DrawChildren)
+    center = QtCore.QPointF(overlay.width() / 2, overlay.height() / 2)
+    zooms = []
+    peak = 0
+    for name, scale in BACKDROP_ZOOMS:
+        overlay.fit_backdrop()
+        if scale is not None:
+            overlay.zoom_backdrop(scale / overlay.backdrop_scale, center)
+        overlay.pan_anchor = QtCore.QPointF()
+        loads = backdrop.loads
+        samples = []
+        missing = 0
+        step = QtCore.QPointF(-side * overlay.backdrop_scale / frames, -side * overlay.backdrop_scale / frames / 2)
+        for _ in range(frames):
+            overlay.pan_backdrop(step)
+            begin = time.perf_counter()
+            overlay.render(image, QtCore.QPoint(), QtGui.QRegion(overlay.rect()), flags)
+            samples.append((time.perf_counter() - begin) * 1000)
+            missing += len(backdrop.pending)
+            app.processEvents()
+            peak = max(peak, backdrop.memory_bytes())
+        overlay.pan_anchor = None
+        zooms.append({
+            'zoom': name,
+            'level': backdrop.level_for(1 / (overlay.backdrop_scale * overlay.device_pixel_ratio())),
+            'frame_ms': describe(samples),
+            'pending_per_frame': missing / frames,
+            'tile_loads': backdrop.loads - loads,
+        })
+    result = {
+        'image': f'{side}x{side}',
+        'levels': backdrop.top + 1,
+        'first_level_ms': min(levels.values()) if levels else None,
+        'build_ms': max(levels.values()) if levels else None,
+        'build_rss_delta': build_rss - rss_before if rss_before is not None else None,
+        'zooms': zooms,
+        'peak_cache_bytes': peak,
+        'cache_cap_bytes': backdrop.cache_bytes,
+        'evictions': backdrop.evictions,
+        'error': backdrop.error,
+    }
+    overlay.close_overlay()
+    backdrop.close()
+    pump(app)
+    shutil.rmtree(root, ignore_errors=True)
+    return result
+
+def bench_effects(app, frames):
+    results = []
+    flags = QtWidgets.QWidget.RenderFlags(QtWidgets.QWidget.DrawChildren)
+    for name, enabled, clicks_per_frame in EFFECT_CONFIGS:
+        overlay = make_overlay(bench_settings(click_effects=enabled))
+        overlay.resources.input_source.stop()
+        pump(app)
+        effects = overlay.resources.effects
+        effects.timer.stop()
+        width, height = overlay.width(), overlay.height()
+        image = QtGui.QImage(width, height, QtGui.QImage.Format_ARGB32_Premultiplied)
+        image.fill(QtCore.Qt.transparent)
+        samples = []
+        areas = []
+        active = 0
+        down = False
+        for point in cursor_path('random_walk', frames, width, height):
+            start = time.perf_counter()
+            previous = overlay._painted_rect.united(effects.bounds(overlay))
+            overlay.cursor_pos = point
+            overlay.update_pointer()
+            for _ in range(clicks_per_frame):
+                down = not down
+                overlay.handle_left_button(down)
+            effects.tick()
+            effects.timer.stop()
+            dirty = previous.united(overlay._painted_rect).united(effects.bounds(overlay))
+            overlay.render(image, QtCore.QPoint(), QtGui.QRegion(dirty), flags)
+            samples.append((time.perf_counter() - start) * 1000)
+            areas.append(dirty.width() * dirty.height())
+            active = max(active, effects.active_count())
+        overlay.tilt_animation.stop()
+        results.append({
+            'effects': name,
+            'frames': frames,
+            'frame_ms': describe(samples),
+            'dirty_area': statistics.fmean(areas),
+            'max_active': active,
+            'dropped': effects.dropped,
+            'over_budget': effects.skipped,
+        })
+        overlay.close_overlay()
+        pump(app)
+    return results
+
+def bench_click_storm(app, clicks):
+    window = make_window()
+    window.start_pointer()
+    group = window.overlay
+    group.resources.input_source.stop()
+    pump(app)
+    gc.collect()
+    tracemalloc.start()
+    rss_before = rss_bytes()
+    traced_before = tracemalloc.get_traced_memory()[0]
+    checkpoints = []
+    start = time.perf_counter()
+    for i in range(clicks):
+        group.handle_left_button(True)
+        pump(app)
+        group.handle_left_button(False)
+        pump(app)
+        if (i + 1) % max(1, clicks // 10) == 0:
+            gc.collect()
+            checkpoints.append({
+                'clicks': i + 1,
+                'traced_bytes': tracemalloc.get_traced_memory()[0] - traced_before,
+                'rss_bytes': (rss_bytes() - rss_before) if rss_before is not None else None,
+            })
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+    window.toggle_pointer()
+    window.settings.close()
+    window.close()
+    pump(app)
+    return {
+        'clicks': clicks,
+        'clicks_per_second': clicks / elapsed,
+        'checkpoints': checkpoints,
+    }
+
+def bench_startup(repeat):
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    reports = []
+    with tempfile.TemporaryDirectory() as stage:
+        script = stage_app(stage)
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory() as tmp:
+                output = os.path.join(tmp, 'startup.json')
+                subprocess.run(
+                    [sys.executable, script, f'--profile-startup={output}'],
+                    cwd=tmp, env=env, capture_output=True, timeout=60,
+                )
+                if not os.path.exists(output):
+                    continue
+                with open(output, 'r', encoding='utf-8') as f:
+                    reports.append(json.load(f))
+    if not reports:
+        return None
+    phases = {}
+    for report in reports:
+        for phase in report['phases']:
+            phases.setdefault(phase['phase'], []).append(phase['ms'])
+    window = [report['window_ready_ms'] for report in reports if report['window_ready_ms'] is not None]
+    assets = [report['assets_ready_ms'] for report in reports if report['assets_ready_ms'] is not None]
+    return {
+        'runs': len(reports),
+        'phases_ms': {name: statistics.median(samples) for name, samples in phases.items()},
+        'window_ready_ms': describe(window) if window else None,
+        'assets_ready_ms': describe(assets) if assets else None,
+        'budget_ms': pointer_app.STARTUP_BUDGET_MS,
+    }
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+def compare(current, baseline_path):
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    rows = []
+    for old, new in zip(baseline['results']['paint'], current['results']['paint']):
+        rows.append((f"paint {new['resolution']} {new['rotation']}°", old['dirty']['median_ms'], new['dirty']['median_ms']))
+    for old, new in zip(baseline['results']['poll'], current['results']['poll']):
+        rows.append((f"poll {new['path']}", old['poll_and_paint_ms'], new['poll_and_paint_ms']))
+    for old, new in zip(baseline['results'].get('pointer_style', {}).get('styles', []), current['results']['pointer_style']['styles']):
+        rows.append((f"style {new['style']} {new['resolution']}", old['move_ms']['median_ms'], new['move_ms']['median_ms']))
+    for old, new in zip(baseline['results'].get('backdrop', {}).get('zooms', []), current['results']['backdrop']['zooms']):
+        rows.append((f"backdrop pan {new['zoom']}", old['frame_ms']['median_ms'], new['frame_ms']['median_ms']))
+    for old, new in zip(baseline['results'].get('effects', []), current['results']['effects']):
+        rows.append((f"effects {new['effects']}", old['frame_ms']['median_ms'], new['frame_ms']['median_ms']))
+    if baseline['results'].get('replay') and current['results'].get('replay'):
+        rows.append(('replay', baseline['results']['replay']['replay_ms_per_event'], current['results']['replay']['replay_ms_per_event']))
+    if baseline['results'].get('remote'):
+        rows.append(('remote latency', baseline['results']['remote']['latency_ms']['median_ms'], current['results']['remote']['latency_ms']['median_ms']))
+    rows.append(('update_cursor_image cold', baseline['results']['cursor_image']['cold']['median_ms'], current['results']['cursor_image']['cold']['median_ms']))
+    for old, new in zip(baseline['results'].get('motion_filter', []), current['results']['motion_filter']):
+        rows.append((f"filter {new['path']} {new['filter']}", old['filter_us'] / 1000, new['filter_us'] / 1000))
+    if baseline['results'].get('startup') and current['results']['startup']:
+        rows.append(('startup window ready', baseline['results']['startup']['window_ready_ms']['median_ms'], current['results']['startup']['window_ready_ms']['median_ms']))
+    if baseline['results']['start_pointer'] and current['results']['start_pointer']:
+        rows.append(('start_pointer', baseline['results']['start_pointer']['median_ms'], current['results']['start_pointer']['median_ms']))
+    if baseline['results'].get('start_pointer_resident') and current['results']['start_pointer_resident']:
+        rows.append(('start_pointer resident', baseline['results']['start_pointer_resident']['median_ms'], current['results']['start_pointer_resident']['median_ms']))
+    print(f"\n📊 Сравнение с {baseline_path} ({baseline.get('revision')}):")
+    for name, old, new in rows:
+        change = (new - old) / old * 100 if old else 0.0
+        print(f"  {name:<32} {old:9.3f} мс -> {new:9.3f} мс ({change:+.1f}%)")
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк горячих путей оверлея Pointer')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--compare', metavar='BASELINE')
+    parser.add_argument('--quick', action='store_true')
+    parser.add_argument('--replay', metavar='RECORDING', help='запись сессии (.ptrec) для воспроизведения как нагрузки')
+    parser.add_argument('--lag-ms', type=int, default=16, help='задержка отображения для оценки прогноза')
+    args = parser.parse_args()
+
+    repeat = 20 if args.quick else 200
+    app = QtWidgets.QApplication(sys.argv)
+    stub_audio()
+    user_data = tempfile.mkdtemp()
+    isolate_user_data(user_data)
+
+    print('⏱️ Бенчмарк Pointer...')
+    results = {}
+    print('  paintEvent...')
+    results['paint'] = bench_paint(app, repeat)
+    print('  стили указки...')
+    results['pointer_style'] = bench_pointer_style(app, 100 if args.quick else 1000)
+    print('  опрос курсора...')
+    results['poll'] = bench_poll(app, 500 if args.quick else 5000)
+    print('  фильтр движения...')
+    results['motion_filter'] = bench_motion_filter(500 if args.quick else 5000, args.lag_ms, replay=args.replay)
+    if args.replay:
+        print('  воспроизведение записи...')
+        results['replay'] = bench_replay(app, args.replay)
+    print('  рисование...')
+    results['annotation'] = bench_annotation(app, 200 if args.quick else 2000)
+    print('  удалённое управление...')
+    results['remote'] = bench_remote(app, 50 if args.quick else 500)
+    print('  update_cursor_image...')
+    results['cursor_image'] = bench_cursor_image(app, 5 if args.quick else 20)
+    print('  запуск приложения...')
+    results['startup'] = bench_startup(3 if args.quick else 10)
+    print('  start_pointer...')
+    results['start_pointer'] = bench_start_pointer(app, 3 if args.quick else 10)
+    print('  start_pointer (трей)...')
+    results['start_pointer_resident'] = bench_start_pointer(app, 3 if args.quick else 10, resident=True)
+    print('  фоновое изображение...')
+    results['backdrop'] = bench_backdrop(app, 4000 if args.quick else 12000, 100 if args.quick else 500)
+    print('  эффекты кликов...')
+    results['effects'] = bench_effects(app, 200 if args.quick else 2000)
+    print('  серия кликов...')
+    results['click_storm'] = bench_click_storm(app, 500 if args.quick else 5000)
+    shutil.rmtree(user_data, ignore_errors=True)
+
+    report = {
+        'revision': git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'qt': QtCore.QT_VERSION_STR,
+        'pyqt': QtCore.PYQT_VERSION_STR,
+        'platform': platform.platform(),
+        'qpa': QtGui.QGuiApplication.platformName(),
+        'audio': 'stub',
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f'✅ Результаты сохранены в {args.output}')
+
+    if args.compare:
+        compare(report, args.compare)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
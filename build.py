@@ -1,56 +1,304 @@
 import os
 import sys
+import json
+import time
+import argparse
+import platform
+import statistics
 import subprocess
 import shutil
+import tempfile
 
-def main():
-    print("🔨 Сборка Pointer в EXE файл...")
-    
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    os.chdir(script_dir)
-    print(f"📁 Рабочая директория: {script_dir}")
-    
-    if not os.path.exists("pointer_app.py"):
-        print("❌ Файл pointer_app.py не найден!")
-        return 1
-    
-    if not os.path.exists("pointer_app.spec"):
-        print("❌ Файл pointer_app.spec не найден!")
-        return 1
-    
+APP_NAME = "pointer_app"
+DIST_PATH = os.path.join("dist", APP_NAME)
+PREBUILT_PATH = os.path.join("build", "prebuilt")
+PREBUILT_DPRS = (1.0, 1.25, 1.5, 1.75, 2.0)
+DEFAULT_OUTPUT = "build_report.json"
+LAUNCH_RUNS = 5
+LAUNCH_TIMEOUT_S = 60
+LAUNCH_BUDGET_MS = 1500
+BUNDLE_BUDGET_MB = {"win32": 70, "linux": 120}
+TOP_FILES = 8
+COMPONENTS = (
+    ("prebuilt", "src/assets/prebuilt/"),
+    ("assets", "src/assets/"),
+    ("qt_plugins", "PyQt5/Qt5/plugins/"),
+    ("qt_libraries", "PyQt5/Qt5/"),
+    ("pyqt", "PyQt5/"),
+)
+COMPONENT_NAMES = {
+    "app": "Приложение",
+    "python": "Python",
+    "pyqt": "PyQt5",
+    "qt_libraries": "Qt: библиотеки",
+    "qt_plugins": "Qt: плагины",
+    "libraries": "Системные библиотеки",
+    "assets": "Ресурсы",
+    "prebuilt": "Кэш указок",
+}
+
+def exe_name():
+    return f"{APP_NAME}.exe" if sys.platform == "win32" else APP_NAME
+
+def prepare_assets(target):
+    from PyQt5 import QtCore, QtGui
+    import pointer_app
+    shutil.rmtree(target, ignore_errors=True)
+    disk = pointer_app.DiskAssetCache(target, None)
+    thumbnail = QtCore.QSize(pointer_app.THUMBNAIL_SIZE, pointer_app.THUMBNAIL_SIZE)
+    count = 0
+    for _, filename in pointer_app.CURSORS:
+        path = os.path.join(pointer_app.ASSETS_PATH, filename)
+        source = QtGui.QImage(path)
+        if source.isNull():
+            continue
+        cursor = QtCore.QSize(int(source.width() * pointer_app.CURSOR_SCALE), int(source.height() * pointer_app.CURSOR_SCALE))
+        for dpr in PREBUILT_DPRS:
+            for size in (cursor, thumbnail):
+                disk.store_image(path, size, True, dpr, pointer_app.scale_image(source, size, True, dpr))
+                count += 1
+    return count
+
+def component(rel):
+    for name, prefix in COMPONENTS:
+        if rel.startswith(prefix):
+            return name
+    base = rel.rsplit("/", 1)[-1]
+    if rel in (exe_name(), "icon.ico"):
+        return "app"
+    if (rel.startswith("lib-dynload/") or base == "base_library.zip" or base.endswith(".pyd")
+            or ".cpython-" in base or base.startswith(("libpython", "python"))):
+        return "python"
+    return "libraries"
+
+def bundle_sizes(root):
+    components = dict.fromkeys(COMPONENT_NAMES, 0)
+    files = []
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            if os.path.islink(path):
+                continue
+            rel = os.path.relpath(path, root).replace(os.sep, "/")
+            size = os.path.getsize(path)
+            components[component(rel)] += size
+            files.append((size, rel))
+    files.sort(reverse=True)
+    return {
+        "total_bytes": sum(components.values()),
+        "files": len(files),
+        "components": components,
+        "largest": [{"path": rel, "bytes": size} for size, rel in files[:TOP_FILES]],
+    }
+
+def print_sizes(sizes):
+    total = sizes["total_bytes"] or 1
+    print(f"📊 Размер сборки: {sizes['total_bytes'] / (1024 * 1024):.1f} MB, файлов: {sizes['files']}")
+    for name, size in sorted(sizes["components"].items(), key=lambda item: -item[1]):
+        if size:
+            print(f"  {COMPONENT_NAMES[name]:<22} {size / (1024 * 1024):7.1f} MB  {size * 100 / total:5.1f}%")
+    print("  Самые большие файлы:")
+    for entry in sizes["largest"]:
+        print(f"    {entry['bytes'] / (1024 * 1024):6.1f} MB  {entry['path']}")
+
+def drop_caches():
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        os.sync()
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("3\n")
+        return True
+    except OSError:
+        return False
+
+def remove_new_files(root, before):
+    for name in set(os.listdir(root)) - before:
+        path = os.path.join(root, name)
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            os.remove(path)
+
+def launch_once(command, root, env):
+    before = set(os.listdir(root))
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "startup.json")
+        started = time.time()
+        try:
+            subprocess.run(command + [f"--profile-startup={output}"], cwd=tmp, env=env, capture_output=True, timeout=LAUNCH_TIMEOUT_S)
+        except subprocess.TimeoutExpired:
+            pass
+        finally:
+            remove_new_files(root, before)
+        if not os.path.exists(output):
+            return None
+        with open(output, "r", encoding="utf-8") as f:
+            report = json.load(f)
+    if report.get("window_ready_at") is None:
+        return None
+    return {
+        "launch_ms": (report["window_ready_at"] - started) * 1000,
+        "window_ready_ms": report["window_ready_ms"],
+        "assets_ready_ms": report["assets_ready_ms"],
+    }
+
+def launch_env():
+    env = dict(os.environ)
+    if sys.platform.startswith("linux") and not env.get("DISPLAY") and not env.get("WAYLAND_DISPLAY"):
+        env["QT_QPA_PLATFORM"] = "offscreen"
+    return env
+
+def check_imports(command, root):
+    before = set(os.listdir(root))
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            result = subprocess.run(command + ["--check-imports"], cwd=tmp, env=launch_env(), capture_output=True, timeout=LAUNCH_TIMEOUT_S)
+        except subprocess.TimeoutExpired:
+            return False
+        finally:
+            remove_new_files(root, before)
+    return result.returncode == 0
+
+def measure_launch(command, root, runs, cold):
+    env = launch_env()
+    samples = []
+    dropped = False
+    for run in range(runs):
+        if cold:
+            dropped = drop_caches() or dropped
+        samples.append(launch_once(command, root, env))
+    launches = [sample["launch_ms"] for sample in samples if sample is not None]
+    return {
+        "runs": runs,
+        "failed": sum(1 for sample in samples if sample is None),
+        "page_cache_dropped": dropped,
+        "first_ms": samples[0]["launch_ms"] if samples and samples[0] is not None else None,
+        "median_ms": statistics.median(launches) if launches else None,
+        "samples": samples,
+        "qpa": env.get("QT_QPA_PLATFORM", "native"),
+    }
+
+def print_launch(launch):
+    cache = "сброшен" if launch["page_cache_dropped"] else "не сброшен"
+    print(f"⏱️ Холодный запуск до первого окна ({launch['runs']} запусков, кэш страниц {cache}, QPA {launch['qpa']}):")
+    if launch["first_ms"] is not None:
+        print(f"  первый запуск: {launch['first_ms']:.0f} мс")
+    if launch["median_ms"] is not None:
+        print(f"  медиана:       {launch['median_ms']:.0f} мс")
+    if launch["failed"]:
+        print(f"  ⚠️ окно не появилось в {launch['failed']} запусках")
+
+def check_budgets(sizes, launch, size_budget_mb, launch_budget_ms):
+    failures = []
+    size_mb = sizes["total_bytes"] / (1024 * 1024)
+    if size_mb > size_budget_mb:
+        failures.append(f"размер {size_mb:.1f} MB > {size_budget_mb} MB")
+    if launch is not None:
+        if launch["first_ms"] is None:
+            failures.append("первый запуск не дошёл до окна")
+        elif launch["first_ms"] > launch_budget_ms:
+            failures.append(f"первый запуск {launch['first_ms']:.0f} мс > {launch_budget_ms} мс")
+        if launch["failed"]:
+            failures.append(f"окно не появилось в {launch['failed']} запусках")
+    return failures
+
+def build():
     try:
         import PyInstaller
         print("✅ PyInstaller найден")
     except ImportError:
         print("❌ PyInstaller не найден. Устанавливаем...")
-        subprocess.run([sys.executable, "-m", "pip", "install", "pyinstaller"])
-    
+        subprocess.run([sys.executable, "-m", "pip", "install", "pyinstaller>=6.0"])
+
     if os.path.exists("dist"):
         print("🧹 Очищаем папку dist...")
         shutil.rmtree("dist")
-    
+
     if os.path.exists("build"):
         print("🧹 Очищаем папку build...")
         shutil.rmtree("build")
-    
+
+    print("🖼️ Готовим указки заранее...")
+    count = prepare_assets(PREBUILT_PATH)
+    print(f"✅ Подготовлено изображений: {count} (масштабы {', '.join(f'{dpr:g}' for dpr in PREBUILT_DPRS)})")
+
     print("📦 Собираем проект...")
     result = subprocess.run([
-        sys.executable, "-m", "PyInstaller", "pointer_app.spec"
+        sys.executable, "-m", "PyInstaller", "--noconfirm", "--clean", "pointer_app.spec"
     ])
-    
-    if result.returncode == 0:
+    return result.returncode == 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Сборка Pointer с проверкой размера и времени запуска")
+    parser.add_argument("--skip-build", action="store_true", help="только измерить уже собранную папку dist")
+    parser.add_argument("--runs", type=int, default=LAUNCH_RUNS)
+    parser.add_argument("--no-launch", action="store_true", help="не запускать собранное приложение")
+    parser.add_argument("--drop-caches", action="store_true", help="сбрасывать кэш страниц перед запуском (Linux, нужен root)")
+    parser.add_argument("--size-budget-mb", type=float, default=BUNDLE_BUDGET_MB.get(sys.platform, BUNDLE_BUDGET_MB["linux"]))
+    parser.add_argument("--launch-budget-ms", type=float, default=LAUNCH_BUDGET_MS)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    print("🔨 Сборка Pointer...")
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(script_dir)
+    print(f"📁 Рабочая директория: {script_dir}")
+
+    if not os.path.exists("pointer_app.py"):
+        print("❌ Файл pointer_app.py не найден!")
+        return 1
+
+    if not os.path.exists("pointer_app.spec"):
+        print("❌ Файл pointer_app.spec не найден!")
+        return 1
+
+    if not args.skip_build:
+        if not build():
+            print("❌ Ошибка при сборке!")
+            return 1
         print("✅ Сборка завершена успешно!")
-        print("📁 EXE файл находится в папке dist/pointer_app/")
-        
-        exe_path = "dist/pointer_app/pointer_app.exe"
-        if os.path.exists(exe_path):
-            size = os.path.getsize(exe_path) / (1024 * 1024)
-            print(f"📊 Размер EXE файла: {size:.1f} MB")
-    else:
-        print("❌ Ошибка при сборке!")
+
+    exe_path = os.path.join(DIST_PATH, exe_name())
+    if not os.path.exists(exe_path):
+        print(f"❌ Файл {exe_path} не найден!")
+        return 1
+    print(f"📁 Приложение находится в папке {DIST_PATH}/")
+
+    if not check_imports([os.path.abspath(exe_path)], DIST_PATH):
+        print("❌ В собранном приложении не загружается QtMultimedia!")
+        return 1
+    print("✅ QtMultimedia загружается в собранном приложении")
+
+    sizes = bundle_sizes(DIST_PATH)
+    print_sizes(sizes)
+
+    launch = None
+    if not args.no_launch:
+        launch = measure_launch([os.path.abspath(exe_path)], DIST_PATH, args.runs, args.drop_caches)
+        print_launch(launch)
+
+    failures = check_budgets(sizes, launch, args.size_budget_mb, args.launch_budget_ms)
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "size": sizes,
+        "launch": launch,
+        "budgets": {"size_mb": args.size_budget_mb, "launch_ms": args.launch_budget_ms},
+        "failures": failures,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if failures:
+        print("❌ Бюджет превышен:")
+        for failure in failures:
+            print(f"  {failure}")
         return 1
-    
+    print(f"✅ Размер и запуск в пределах бюджета, отчёт в {args.output}")
     return 0
 
 if __name__ == "__main__":
-    sys.exit(main()) 
\ No newline at end of file
+    sys.exit(main())
@@ -1,7 +1,26 @@
 import sys
+import time
+STARTUP_STARTED = time.perf_counter()
 import os
 import json
-from PyQt5 import QtWidgets, QtGui, QtCore, QtMultimedia
+import base64
+import math
+import wave
+import collections
+import csv
+import hashlib
+import hmac
+import ipaddress
+import shutil
+import struct
+import zipfile
+from array import array
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+import ctypes
+import ctypes.util
+from PyQt5 import QtWidgets, QtGui, QtCore, sip
 
 ASSETS_PATH = os.path.join(os.path.dirname(__file__), 'src', 'assets')
 CURSORS = [
@@ -10,12 +29,336 @@ CURSORS = [
 ]
 SOUND_CLICK = os.path.join(ASSETS_PATH, 'knock.wav')
 SOUND_LOOP = os.path.join(ASSETS_PATH, 'hold.wav')
+PREBUILT_CACHE_PATH = os.path.join(ASSETS_PATH, 'prebuilt')
+ICON_PATH = os.path.join(os.path.dirname(__file__), 'icon.ico')
 SETTINGS_FILE = os.path.join(os.path.dirname(__file__), 'settings.json')
+TRACES_PATH = os.path.join(os.path.dirname(__file__), 'traces')
+PACKS_PATH = os.path.join(os.path.dirname(__file__), 'packs')
+CACHE_PATH = os.path.join(os.path.dirname(__file__), 'cache')
+RECORDINGS_PATH = os.path.join(os.path.dirname(__file__), 'recordings')
+STARTUP_BUDGET_MS = 1000
+STARTUP_TIMEOUT_MS = 5000
+STARTUP_DEFER_MS = 300
+PACK_MANIFEST = 'pack.json'
+PACK_IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.webp')
+PACK_SOUND_EXTENSIONS = ('.wav',)
+BUILTIN_PACK = 'builtin'
+DISK_CACHE_MAGIC = b'PTRA'
+RECORDING_MAGIC = b'PTRC'
+RECORDING_VERSION = 1
+RECORDING_HEADER = struct.Struct('<4sBii')
+RECORDING_CHUNK_BYTES = 16 * 1024
+RECORD_MOVE = 0
+RECORD_BUTTON_UP = 1
+RECORD_BUTTON_DOWN = 2
 
 CURSOR_SCALE = 0.4
+DIRTY_RECT_MARGIN = 2
+TILT_ANGLE = -15
+TILT_DURATION_MS = 90
+ROTATION_CACHE_CURSORS = 2
+ASSET_CACHE_SIZE = 16
+ASSET_SOURCE_CACHE_SIZE = 4
+THUMBNAIL_SIZE = 80
+IDLE_POLL_INTERVAL_MS = 100
+IDLE_POLL_DELAY_MS = 2000
+INPUT_BACKENDS = ('auto', 'poll', 'xinput2', 'remote')
+REMOTE_MAX_MESSAGE = 1024
+REMOTE_SEQ_RESET_WINDOW = 1000
+REMOTE_COORD_LIMIT = 2 ** 31 - 1
+WEBSOCKET_GUID = b'258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+WEBSOCKET_CONTROL_MAX = 125
+WEBSOCKET_PROTOCOL_ERROR = 1002
+REMOTE_PAGE = '''<!doctype html>
+<html><head><meta charset="utf-8"><meta name="viewport" content="width=device-width,initial-scale=1,user-scalable=no">
+<title>Pointer</title><style>body{margin:0;background:#232629;color:#f0f0f0;font-family:sans-serif}
+#pad{position:fixed;top:0;left:0;right:0;bottom:25%;display:flex;align-items:center;justify-content:center;touch-action:none}
+#press{position:fixed;left:0;right:0;bottom:0;height:25%;border:none;background:#2a82da;color:#fff;font-size:24px;touch-action:none}</style></head>
+<body><div id="pad">Водите пальцем для перемещения</div><button id="press">Нажать</button><script>
+var ws=new WebSocket('ws://'+location.host+'/'),seq=0,last=null,token=new URLSearchParams(location.search).get('token')||'';
+function send(m){m.seq=++seq;m.token=token;if(ws.readyState==1)ws.send(JSON.stringify(m));}
+var pad=document.getElementById('pad'),press=document.getElementById('press');
+pad.onpointerdown=function(e){last=[e.clientX,e.clientY];};
+pad.onpointermove=function(e){if(!last)return;send({type:'move_by',dx:Math.round((e.clientX-last[0])*2),dy:Math.round((e.clientY-last[1])*2)});last=[e.clientX,e.clientY];};
+pad.onpointerup=pad.onpointercancel=function(){last=null;};
+press.onpointerdown=function(){send({type:'down'});};
+press.onpointerup=press.onpointercancel=function(){send({type:'up'});};
+</script></body></html>'''
+APP_STYLESHEET = """
+QWidget {
+    background: #232629;
+    color: #f0f0f0;
+    font-family: 'Segoe UI', Arial, sans-serif;
+}
+QMainWindow, QDialog {
+    background: #232629;
+}
+QGroupBox {
+    font-weight: bold;
+    color: #f0f0f0;
+    background: #2a2e32;
+    border: 2px solid #2a82da;
+    border-radius: 8px;
+    margin-top: 10px;
+    padding-top: 10px;
+}
+QGroupBox::title {
+    subcontrol-origin: margin;
+    left: 10px;
+    padding: 0 5px 0 5px;
+    color: #f0f0f0;
+}
+QLabel {
+    color: #f0f0f0;
+}
+QGroupBox QLabel, QCheckBox {
+    color: #f0f0f0;
+    font-weight: bold;
+}
+QLabel#title {
+    font-size: 24px;
+    font-weight: bold;
+    margin-bottom: 10px;
+}
+QLabel#tipsTitle {
+    color: #2a82da;
+    font-weight: bold;
+    font-size: 14px;
+}
+QLabel#tipsText {
+    color: #888;
+    font-size: 12px;
+    margin-left: 10px;
+}
+QPushButton#toolButton {
+    background: #31363b;
+    color: #f0f0f0;
+    border: 2px solid #2a82da;
+    border-radius: 6px;
+    padding: 5px 10px;
+    font-weight: bold;
+}
+QPushButton#toolButton:hover, QPushButton#githubButton:hover {
+    border-color: #4a9eea;
+    background: #3a3f44;
+}
+QPushButton#toolButton:disabled {
+    color: #888;
+    border-color: #444;
+}
+QPushButton#startButton {
+    background: linear-gradient(135deg, #2a82da, #1e6bb8);
+    color: white;
+    border: 3px solid #4a9eea;
+    border-radius: 10px;
+    font-size: 16px;
+    font-weight: bold;
+    padding: 10px;
+}
+QPushButton#startButton:hover {
+    background: linear-gradient(135deg, #1e6bb8, #2a82da);
+    border-color: #5ab0fa;
+}
+QPushButton#startButton:pressed {
+    background: linear-gradient(135deg, #1a5a9e, #1e6bb8);
+}
+QPushButton#cursorButton {
+    background: #31363b;
+    border: 3px solid #2a82da;
+    border-radius: 8px;
+    padding: 5px;
+}
+QPushButton#cursorButton:checked {
+    border-color: #4a9eea;
+    background: #2a82da;
+}
+QPushButton#cursorButton:hover {
+    border-color: #4a9eea;
+    background: #3a3f44;
+}
+QPushButton#githubButton {
+    background: #31363b;
+    color: #f0f0f0;
+    border: 2px solid #2a82da;
+    border-radius: 6px;
+    padding: 8px;
+    font-weight: bold;
+    font-size: 12px;
+}
+QPushButton#githubButton:pressed {
+    background: #2a82da;
+    color: #fff;
+}
+QSlider::groove:horizontal {
+    border: 1px solid #444;
+    height: 10px;
+    background: #31363b;
+    margin: 2px 0;
+    border-radius: 5px;
+}
+QSlider::handle:horizontal {
+    background: #2a82da;
+    border: 2px solid #4a9eea;
+    width: 20px;
+    margin: -5px 0;
+    border-radius: 10px;
+}
+QSlider::sub-page:horizontal {
+    background: #2a82da;
+    border-radius: 5px;
+}
+QComboBox {
+    background: #31363b;
+    color: #f0f0f0;
+    border: 2px solid #2a82da;
+    border-radius: 6px;
+    padding: 5px;
+    font-weight: bold;
+}
+QComboBox::drop-down {
+    border: none;
+}
+QComboBox::down-arrow {
+    image: none;
+    border-left: 5px solid transparent;
+    border-right: 5px solid transparent;
+    border-top: 5px solid #2a82da;
+}
+QComboBox QAbstractItemView {
+    background: #31363b;
+    color: #f0f0f0;
+    border: 2px solid #2a82da;
+    selection-background-color: #2a82da;
+}
+QAbstractSpinBox {
+    color: #f0f0f0;
+    background: #31363b;
+    border: 2px solid #2a82da;
+    border-radius: 6px;
+    padding: 2px;
+}
+QKeySequenceEdit QLineEdit {
+    color: #f0f0f0;
+    background: #31363b;
+    border: 2px solid #2a82da;
+    border-radius: 6px;
+}
+QMenuBar {
+    background: #232629;
+    color: #f0f0f0;
+    border: none;
+}
+QMenuBar::item {
+    background: transparent;
+    color: #f0f0f0;
+    padding: 4px 8px;
+}
+QMenuBar::item:selected {
+    background: #2a82da;
+    color: #ffffff;
+}
+QMenu {
+    background: #31363b;
+    color: #f0f0f0;
+    border: 1px solid #444;
+}
+QMenu::item {
+    padding: 4px 20px;
+}
+QMenu::item:selected {
+    background: #2a82da;
+    color: #ffffff;
+}
+QTitleBar {
+    background: #232629;
+    color: #f0f0f0;
+}
+"""
+CLICK_VOICES = 6
+HOLD_FADE_IN_MS = 30
+HOLD_FADE_OUT_MS = 80
+HOLD_BUFFER_MS = 40
+SETTINGS_SAVE_DELAY_MS = 500
+STATS_CAPACITY = 4096
+STATS_CLICK_CAPACITY = 256
+HUD_REFRESH_MS = 250
+HUD_RECT = (10, 10, 280, 136)
+RESOURCE_KINDS = ('overlay_groups', 'overlays', 'overlay_resources', 'input_sources', 'click_voices', 'hold_players', 'backdrops')
+ALL_SCREENS = -1
+ANNOTATION_COLOR = '#ff3b30'
+ANNOTATION_WIDTH = 4
+ANNOTATION_MIN_DISTANCE = 3
+ANNOTATION_UNDO_LIMIT = 50
+FILTER_DERIVATIVE_CUTOFF = 1.0
+FILTER_SETTLE_MS = 16
+SPOTLIGHT_DIM = (0, 0, 0, 150)
+SPOTLIGHT_FEATHER = 24
+MAGNIFIER_GAP = 16
+MAGNIFIER_REFRESH_MS = 33
+EFFECT_COLOR = '#2a82da'
+EFFECT_LIMIT = 16
+EFFECT_FRAME_BUDGET_MS = 2.0
+RIPPLE_DURATION_MS = 400
+RIPPLE_RADIUS = 40
+RIPPLE_WIDTH = 3
+GLOW_RADIUS = 28
+GLOW_FADE_IN_MS = 120
+GLOW_FADE_OUT_MS = 200
+BACKDROP_TILE_SIZE = 512
+BACKDROP_TILE_QUALITY = 80
+BACKDROP_DECODE_LIMIT = 64 * 1024 * 1024
+BACKDROP_ZOOM_STEP = 1.25
+BACKDROP_MAX_ZOOM = 8.0
+BACKDROP_FILL = '#000000'
+BACKDROP_FILTER = 'Изображения (*.png *.jpg *.jpeg *.bmp *.gif *.webp *.tif *.tiff);;Все файлы (*)'
+OVERLAY_MODES = [
+    ('fullscreen', 'Полноэкранный'),
+    ('follower', 'Окно за курсором'),
+]
+POINTER_STYLES = [
+    ('pointer', 'Указка'),
+    ('spotlight', 'Прожектор'),
+    ('magnifier', 'Лупа'),
+]
+RENDERERS = [
+    ('raster', 'Программная'),
+    ('opengl', 'OpenGL'),
+]
+
+DEFAULT_SETTINGS = {
+    'volume': 100,
+    'selected_screen': 0,
+    'input_backend': 'auto',
+    'overlay_mode': 'fullscreen',
+    'renderer': 'raster',
+    'pointer_style': 'pointer',
+    'click_effects': True,
+    'spotlight_radius': 140,
+    'magnifier_size': 200,
+    'magnifier_zoom': 2.0,
+    'backdrop_image': '',
+    'backdrop_cache_mb': 128,
+    'pack': BUILTIN_PACK,
+    'instrumentation': False,
+    'show_hud': False,
+    'trace_format': 'json',
+    'tray_mode': False,
+    'hotkey': 'Ctrl+Alt+P',
+    'resident_memory_limit_mb': 64,
+    'motion_filter': False,
+    'remote_host': '127.0.0.1',
+    'remote_port': 8765,
+    'remote_token': '',
+    'filter_min_cutoff': 1.0,
+    'filter_beta': 0.007,
+    'prediction_ms': 0,
+    'record_session': False,
+    'annotation_mode': False,
+    'replay_speed': 1.0,
+}
 
 def load_settings():
-    default_settings = {'volume': 100, 'selected_screen': 0}
+    default_settings = dict(DEFAULT_SETTINGS)
     if os.path.exists(SETTINGS_FILE):
         try:
             with open(SETTINGS_FILE, 'r', encoding='utf-8') as f:
@@ -29,169 +372,3225 @@ def load_settings():
     return default_settings
 
 def save_settings(settings):
-    with open(SETTINGS_FILE, 'w', encoding='utf-8') as f:
+    tmp_path = SETTINGS_FILE + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
         json.dump(settings, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, SETTINGS_FILE)
+
+class SettingsStore(dict):
+    def __init__(self, values):
+        super().__init__(values)
+        self.write_count = 0
+        self.dirty = False
+        self.closed = False
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.save_timer = QtCore.QTimer()
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(SETTINGS_SAVE_DELAY_MS)
+        self.save_timer.timeout.connect(self.flush)
+
+    def schedule_save(self):
+        self.dirty = True
+        if not self.closed:
+            self.save_timer.start()
+
+    def flush(self):
+        self.save_timer.stop()
+        if not self.dirty or self.closed:
+            return None
+        self.dirty = False
+        return self.executor.submit(self.write, dict(self))
+
+    def write(self, snapshot):
+        try:
+            save_settings(snapshot)
+        except OSError as e:
+            print(f'⚠️ Не удалось сохранить настройки: {e}')
+            try:
+                os.remove(SETTINGS_FILE + '.tmp')
+            except OSError:
+                pass
+            self.dirty = True
+            return
+        with self.lock:
+            self.write_count += 1
+
+    def close(self):
+        if self.closed:
+            return
+        self.flush()
+        self.closed = True
+        self.executor.shutdown(wait=True)
+
+_resource_counts = collections.Counter()
+_tracked_resources = weakref.WeakSet()
+
+def track_resource(kind, obj):
+    _resource_counts[kind] += 1
+    _tracked_resources.add(obj)
+    obj.destroyed.connect(lambda *args, kind=kind: _resource_counts.subtract([kind]))
+
+def resource_counts():
+    counts = {kind: _resource_counts[kind] for kind in RESOURCE_KINDS}
+    timers = []
+    for obj in list(_tracked_resources):
+        if not sip.isdeleted(obj) and obj.parent() is None:
+            timers.extend(obj.findChildren(QtCore.QTimer))
+    counts['timers'] = len(timers)
+    counts['active_timers'] = sum(timer.isActive() for timer in timers)
+    return counts
+
+class PointerInputSource(QtCore.QObject):
+    moved = QtCore.pyqtSignal(QtCore.QPoint)
+    left_button_changed = QtCore.pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        track_resource('input_sources', self)
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def close(self):
+        self.stop()
+
+class AdaptivePollingSource(PointerInputSource):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.last_pos = None
+        self.left_down = False
+        self.interval = self.active_interval()
+        self.idle_clock = QtCore.QElapsedTimer()
+        self.timer = QtCore.QTimer(self)
+        self.timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self.timer.timeout.connect(self.poll)
+
+    def active_interval(self):
+        screen = QtGui.QGuiApplication.screenAt(QtGui.QCursor.pos()) or QtGui.QGuiApplication.primaryScreen()
+        rate = screen.refreshRate() if screen else 60
+        return max(1, int(1000 / max(rate, 1)))
+
+    def start(self):
+        self.interval = self.active_interval()
+        self.idle_clock.start()
+        self.timer.start(self.interval)
+        self.poll()
+
+    def stop(self):
+        self.timer.stop()
+
+    def poll(self):
+        pos = QtGui.QCursor.pos()
+        left_down = bool(QtWidgets.QApplication.mouseButtons() & QtCore.Qt.LeftButton)
+        active = False
+        if pos != self.last_pos:
+            self.last_pos = pos
+            active = True
+            self.moved.emit(pos)
+        if left_down != self.left_down:
+            self.left_down = left_down
+            active = True
+            self.left_button_changed.emit(left_down)
+        if active or self.left_down:
+            self.idle_clock.restart()
+            interval = self.active_interval()
+        elif self.idle_clock.elapsed() > IDLE_POLL_DELAY_MS:
+            interval = min(self.interval * 2, IDLE_POLL_INTERVAL_MS)
+        else:
+            interval = self.interval
+        if interval != self.interval:
+            self.interval = interval
+            self.timer.setInterval(interval)
+
+class _XIEventMask(ctypes.Structure):
+    _fields_ = [
+        ('deviceid', ctypes.c_int),
+        ('mask_len', ctypes.c_int),
+        ('mask', ctypes.POINTER(ctypes.c_ubyte)),
+    ]
+
+class _XGenericEventCookie(ctypes.Structure):
+    _fields_ = [
+        ('type', ctypes.c_int),
+        ('serial', ctypes.c_ulong),
+        ('send_event', ctypes.c_int),
+        ('display', ctypes.c_void_p),
+        ('extension', ctypes.c_int),
+        ('evtype', ctypes.c_int),
+        ('cookie', ctypes.c_uint),
+        ('data', ctypes.c_void_p),
+    ]
+
+class _XEvent(ctypes.Union):
+    _fields_ = [
+        ('type', ctypes.c_int),
+        ('xcookie', _XGenericEventCookie),
+        ('pad', ctypes.c_long * 24),
+    ]
+
+class _XIRawEvent(ctypes.Structure):
+    _fields_ = [
+        ('type', ctypes.c_int),
+        ('serial', ctypes.c_ulong),
+        ('send_event', ctypes.c_int),
+        ('display', ctypes.c_void_p),
+        ('extension', ctypes.c_int),
+        ('evtype', ctypes.c_int),
+        ('time', ctypes.c_ulong),
+        ('deviceid', ctypes.c_int),
+        ('sourceid', ctypes.c_int),
+        ('detail', ctypes.c_int),
+        ('flags', ctypes.c_int),
+    ]
+
+_xlib = None
+
+def load_xlib():
+    global _xlib
+    if _xlib is None:
+        xlib = ctypes.CDLL(ctypes.util.find_library('X11'))
+        xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        xlib.XOpenDisplay.restype = ctypes.c_void_p
+        xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+        xlib.XConnectionNumber.argtypes = [ctypes.c_void_p]
+        xlib.XQueryExtension.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)]
+        xlib.XPending.argtypes = [ctypes.c_void_p]
+        xlib.XNextEvent.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XEvent)]
+        xlib.XGetEventData.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XGenericEventCookie)]
+        xlib.XFreeEventData.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XGenericEventCookie)]
+        xlib.XFlush.argtypes = [ctypes.c_void_p]
+        xlib.XSync.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        xlib.XStringToKeysym.argtypes = [ctypes.c_char_p]
+        xlib.XStringToKeysym.restype = ctypes.c_ulong
+        xlib.XKeysymToKeycode.argtypes = [ctypes.c_void_p, ctypes.c_ulong]
+        xlib.XKeysymToKeycode.restype = ctypes.c_ubyte
+        xlib.XGrabKey.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_uint, ctypes.c_ulong, ctypes.c_int, ctypes.c_int, ctypes.c_int]
+        xlib.XUngrabKey.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_uint, ctypes.c_ulong]
+        xlib.XSetErrorHandler.argtypes = [ctypes.c_void_p]
+        xlib.XSetErrorHandler.restype = ctypes.c_void_p
+        _xlib = xlib
+    return _xlib
+
+class XInput2EventSource(PointerInputSource):
+    GENERIC_EVENT = 35
+    XI_ALL_MASTER_DEVICES = 1
+    XI_RAW_BUTTON_PRESS = 15
+    XI_RAW_BUTTON_RELEASE = 16
+    XI_RAW_MOTION = 17
+    XI_LAST_EVENT = 26
+
+    @staticmethod
+    def is_available():
+        return (QtGui.QGuiApplication.platformName() == 'xcb'
+                and bool(os.environ.get('DISPLAY'))
+                and ctypes.util.find_library('X11') is not None
+                and ctypes.util.find_library('Xi') is not None)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.xlib = load_xlib()
+        self.xi = ctypes.CDLL(ctypes.util.find_library('Xi'))
+        self.xi.XIQueryVersion.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)]
+        self.xi.XISelectEvents.argtypes = [ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(_XIEventMask), ctypes.c_int]
+
+        self.display = self.xlib.XOpenDisplay(None)
+        if not self.display:
+            raise OSError('Не удалось подключиться к X-серверу')
+        opcode, event, error = ctypes.c_int(), ctypes.c_int(), ctypes.c_int()
+        if not self.xlib.XQueryExtension(self.display, b'XInputExtension', ctypes.byref(opcode), ctypes.byref(event), ctypes.byref(error)):
+            self.xlib.XCloseDisplay(self.display)
+            raise OSError('XInputExtension недоступно')
+        major, minor = ctypes.c_int(2), ctypes.c_int(0)
+        if self.xi.XIQueryVersion(self.display, ctypes.byref(major), ctypes.byref(minor)) != 0:
+            self.xlib.XCloseDisplay(self.display)
+            raise OSError('XInput2 не поддерживается')
+        self.opcode = opcode.value
+
+        mask_bytes = (ctypes.c_ubyte * ((self.XI_LAST_EVENT >> 3) + 1))()
+        for evtype in (self.XI_RAW_BUTTON_PRESS, self.XI_RAW_BUTTON_RELEASE, self.XI_RAW_MOTION):
+            mask_bytes[evtype >> 3] |= 1 << (evtype & 7)
+        mask = _XIEventMask(self.XI_ALL_MASTER_DEVICES, len(mask_bytes), mask_bytes)
+        self.xi.XISelectEvents(self.display, self.xlib.XDefaultRootWindow(self.display), ctypes.byref(mask), 1)
+        self.xlib.XFlush(self.display)
+
+        self.last_pos = None
+        self.left_down = False
+        self.notifier = QtCore.QSocketNotifier(self.xlib.XConnectionNumber(self.display), QtCore.QSocketNotifier.Read, self)
+        self.notifier.setEnabled(False)
+        self.notifier.activated.connect(self.process_events)
+
+    def start(self):
+        self.last_pos = QtGui.QCursor.pos()
+        self.moved.emit(self.last_pos)
+        self.notifier.setEnabled(True)
+        self.process_events()
+
+    def stop(self):
+        self.notifier.setEnabled(False)
+
+    def process_events(self, *args):
+        if not self.display:
+            return
+        moved = False
+        event = _XEvent()
+        while self.xlib.XPending(self.display):
+            self.xlib.XNextEvent(self.display, ctypes.byref(event))
+            cookie = event.xcookie
+            if event.type != self.GENERIC_EVENT or cookie.extension != self.opcode:
+                continue
+            if not self.xlib.XGetEventData(self.display, ctypes.byref(cookie)):
+                continue
+            try:
+                if cookie.evtype == self.XI_RAW_MOTION:
+                    moved = True
+                elif cookie.evtype in (self.XI_RAW_BUTTON_PRESS, self.XI_RAW_BUTTON_RELEASE):
+                    raw = ctypes.cast(cookie.data, ctypes.POINTER(_XIRawEvent)).contents
+                    if raw.detail == 1:
+                        if moved:
+                            self.emit_position()
+                            moved = False
+                        left_down = cookie.evtype == self.XI_RAW_BUTTON_PRESS
+                        if left_down != self.left_down:
+                            self.left_down = left_down
+                            self.left_button_changed.emit(left_down)
+            finally:
+                self.xlib.XFreeEventData(self.display, ctypes.byref(cookie))
+        if moved:
+            self.emit_position()
+
+    def emit_position(self):
+        pos = QtGui.QCursor.pos()
+        if pos != self.last_pos:
+            self.last_pos = pos
+            self.moved.emit(pos)
+
+    def close(self):
+        self.stop()
+        if self.display:
+            self.xlib.XCloseDisplay(self.display)
+            self.display = None
+
+class _HotkeyEventFilter(QtCore.QAbstractNativeEventFilter):
+    WM_HOTKEY = 0x0312
+
+    def __init__(self, hotkey):
+        super().__init__()
+        self.hotkey = hotkey
+
+    def nativeEventFilter(self, event_type, message):
+        if bytes(event_type) == b'windows_generic_MSG':
+            msg = ctypes.wintypes.MSG.from_address(int(message))
+            if msg.message == self.WM_HOTKEY and msg.wParam == self.hotkey.HOTKEY_ID:
+                self.hotkey.activated.emit()
+                return True, 0
+        return False, 0
+
+_XErrorHandler = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p)
+
+class GlobalHotkey(QtCore.QObject):
+    activated = QtCore.pyqtSignal()
+    HOTKEY_ID = 0x5054
+    WIN_MODIFIERS = {
+        QtCore.Qt.AltModifier: 0x0001,
+        QtCore.Qt.ControlModifier: 0x0002,
+        QtCore.Qt.ShiftModifier: 0x0004,
+        QtCore.Qt.MetaModifier: 0x0008,
+    }
+    WIN_NOREPEAT = 0x4000
+    X11_MODIFIERS = {
+        QtCore.Qt.ShiftModifier: 1 << 0,
+        QtCore.Qt.ControlModifier: 1 << 2,
+        QtCore.Qt.AltModifier: 1 << 3,
+        QtCore.Qt.MetaModifier: 1 << 6,
+    }
+    X11_IGNORED_MODIFIERS = (0, 1 << 1, 1 << 4, (1 << 1) | (1 << 4))
+    X11_KEY_PRESS = 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.sequence = ''
+        self.registered = False
+        self.event_filter = None
+        self.display = None
+        self.notifier = None
+        self.grab = None
+        self.x11_errors = 0
+        self.error_handler = _XErrorHandler(self.on_x11_error)
+
+    def parse(self, sequence):
+        keys = QtGui.QKeySequence(sequence, QtGui.QKeySequence.PortableText)
+        if keys.isEmpty():
+            return None, 0
+        combined = int(keys[0])
+        key = combined & ~int(QtCore.Qt.KeyboardModifierMask)
+        modifiers = combined & int(QtCore.Qt.KeyboardModifierMask)
+        return key, modifiers
+
+    def register(self, sequence):
+        self.unregister()
+        self.sequence = sequence
+        key, modifiers = self.parse(sequence)
+        if key is None:
+            return False
+        if sys.platform == 'win32':
+            self.registered = self.register_windows(key, modifiers)
+        elif QtGui.QGuiApplication.platformName() == 'xcb' and ctypes.util.find_library('X11'):
+            self.registered = self.register_x11(key, modifiers)
+        return self.registered
+
+    def register_windows(self, key, modifiers):
+        import ctypes.wintypes
+        if QtCore.Qt.Key_A <= key <= QtCore.Qt.Key_Z or QtCore.Qt.Key_0 <= key <= QtCore.Qt.Key_9:
+            vk = key
+        elif QtCore.Qt.Key_F1 <= key <= QtCore.Qt.Key_F24:
+            vk = 0x70 + key - QtCore.Qt.Key_F1
+        elif key == QtCore.Qt.Key_Space:
+            vk = 0x20
+        else:
+            return False
+        flags = self.WIN_NOREPEAT
+        for qt_modifier, win_modifier in self.WIN_MODIFIERS.items():
+            if modifiers & int(qt_modifier):
+                flags |= win_modifier
+        if not ctypes.windll.user32.RegisterHotKey(None, self.HOTKEY_ID, flags, vk):
+            return False
+        self.event_filter = _HotkeyEventFilter(self)
+        QtCore.QCoreApplication.instance().installNativeEventFilter(self.event_filter)
+        return True
+
+    def register_x11(self, key, modifiers):
+        xlib = load_xlib()
+        name = QtGui.QKeySequence(key).toString(QtGui.QKeySequence.PortableText)
+        name = name.lower() if len(name) == 1 or name == 'Space' else name
+        keysym = xlib.XStringToKeysym(name.encode('ascii', 'ignore'))
+        if not keysym:
+            return False
+        display = xlib.XOpenDisplay(None)
+        if not display:
+            return False
+        keycode = xlib.XKeysymToKeycode(display, keysym)
+        mask = 0
+        for qt_modifier, x_modifier in self.X11_MODIFIERS.items():
+            if modifiers & int(qt_modifier):
+                mask |= x_modifier
+        root = xlib.XDefaultRootWindow(display)
+        self.x11_errors = 0
+        previous_handler = xlib.XSetErrorHandler(ctypes.cast(self.error_handler, ctypes.c_void_p))
+        for extra in self.X11_IGNORED_MODIFIERS:
+            xlib.XGrabKey(display, keycode, mask | extra, root, 1, 1, 1)
+        xlib.XSync(display, 0)
+        xlib.XSetErrorHandler(previous_handler)
+        if self.x11_errors:
+            xlib.XCloseDisplay(display)
+            return False
+        self.display = display
+        self.grab = (keycode, mask, root)
+        self.notifier = QtCore.QSocketNotifier(xlib.XConnectionNumber(display), QtCore.QSocketNotifier.Read, self)
+        self.notifier.activated.connect(self.process_x11_events)
+        return True
+
+    def on_x11_error(self, display, error):
+        self.x11_errors += 1
+        return 0
+
+    def process_x11_events(self, *args):
+        xlib = load_xlib()
+        event = _XEvent()
+        while self.display and xlib.XPending(self.display):
+            xlib.XNextEvent(self.display, ctypes.byref(event))
+            if event.type == self.X11_KEY_PRESS:
+                self.activated.emit()
+
+    def unregister(self):
+        if self.event_filter is not None:
+            ctypes.windll.user32.UnregisterHotKey(None, self.HOTKEY_ID)
+            QtCore.QCoreApplication.instance().removeNativeEventFilter(self.event_filter)
+            self.event_filter = None
+        if self.display:
+            xlib = load_xlib()
+            self.notifier.setEnabled(False)
+            self.notifier.deleteLater()
+            self.notifier = None
+            keycode, mask, root = self.grab
+            for extra in self.X11_IGNORED_MODIFIERS:
+                xlib.XUngrabKey(self.display, keycode, mask | extra, root)
+            xlib.XCloseDisplay(self.display)
+            self.display = None
+        self.registered = False
+
+class RemoteControlServer:
+    def __init__(self, source, host, port, token=''):
+        self.source = source
+        self.host = host
+        self.port = port
+        self.token = token
+        self.loop = None
+        self.stopping = None
+        self.thread = None
+        self.ready = threading.Event()
+        self.error = None
+
+    def start(self):
+        if self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self.run, name='pointer-remote', daemon=True)
+        self.thread.start()
+        self.ready.wait(2)
+        if self.error is not None:
+            raise self.error
+
+    def run(self):
+        import asyncio
+        self.loop = asyncio.new_event_loop()
+        try:
+            self.loop.run_until_complete(self.serve())
+        except OSError as e:
+            self.error = e
+            self.ready.set()
+        finally:
+            self.loop.close()
+
+    async def serve(self):
+        import asyncio
+        self.stopping = asyncio.Event()
+        transport, protocol = await self.loop.create_datagram_endpoint(
+            lambda: _RemoteDatagramProtocol(self), local_addr=(self.host, self.port)
+        )
+        try:
+            server = await asyncio.start_server(self.handle_connection, self.host, self.port, limit=REMOTE_MAX_MESSAGE * 4)
+        except OSError:
+            transport.close()
+            raise
+        self.ready.set()
+        async with server:
+            await self.stopping.wait()
+        transport.close()
+
+    def stop(self):
+        if self.thread is None:
+            return
+        if self.loop is not None and self.stopping is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.stopping.set)
+        self.thread.join(2)
+        self.thread = None
+
+    def handle_message(self, client, data):
+        if len(data) > REMOTE_MAX_MESSAGE:
+            return
+        try:
+            message = json.loads(data)
+        except ValueError:
+            return
+        if not isinstance(message, dict):
+            return
+        token = message.get('token', '')
+        if not isinstance(token, str) or not hmac.compare_digest(token.encode('utf-8'), self.token.encode('utf-8')):
+            return
+        self.source.push(client, message)
+
+    async def handle_connection(self, reader, writer):
+        import asyncio
+        try:
+            request = await reader.readuntil(b'\r\n\r\n')
+            headers = {}
+            for line in request.decode('latin-1').split('\r\n')[1:]:
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+            key = headers.get('sec-websocket-key')
+            if key is None:
+                page = REMOTE_PAGE.encode('utf-8')
+                writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\n')
+                writer.write(f'Content-Length: {len(page)}\r\nConnection: close\r\n\r\n'.encode('ascii') + page)
+                await writer.drain()
+                return
+            accept = base64.b64encode(hashlib.sha1(key.encode('latin-1') + WEBSOCKET_GUID).digest())
+            writer.write(b'HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\nSec-WebSocket-Accept: ' + accept + b'\r\n\r\n')
+            await writer.drain()
+            client = ('ws', id(writer))
+            while True:
+                head = await reader.readexactly(2)
+                opcode = head[0] & 0x0f
+                length = head[1] & 0x7f
+                if length == 126:
+                    length = struct.unpack('>H', await reader.readexactly(2))[0]
+                elif length == 127:
+                    length = struct.unpack('>Q', await reader.readexactly(8))[0]
+                if length > REMOTE_MAX_MESSAGE:
+                    break
+                if not head[1] & 0x80 or (opcode & 0x8 and (length > WEBSOCKET_CONTROL_MAX or not head[0] & 0x80)):
+                    writer.write(b'\x88\x02' + struct.pack('>H', WEBSOCKET_PROTOCOL_ERROR))
+                    break
+                mask = await reader.readexactly(4)
+                payload = bytes(b ^ mask[i % 4] for i, b in enumerate(await reader.readexactly(length)))
+                if opcode == 0x8:
+                    writer.write(b'\x88\x00')
+                    break
+                if opcode == 0x9:
+                    writer.write(bytes((0x8a, len(payload))) + payload)
+                elif opcode in (0x1, 0x2):
+                    self.handle_message(client, payload)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, UnicodeDecodeError):
+            pass
+        finally:
+            writer.close()
+
+class _RemoteDatagramProtocol:
+    def __init__(self, server):
+        self.server = server
+
+    def connection_made(self, transport):
+        pass
+
+    def datagram_received(self, data, addr):
+        self.server.handle_message(('udp', addr), data)
+
+    def error_received(self, exc):
+        pass
+
+    def connection_lost(self, exc):
+        pass
+
+def is_loopback_host(host):
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+def remote_number(value):
+    value = float(value)
+    if not math.isfinite(value):
+        raise ValueError(value)
+    return value
+
+def clamp_coord(value):
+    return min(max(int(value), -REMOTE_COORD_LIMIT), REMOTE_COORD_LIMIT)
+
+class RemoteInputSource(PointerInputSource):
+    wake = QtCore.pyqtSignal()
+
+    def __init__(self, host='127.0.0.1', port=8765, token='', parent=None):
+        if not token and not is_loopback_host(host):
+            raise ValueError('remote_token is required when listening beyond localhost')
+        super().__init__(parent)
+        self.lock = threading.Lock()
+        self.target = None
+        self.delta_x = 0
+        self.delta_y = 0
+        self.buttons = []
+        self.pending = False
+        self.last_seq = {}
+        self.received = 0
+        self.dropped = 0
+        self.running = False
+        self.position = QtGui.QCursor.pos()
+        screen = QtWidgets.QApplication.primaryScreen()
+        self.frame_interval = 1.0 / (screen.refreshRate() if screen and screen.refreshRate() > 0 else 60)
+        self.last_drain = 0.0
+        self.timer = QtCore.QTimer(self)
+        self.timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.drain)
+        self.wake.connect(self.schedule_drain)
+        self.server = RemoteControlServer(self, host, port, token)
+        self.server.start()
+
+    def start(self):
+        self.running = True
+
+    def stop(self):
+        self.running = False
+        self.timer.stop()
+
+    def close(self):
+        self.stop()
+        self.server.stop()
+
+    def push(self, client, message):
+        kind = message.get('type')
+        seq = message.get('seq')
+        with self.lock:
+            self.received += 1
+            if isinstance(seq, int):
+                last = self.last_seq.get(client)
+                if last is not None and last - REMOTE_SEQ_RESET_WINDOW < seq <= last:
+                    self.dropped += 1
+                    return
+                self.last_seq[client] = seq
+            try:
+                if kind == 'move':
+                    if 'nx' in message:
+                        nx = min(max(remote_number(message['nx']), 0.0), 1.0)
+                        ny = min(max(remote_number(message['ny']), 0.0), 1.0)
+                        self.target = ('normalized', nx, ny)
+                    else:
+                        self.target = ('absolute', clamp_coord(remote_number(message['x'])), clamp_coord(remote_number(message['y'])))
+                    self.delta_x = self.delta_y = 0
+                elif kind == 'move_by':
+                    dx, dy = remote_number(message['dx']), remote_number(message['dy'])
+                    self.delta_x = clamp_coord(self.delta_x + dx)
+                    self.delta_y = clamp_coord(self.delta_y + dy)
+                elif kind in ('down', 'up'):
+                    self.buttons.append(kind == 'down')
+                else:
+                    return
+            except (KeyError, TypeError, ValueError):
+                return
+            wake = not self.pending
+            self.pending = True
+        if wake:
+            self.wake.emit()
+
+    def schedule_drain(self):
+        delay = self.last_drain + self.frame_interval - time.perf_counter()
+        self.timer.start(max(0, int(delay * 1000)))
+
+    def drain(self):
+        with self.lock:
+            target = self.target
+            delta_x, delta_y = self.delta_x, self.delta_y
+            buttons = self.buttons
+            self.target = None
+            self.delta_x = self.delta_y = 0
+            self.buttons = []
+            self.pending = False
+        self.last_drain = time.perf_counter()
+        if not self.running:
+            return
+        screen = QtWidgets.QApplication.primaryScreen()
+        bounds = screen.virtualGeometry() if screen else QtCore.QRect(0, 0, 1, 1)
+        position = self.position
+        if target is not None:
+            kind, x, y = target
+            if kind == 'normalized':
+                x = bounds.x() + x * (bounds.width() - 1)
+                y = bounds.y() + y * (bounds.height() - 1)
+            position = QtCore.QPoint(int(x), int(y))
+        position = QtCore.QPoint(
+            min(max(position.x() + delta_x, bounds.left()), bounds.right()),
+            min(max(position.y() + delta_y, bounds.top()), bounds.bottom()),
+        )
+        if position != self.position:
+            self.position = position
+            self.moved.emit(position)
+        for down in buttons:
+            self.left_button_changed.emit(down)
+
+def create_input_source(backend='auto', parent=None, settings=None):
+    if backend == 'remote' and settings is not None:
+        try:
+            return RemoteInputSource(settings['remote_host'], settings['remote_port'], settings['remote_token'], parent)
+        except (OSError, ValueError):
+            pass
+    if backend in ('auto', 'xinput2') and XInput2EventSource.is_available():
+        try:
+            return XInput2EventSource(parent)
+        except OSError:
+            pass
+    return AdaptivePollingSource(parent)
+
+class ClickSoundEngine(QtCore.QObject):
+    sound_started = QtCore.pyqtSignal(float)
+
+    def __init__(self, sound_path, volume, voices=CLICK_VOICES, parent=None):
+        super().__init__(parent)
+        from PyQt5 import QtMultimedia
+        url = QtCore.QUrl.fromLocalFile(sound_path)
+        self.voices = []
+        self.play_order = collections.deque()
+        self.pending = {}
+        self.stolen = 0
+        self.last_latency_ms = None
+        self.max_latency_ms = 0.0
+        for _ in range(voices):
+            voice = QtMultimedia.QSoundEffect(self)
+            track_resource('click_voices', voice)
+            voice.setSource(url)
+            voice.playingChanged.connect(lambda v=voice: self.on_playing_changed(v))
+            self.voices.append(voice)
+        self.set_volume(volume)
+
+    def set_volume(self, volume):
+        for voice in self.voices:
+            voice.setVolume(volume / 100)
+
+    def free_voice(self):
+        for voice in self.voices:
+            if not voice.isPlaying() and voice not in self.pending:
+                return voice
+        return None
+
+    def play(self):
+        voice = self.free_voice()
+        if voice is None:
+            voice = self.play_order.popleft()
+            voice.stop()
+            self.pending.pop(voice, None)
+            self.stolen += 1
+        elif voice in self.play_order:
+            self.play_order.remove(voice)
+        self.play_order.append(voice)
+        self.pending[voice] = time.perf_counter()
+        voice.play()
+
+    def on_playing_changed(self, voice):
+        if not voice.isPlaying():
+            return
+        started = self.pending.pop(voice, None)
+        if started is None:
+            return
+        latency = (time.perf_counter() - started) * 1000
+        self.last_latency_ms = latency
+        self.max_latency_ms = max(self.max_latency_ms, latency)
+        self.sound_started.emit(latency)
+
+    def stop(self):
+        for voice in self.voices:
+            voice.stop()
+        self.pending.clear()
+        self.play_order.clear()
+
+def load_pcm(path):
+    from PyQt5 import QtMultimedia
+    with wave.open(path, 'rb') as wav:
+        sample_width = wav.getsampwidth()
+        audio_format = QtMultimedia.QAudioFormat()
+        audio_format.setSampleRate(wav.getframerate())
+        audio_format.setChannelCount(wav.getnchannels())
+        audio_format.setSampleSize(sample_width * 8)
+        audio_format.setCodec('audio/pcm')
+        audio_format.setByteOrder(QtMultimedia.QAudioFormat.LittleEndian)
+        if sample_width == 1:
+            audio_format.setSampleType(QtMultimedia.QAudioFormat.UnSignedInt)
+        else:
+            audio_format.setSampleType(QtMultimedia.QAudioFormat.SignedInt)
+        data = wav.readframes(wav.getnframes())
+    return audio_format, data
+
+class LoopingPcmDevice(QtCore.QIODevice):
+    def __init__(self, data, frame_bytes, parent=None):
+        super().__init__(parent)
+        self.data = memoryview(data)
+        self.frame_bytes = frame_bytes
+        self.position = 0
+        self.open(QtCore.QIODevice.ReadOnly | QtCore.QIODevice.Unbuffered)
+
+    def rewind(self):
+        self.position = 0
+
+    def isSequential(self):
+        return True
+
+    def bytesAvailable(self):
+        return len(self.data) + super().bytesAvailable()
+
+    def readData(self, maxlen):
+        size = len(self.data)
+        remaining = maxlen - maxlen % self.frame_bytes
+        chunks = []
+        while remaining > 0 and size:
+            chunk = self.data[self.position:self.position + remaining]
+            chunks.append(chunk)
+            remaining -= len(chunk)
+            self.position = (self.position + len(chunk)) % size
+        return b''.join(chunks)
+
+    def writeData(self, data):
+        return -1
+
+class HoldLoopPlayer(QtCore.QObject):
+    def __init__(self, sound_path, volume, parent=None):
+        super().__init__(parent)
+        from PyQt5 import QtMultimedia
+        track_resource('hold_players', self)
+        try:
+            audio_format, data = load_pcm(sound_path)
+        except (wave.Error, EOFError, OSError):
+            audio_format, data = load_pcm(SOUND_LOOP)
+        self.memory_bytes = len(data)
+        self.device = LoopingPcmDevice(data, audio_format.bytesPerFrame(), self)
+        self.output = QtMultimedia.QAudioOutput(audio_format, self)
+        self.output.setBufferSize(audio_format.bytesForDuration(HOLD_BUFFER_MS * 1000))
+        self.QAudio = QtMultimedia.QAudio
+        self.volume = volume / 100
+        self.gain = 0.0
+        self.playing = False
+        self.fade = QtCore.QVariantAnimation(self)
+        self.fade.valueChanged.connect(self.apply_gain)
+        self.fade.finished.connect(self.on_fade_finished)
+
+    def set_volume(self, volume):
+        self.volume = volume / 100
+        self.apply_gain(self.gain)
+
+    def apply_gain(self, gain):
+        self.gain = gain
+        self.output.setVolume(self.gain * self.volume)
+
+    def fade_to(self, gain, duration):
+        self.fade.stop()
+        self.fade.setDuration(duration)
+        self.fade.setStartValue(self.gain)
+        self.fade.setEndValue(float(gain))
+        self.fade.start()
+
+    def play(self):
+        self.playing = True
+        self.device.rewind()
+        self.apply_gain(0.0)
+        state = self.output.state()
+        if state == self.QAudio.SuspendedState:
+            self.output.resume()
+        elif state != self.QAudio.ActiveState:
+            self.output.start(self.device)
+        self.fade_to(1.0, HOLD_FADE_IN_MS)
+
+    def release(self):
+        self.playing = False
+        self.fade_to(0.0, HOLD_FADE_OUT_MS)
+
+    def on_fade_finished(self):
+        if not self.playing and self.output.state() == self.QAudio.ActiveState:
+            self.output.suspend()
+
+    def stop(self):
+        self.playing = False
+        self.fade.stop()
+        self.output.stop()
+
+def logical_size(pixmap):
+    dpr = pixmap.devicePixelRatio()
+    return QtCore.QSize(int(pixmap.width() / dpr), int(pixmap.height() / dpr))
+
+def scale_image(image, size, mirror, dpr):
+    image = image.scaled(size * dpr, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+    if mirror:
+        image = image.mirrored(True, False)
+    return image
+
+class DiskAssetCache:
+    def __init__(self, path=None, prebuilt=PREBUILT_CACHE_PATH):
+        self.path = path or CACHE_PATH
+        self.prebuilt = prebuilt
+        self.hashes = {}
+        self.lock = threading.Lock()
+
+    def content_hash(self, path):
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            digest = self.hashes.get(key)
+        if digest is None:
+            sha = hashlib.sha1()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    sha.update(chunk)
+            digest = sha.hexdigest()
+            with self.lock:
+                self.hashes[key] = digest
+        return digest
+
+    def image_name(self, path, size, mirror, dpr):
+        return f"{self.content_hash(path)}_{size.width()}x{size.height()}_{int(mirror)}_{dpr:g}.argb"
+
+    def image_path(self, path, size, mirror, dpr):
+        return os.path.join(self.path, self.image_name(path, size, mirror, dpr))
+
+    def load_image(self, path, size, mirror, dpr):
+        name = self.image_name(path, size, mirror, dpr)
+        for directory in (self.path, self.prebuilt):
+            if directory is not None:
+                image = self.read_image(os.path.join(directory, name))
+                if image is not None:
+                    return image
+        return None
+
+    def read_image(self, target):
+        try:
+            with open(target, 'rb') as f:
+                magic, width, height, bytes_per_line = struct.unpack('<4sIII', f.read(16))
+                data = f.read()
+        except (OSError, struct.error):
+            return None
+        if magic != DISK_CACHE_MAGIC or len(data) != height * bytes_per_line:
+            return None
+        return QtGui.QImage(data, width, height, bytes_per_line, QtGui.QImage.Format_ARGB32_Premultiplied).copy()
+
+    def store_image(self, path, size, mirror, dpr, image):
+        image = image.convertToFormat(QtGui.QImage.Format_ARGB32_Premultiplied)
+        bits = image.constBits()
+        bits.setsize(image.sizeInBytes())
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            target = self.image_path(path, size, mirror, dpr)
+            tmp_path = f"{target}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(struct.pack('<4sIII', DISK_CACHE_MAGIC, image.width(), image.height(), image.bytesPerLine()))
+                f.write(bits.asstring())
+            os.replace(tmp_path, target)
+        except OSError:
+            pass
+
+    def clear(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+class AssetCache:
+    def __init__(self, max_entries=ASSET_CACHE_SIZE, max_sources=ASSET_SOURCE_CACHE_SIZE, disk=None):
+        self.max_entries = max_entries
+        self.max_sources = max_sources
+        self.disk = disk
+        self.sources = collections.OrderedDict()
+        self.pixmaps = collections.OrderedDict()
+        self.prepared = {}
+        self.executor = ThreadPoolExecutor(max_workers=2)
+
+    def source(self, path):
+        image = self.sources.get(path)
+        if image is not None:
+            self.sources.move_to_end(path)
+            return image
+        image = QtGui.QImage(path)
+        self.sources[path] = image
+        while len(self.sources) > self.max_sources:
+            self.sources.popitem(last=False)
+        return image
+
+    def source_size(self, path):
+        image = self.sources.get(path)
+        if image is not None:
+            return image.size()
+        return QtGui.QImageReader(path).size()
+
+    def scaled_size(self, path, scale):
+        size = self.source_size(path)
+        return QtCore.QSize(int(size.width() * scale), int(size.height() * scale))
+
+    def load_scaled(self, path, size, mirror, dpr):
+        if self.disk is not None:
+            image = self.disk.load_image(path, size, mirror, dpr)
+            if image is not None:
+                return image
+        image = scale_image(QtGui.QImage(path), size, mirror, dpr)
+        if self.disk is not None and not image.isNull():
+            self.disk.store_image(path, size, mirror, dpr, image)
+        return image
+
+    def prepare(self, path, size, mirror=False, dpr=1.0):
+        key = (path, size.width(), size.height(), mirror, dpr)
+        if key in self.pixmaps:
+            return None
+        future = self.prepared.get(key)
+        if future is None:
+            future = self.executor.submit(self.load_scaled, path, size, mirror, dpr)
+            self.prepared[key] = future
+        return future
+
+    def prepare_scaled(self, path, scale, mirror=False, dpr=1.0):
+        return self.prepare(path, self.scaled_size(path, scale), mirror, dpr)
+
+    def pixmap(self, path, size, mirror=False, dpr=1.0):
+        key = (path, size.width(), size.height(), mirror, dpr)
+        pixmap = self.pixmaps.get(key)
+        if pixmap is not None:
+            self.pixmaps.move_to_end(key)
+            return pixmap
+        future = self.prepared.pop(key, None)
+        image = future.result() if future is not None else None
+        if image is None and self.disk is not None:
+            image = self.disk.load_image(path, size, mirror, dpr)
+        if image is None:
+            image = scale_image(self.source(path), size, mirror, dpr)
+            if self.disk is not None and not image.isNull():
+                self.disk.store_image(path, size, mirror, dpr, image)
+        pixmap = QtGui.QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(dpr)
+        self.pixmaps[key] = pixmap
+        while len(self.pixmaps) > self.max_entries:
+            self.pixmaps.popitem(last=False)
+        return pixmap
+
+    def scaled_pixmap(self, path, scale, mirror=False, dpr=1.0):
+        return self.pixmap(path, self.scaled_size(path, scale), mirror, dpr)
+
+    def memory_bytes(self):
+        sources = sum(image.sizeInBytes() for image in self.sources.values())
+        pixmaps = sum(pixmap.width() * pixmap.height() * pixmap.depth() // 8 for pixmap in self.pixmaps.values())
+        return sources + pixmaps
+
+    def trim(self):
+        self.sources.clear()
+
+    def clear(self):
+        self.sources.clear()
+        self.pixmaps.clear()
+        self.prepared.clear()
+
+_asset_cache = None
+
+def asset_cache():
+    global _asset_cache
+    if _asset_cache is None:
+        _asset_cache = AssetCache(disk=DiskAssetCache())
+    return _asset_cache
+
+def builtin_pack():
+    return {
+        'id': BUILTIN_PACK,
+        'name': 'Стандартный',
+        'cursors': [(name, os.path.join(ASSETS_PATH, filename)) for name, filename in CURSORS],
+        'click': SOUND_CLICK,
+        'hold': SOUND_LOOP,
+    }
+
+def pack_sound(root, manifest, key, default):
+    filename = manifest.get(key)
+    if not filename:
+        return default
+    path = os.path.join(root, filename)
+    if not path.lower().endswith(PACK_SOUND_EXTENSIONS) or not os.path.isfile(path):
+        raise ValueError(f'Звук {filename} не найден или не в формате WAV')
+    try:
+        with wave.open(path, 'rb') as wav:
+            wav.getnframes()
+    except (wave.Error, EOFError, OSError):
+        raise ValueError(f'Звук {filename} не найден или не в формате WAV')
+    return path
+
+def load_pack(root):
+    manifest = {}
+    manifest_path = os.path.join(root, PACK_MANIFEST)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    cursors = [
+        (cursor.get('name', cursor['image']), os.path.join(root, cursor['image']))
+        for cursor in manifest.get('cursors', [])
+    ]
+    if not cursors:
+        cursors = [
+            (os.path.splitext(filename)[0], os.path.join(root, filename))
+            for filename in sorted(os.listdir(root)) if filename.lower().endswith(PACK_IMAGE_EXTENSIONS)
+        ]
+    cursors = [(name, path) for name, path in cursors if os.path.isfile(path)]
+    if not cursors:
+        raise ValueError('В наборе нет изображений указок')
+    return {
+        'id': os.path.basename(root),
+        'name': manifest.get('name', os.path.basename(root)),
+        'cursors': cursors,
+        'click': pack_sound(root, manifest, 'click', SOUND_CLICK),
+        'hold': pack_sound(root, manifest, 'hold', SOUND_LOOP),
+    }
+
+def list_packs():
+    packs = [builtin_pack()]
+    if os.path.isdir(PACKS_PATH):
+        for name in sorted(os.listdir(PACKS_PATH)):
+            root = os.path.join(PACKS_PATH, name)
+            if not os.path.isdir(root) or name.endswith('.tmp'):
+                continue
+            try:
+                packs.append(load_pack(root))
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+    return packs
+
+def unique_pack_path(name):
+    candidate = name
+    suffix = 2
+    while candidate == BUILTIN_PACK or os.path.exists(os.path.join(PACKS_PATH, candidate)):
+        candidate = f'{name}_{suffix}'
+        suffix += 1
+    return os.path.join(PACKS_PATH, candidate)
+
+def import_pack(source):
+    os.makedirs(PACKS_PATH, exist_ok=True)
+    if zipfile.is_zipfile(source):
+        target = unique_pack_path(os.path.splitext(os.path.basename(source))[0])
+        tmp_path = target + '.tmp'
+        try:
+            with zipfile.ZipFile(source) as archive:
+                for member in archive.namelist():
+                    if os.path.isabs(member) or '..' in member.replace('\\', '/').split('/'):
+                        raise ValueError(f'Недопустимый путь в архиве: {member}')
+                archive.extractall(tmp_path)
+            root = tmp_path
+            entries = os.listdir(root)
+            if PACK_MANIFEST not in entries and len(entries) == 1 and os.path.isdir(os.path.join(root, entries[0])):
+                root = os.path.join(root, entries[0])
+            load_pack(root)
+            os.replace(root, target)
+        finally:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+    else:
+        root = source if os.path.isdir(source) else os.path.dirname(source)
+        load_pack(root)
+        target = unique_pack_path(os.path.basename(os.path.normpath(root)))
+        shutil.copytree(root, target)
+    return load_pack(target)
+
+def tilt_angles():
+    step = -1 if TILT_ANGLE < 0 else 1
+    return list(range(0, TILT_ANGLE + step, step))
+
+class RotationFrameCache:
+    def __init__(self, max_cursors=ROTATION_CACHE_CURSORS):
+        self.max_cursors = max_cursors
+        self._frames = collections.OrderedDict()
+
+    def frames_for(self, key, load_pixmap, rotated=True):
+        frames = self._frames.get(key)
+        if frames is None:
+            frames = self.build_frames(load_pixmap()) if rotated else {0: load_pixmap()}
+            self._frames[key] = frames
+            while len(self._frames) > self.max_cursors:
+                self._frames.popitem(last=False)
+        else:
+            self._frames.move_to_end(key)
+        return frames
+
+    def build_frames(self, pixmap):
+        frames = {0: pixmap}
+        for angle in tilt_angles()[1:]:
+            frame = pixmap.transformed(QtGui.QTransform().rotate(angle), QtCore.Qt.SmoothTransformation)
+            frame.setDevicePixelRatio(pixmap.devicePixelRatio())
+            frames[angle] = frame
+        return frames
+
+    def memory_bytes(self):
+        return sum(
+            frame.width() * frame.height() * frame.depth() // 8
+            for frames in self._frames.values() for frame in frames.values()
+        )
+
+    def trim(self, keep):
+        for key in list(self._frames):
+            if key not in keep:
+                del self._frames[key]
+
+    def clear(self):
+        self._frames.clear()
+
+class PointerStyleBuffers:
+    def __init__(self):
+        self.hole = None
+        self.hole_key = None
+        self.lens = None
+        self.lens_mask = None
+        self.lens_key = None
+        self.lens_valid = False
+        self.captures = 0
+
+    def spotlight_hole(self, radius, dpr):
+        key = (radius, dpr)
+        if self.hole_key != key:
+            side = int(math.ceil(2 * radius * dpr))
+            hole = QtGui.QImage(side, side, QtGui.QImage.Format_ARGB32_Premultiplied)
+            hole.fill(QtGui.QColor(*SPOTLIGHT_DIM))
+            gradient = QtGui.QRadialGradient(side / 2, side / 2, side / 2)
+            gradient.setColorAt(0, QtCore.Qt.black)
+            gradient.setColorAt(max(0.0, 1 - SPOTLIGHT_FEATHER / radius), QtCore.Qt.black)
+            gradient.setColorAt(1, QtCore.Qt.transparent)
+            painter = QtGui.QPainter(hole)
+            painter.setRenderHint(QtGui.QPainter.Antialiasing)
+            painter.setCompositionMode(QtGui.QPainter.CompositionMode_DestinationOut)
+            painter.setPen(QtCore.Qt.NoPen)
+            painter.setBrush(QtGui.QBrush(gradient))
+            painter.drawEllipse(0, 0, side, side)
+            painter.end()
+            hole.setDevicePixelRatio(dpr)
+            self.hole = hole
+            self.hole_key = key
+        return self.hole
+
+    def lens_buffers(self, size, dpr):
+        key = (size, dpr)
+        if self.lens_key != key:
+            side = int(math.ceil(size * dpr))
+            self.lens = QtGui.QImage(side, side, QtGui.QImage.Format_ARGB32_Premultiplied)
+            self.lens.fill(QtCore.Qt.transparent)
+            self.lens.setDevicePixelRatio(dpr)
+            mask = QtGui.QImage(side, side, QtGui.QImage.Format_ARGB32_Premultiplied)
+            mask.fill(QtCore.Qt.transparent)
+            painter = QtGui.QPainter(mask)
+            painter.setRenderHint(QtGui.QPainter.Antialiasing)
+            painter.setPen(QtCore.Qt.NoPen)
+            painter.setBrush(QtCore.Qt.black)
+            painter.drawEllipse(0, 0, side, side)
+            painter.end()
+            mask.setDevicePixelRatio(dpr)
+            self.lens_mask = mask
+            self.lens_key = key
+            self.lens_valid = False
+        return self.lens
+
+    def capture(self, screen, source, size, dpr):
+        lens = self.lens_buffers(size, dpr)
+        bounds = screen.geometry()
+        rect = QtCore.QRect(source)
+        rect.moveLeft(min(max(rect.left(), 0), max(0, bounds.width() - rect.width())))
+        rect.moveTop(min(max(rect.top(), 0), max(0, bounds.height() - rect.height())))
+        grab = screen.grabWindow(0, rect.x(), rect.y(), rect.width(), rect.height())
+        if grab.isNull():
+            self.lens_valid = False
+            return False
+        painter = QtGui.QPainter(lens)
+        painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+        painter.setCompositionMode(QtGui.QPainter.CompositionMode_Source)
+        painter.drawPixmap(QtCore.QRectF(0, 0, size, size), grab, QtCore.QRectF(grab.rect()))
+        painter.setCompositionMode(QtGui.QPainter.CompositionMode_DestinationIn)
+        painter.drawImage(0, 0, self.lens_mask)
+        painter.end()
+        self.captures += 1
+        self.lens_valid = True
+        return True
+
+    def memory_bytes(self):
+        images = [self.hole, self.lens, self.lens_mask]
+        return sum(image.sizeInBytes() for image in images if image is not None)
+
+    def clear(self):
+        self.hole = None
+        self.hole_key = None
+        self.lens = None
+        self.lens_mask = None
+        self.lens_key = None
+        self.lens_valid = False
+
+class BackdropPyramid(QtCore.QObject):
+    level_ready = QtCore.pyqtSignal(int)
+    tile_ready = QtCore.pyqtSignal(object)
+    failed = QtCore.pyqtSignal(str)
+    level_built = QtCore.pyqtSignal(int)
+    tile_loaded = QtCore.pyqtSignal(object, object)
+
+    def __init__(self, path, cache_bytes, root=None, decode_limit=BACKDROP_DECODE_LIMIT, tile_size=BACKDROP_TILE_SIZE, parent=None):
+        super().__init__(parent)
+        reader = QtGui.QImageReader(path)
+        size = reader.size()
+        if not size.isValid() or size.isEmpty():
+            raise ValueError(reader.errorString() or 'не удалось прочитать размер изображения')
+        self.path = path
+        self.size = size
+        self.cache_bytes = cache_bytes
+        self.decode_limit = decode_limit
+        self.tile_size = tile_size
+        self.scaled_reads = reader.supportsOption(QtGui.QImageIOHandler.ScaledSize)
+        self.clipped_reads = reader.supportsOption(QtGui.QImageIOHandler.ScaledClipRect)
+        self.top = 0
+        while max(self.level_size(self.top).width(), self.level_size(self.top).height()) > tile_size:
+            self.top += 1
+        self.finest = 0
+        while self.finest <= self.top and not self.decodable(self.finest):
+            self.finest += 1
+        if self.finest > self.top:
+            raise ValueError('изображение слишком большое для этого формата, сохраните его в PNG или JPEG')
+        track_resource('backdrops', self)
+        stat = os.stat(path)
+        key = f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}|{tile_size}|{self.finest}"
+        self.directory = os.path.join(root or CACHE_PATH, 'backdrops', hashlib.sha1(key.encode('utf-8')).hexdigest())
+        self.ready = self.top + 1
+        while self.ready > self.finest and os.path.exists(self.marker_path(self.ready - 1)):
+            self.ready -= 1
+        self.tiles = collections.OrderedDict()
+        self.tile_bytes = 0
+        self.pending = set()
+        self.wanted = {}
+        self.loads = 0
+        self.evictions = 0
+        self.error = None
+        self.closed = threading.Event()
+        self.executor = None
+        self.level_built.connect(self.on_level_built)
+        self.tile_loaded.connect(self.on_tile_loaded)
+
+    def start(self):
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        if self.ready > self.finest:
+            self.executor.submit(self.build)
+        if self.ready <= self.top:
+            self.request([(self.top, 0, 0)], 'top')
+
+    def level_size(self, level):
+        scale = 1 << level
+        return QtCore.QSize(-(-self.size.width() // scale), -(-self.size.height() // scale))
+
+    def level_bytes(self, level):
+        size = self.level_size(level)
+        return size.width() * size.height() * 4
+
+    def decodable(self, level):
+        if self.clipped_reads:
+            return True
+        if not self.scaled_reads:
+            level = 0
+        return self.level_bytes(level) <= self.decode_limit
+
+    def marker_path(self, level):
+        return os.path.join(self.directory, f'level_{level}.done')
+
+    def tile_path(self, key):
+        return os.path.join(self.directory, '{}_{}_{}.png'.format(*key))
+
+    def read(self, level, clip=None):
+        reader = QtGui.QImageReader(self.path)
+        if level:
+            reader.setScaledSize(self.level_size(level))
+        if clip is not None:
+            if level:
+                reader.setScaledClipRect(clip)
+            else:
+                reader.setClipRect(clip)
+        image = reader.read()
+        if image.isNull():
+            raise OSError(reader.errorString())
+        return image
+
+    def build(self):
+        try:
+            full = self.read(0) if self.level_bytes(0) <= self.decode_limit else None
+            for level in range(self.top, self.finest - 1, -1):
+                if os.path.exists(self.marker_path(level)):
+                    continue
+                if full is not None:
+                    image = full if level == 0 else full.scaled(self.level_size(level), QtCore.Qt.IgnoreAspectRatio, QtCore.Qt.SmoothTransformation)
+                    done = self.store_tiles(level, image, 0)
+                else:
+                    done = self.build_level(level)
+                if not done:
+                    return
+                open(self.marker_path(level), 'wb').close()
+                self.level_built.emit(level)
+        except (OSError, MemoryError) as e:
+            self.error = str(e) or type(e).__name__
+            if not self.closed.is_set():
+                self.failed.emit(self.error)
+
+    def build_level(self, level):
+        size = self.level_size(level)
+        if self.level_bytes(level) <= self.decode_limit:
+            return self.store_tiles(level, self.read(level), 0)
+        rows = max(1, self.decode_limit // (size.width() * 4) // self.tile_size) * self.tile_size
+        for top in range(0, size.height(), rows):
+            band = QtCore.QRect(0, top, size.width(), min(rows, size.height() - top))
+            if self.closed.is_set() or not self.store_tiles(level, self.read(level, band), top):
+                return False
+        return True
+
+    def store_tiles(self, level, image, top):
+        os.makedirs(self.directory, exist_ok=True)
+        side = self.tile_size
+        for y in range(0, image.height(), side):
+            for x in range(0, image.width(), side):
+                if self.closed.is_set():
+                    return False
+                tile = image.copy(x, y, min(side, image.width() - x), min(side, image.height() - y))
+                target = self.tile_path((level, x // side, (top + y) // side))
+                tmp_path = f"{target}.{threading.get_ident()}.tmp"
+                if not tile.save(tmp_path, 'PNG', BACKDROP_TILE_QUALITY):
+                    raise OSError(f'не удалось сохранить {target}')
+                os.replace(tmp_path, target)
+        return True
+
+    def on_level_built(self, level):
+        self.ready = min(self.ready, level)
+        if level == self.top:
+            self.request([(self.top, 0, 0)], 'top')
+        self.level_ready.emit(level)
+
+    def tile_rect(self, key):
+        level, tx, ty = key
+        size = self.level_size(level)
+        fx = self.size.width() / size.width()
+        fy = self.size.height() / size.height()
+        side = self.tile_size
+        w = min(side, size.width() - tx * side)
+        h = min(side, size.height() - ty * side)
+        return QtCore.QRectF(tx * side * fx, ty * side * fy, w * fx, h * fy)
+
+    def tiles_in(self, level, rect):
+        size = self.level_size(level)
+        fx = size.width() / self.size.width()
+        fy = size.height() / self.size.height()
+        side = self.tile_size
+        x0 = max(0, int(rect.left() * fx) // side)
+        y0 = max(0, int(rect.top() * fy) // side)
+        x1 = min((size.width() - 1) // side, int(rect.right() * fx) // side)
+        y1 = min((size.height() - 1) // side, int(rect.bottom() * fy) // side)
+        return [(level, tx, ty) for ty in range(y0, y1 + 1) for tx in range(x0, x1 + 1)]
+
+    def level_for(self, density):
+        level = int(math.floor(math.log2(density))) if density > 1 else 0
+        return min(max(level, self.ready), self.top)
+
+    def tile(self, key):
+        image = self.tiles.get(key)
+        if image is not None:
+            self.tiles.move_to_end(key)
+        return image
+
+    def request(self, keys, owner=None):
+        self.wanted[owner] = frozenset(keys)
+        missing = [key for key in keys if key not in self.tiles]
+        if self.executor is None or self.closed.is_set():
+            return missing
+        for key in missing:
+            if key not in self.pending:
+                self.pending.add(key)
+                future = self.executor.submit(self.load_tile, key)
+                future.add_done_callback(lambda f, key=key: self.tile_loaded.emit(key, None if f.exception() else f.result()))
+        return missing
+
+    def release(self, owner):
+        self.wanted.pop(owner, None)
+
+    def load_tile(self, key):
+        if self.closed.is_set() or not any(key in keys for keys in list(self.wanted.values())):
+            return None
+        image = QtGui.QImage(self.tile_path(key))
+        if image.isNull():
+            return None
+        if image.hasAlphaChannel():
+            image = image.convertToFormat(QtGui.QImage.Format_ARGB32_Premultiplied)
+        return image
+
+    def on_tile_loaded(self, key, image):
+        self.pending.discard(key)
+        if image is None or self.closed.is_set():
+            return
+        self.tiles[key] = image
+        self.tile_bytes += image.sizeInBytes()
+        self.loads += 1
+        self.evict()
+        self.tile_ready.emit(key)
+
+    def evict(self):
+        if self.tile_bytes <= self.cache_bytes:
+            return
+        wanted = set().union(*self.wanted.values())
+        for key in list(self.tiles):
+            if self.tile_bytes <= self.cache_bytes:
+                break
+            if key in wanted:
+                continue
+            self.tile_bytes -= self.tiles.pop(key).sizeInBytes()
+            self.evictions += 1
+
+    def memory_bytes(self):
+        return self.tile_bytes
+
+    def trim(self):
+        for owner in [owner for owner in self.wanted if owner != 'top']:
+            del self.wanted[owner]
+        for key in [key for key in self.tiles if key[0] != self.top]:
+            self.tile_bytes -= self.tiles.pop(key).sizeInBytes()
+
+    def close(self):
+        self.closed.set()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+        self.tiles.clear()
+        self.tile_bytes = 0
+        self.pending.clear()
+        self.wanted.clear()
+
+class EffectScheduler(QtCore.QObject):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.enabled = True
+        self.effects = collections.deque()
+        self.glow_overlay = None
+        self.glow_center = QtCore.QPoint()
+        self.glow_start = 0.0
+        self.glow_release = None
+        self.painted = {}
+        self.clock = time.perf_counter()
+        self.dropped = 0
+        self.skipped = 0
+        screen = QtWidgets.QApplication.primaryScreen()
+        refresh_rate = screen.refreshRate() if screen and screen.refreshRate() > 0 else 60
+        self.timer = QtCore.QTimer(self)
+        self.timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self.frame_interval = 1.0 / refresh_rate
+        self.timer.setInterval(max(1, int(1000 / refresh_rate)))
+        self.timer.timeout.connect(self.tick)
+
+    def set_enabled(self, enabled):
+        self.enabled = bool(enabled)
+        if not self.enabled:
+            self.clear()
+
+    def start(self):
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def add_ripple(self, overlay, center):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.effects:
+            last_overlay, last_center, last_start, last_rect = self.effects[-1]
+            if last_overlay is overlay and now - last_start < self.frame_interval and last_center == center:
+                return
+        if len(self.effects) >= EFFECT_LIMIT:
+            self.effects.popleft()
+            self.dropped += 1
+        self.effects.append((overlay, QtCore.QPoint(center), now, self.ripple_rect(center)))
+        self.start()
+
+    def press(self, overlay):
+        if not self.enabled:
+            return
+        self.glow_overlay = overlay
+        self.glow_center = overlay.draw_pos()
+        self.glow_start = time.perf_counter()
+        self.glow_release = None
+        self.start()
+
+    def release(self, overlay):
+        if self.glow_overlay is overlay and self.glow_release is None:
+            self.glow_release = time.perf_counter()
+            self.start()
+
+    def follow(self, overlay):
+        if self.glow_overlay is overlay and not self.timer.isActive():
+            self.tick()
+
+    def discard(self, overlay):
+        self.effects = collections.deque(effect for effect in self.effects if effect[0] is not overlay)
+        if self.glow_overlay is overlay:
+            self.glow_overlay = None
+        self.tick()
+
+    def clear(self):
+        self.effects.clear()
+        self.glow_overlay = None
+        self.tick()
+
+    def ripple_rect(self, center):
+        radius = RIPPLE_RADIUS + RIPPLE_WIDTH
+        return QtCore.QRect(center.x() - radius, center.y() - radius, 2 * radius, 2 * radius)
+
+    def glow_rect(self):
+        center = self.glow_center
+        return QtCore.QRect(center.x() - GLOW_RADIUS, center.y() - GLOW_RADIUS, 2 * GLOW_RADIUS, 2 * GLOW_RADIUS)
+
+    def glow_opacity(self):
+        opacity = min(max((self.clock - self.glow_start) * 1000 / GLOW_FADE_IN_MS, 0.0), 1.0)
+        if self.glow_release is not None:
+            opacity = min(opacity, max(0.0, 1 - (self.clock - self.glow_release) * 1000 / GLOW_FADE_OUT_MS))
+        return opacity
+
+    def tick(self):
+        self.clock = time.perf_counter()
+        while self.effects and (self.clock - self.effects[0][2]) * 1000 >= RIPPLE_DURATION_MS:
+            self.effects.popleft()
+        if self.glow_overlay is not None:
+            if self.glow_release is not None and self.glow_opacity() <= 0:
+                self.glow_overlay = None
+            elif self.glow_overlay.pointer_visible:
+                self.glow_center = self.glow_overlay.draw_pos()
+        rects = {}
+        for overlay, center, start, rect in self.effects:
+            rects[overlay] = rects.get(overlay, QtCore.QRect()).united(rect)
+        if self.glow_overlay is not None:
+            overlay = self.glow_overlay
+            rects[overlay] = rects.get(overlay, QtCore.QRect()).united(self.glow_rect())
+        for overlay in set(self.painted) | set(rects):
+            if not overlay._closed:
+                overlay.update_region(self.painted.get(overlay, QtCore.QRect()).united(rects.get(overlay, QtCore.QRect())))
+        self.painted = rects
+        if self.animating():
+            if not self.timer.isActive():
+                self.timer.start()
+        else:
+            self.timer.stop()
+
+    def animating(self):
+        if self.effects:
+            return True
+        if self.glow_overlay is None:
+            return False
+        return self.glow_release is not None or self.glow_opacity() < 1
+
+    def bounds(self, overlay):
+        return self.painted.get(overlay, QtCore.QRect())
+
+    def active_count(self):
+        return len(self.effects) + (self.glow_overlay is not None)
+
+    def draw(self, painter, overlay, rect):
+        deadline = time.perf_counter() + EFFECT_FRAME_BUDGET_MS / 1000
+        color = QtGui.QColor(EFFECT_COLOR)
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        if self.glow_overlay is overlay and rect.intersects(self.glow_rect()):
+            glow = QtGui.QColor(color)
+            glow.setAlphaF(0.45 * self.glow_opacity())
+            gradient = QtGui.QRadialGradient(QtCore.QPointF(self.glow_center), GLOW_RADIUS)
+            gradient.setColorAt(0, glow)
+            gradient.setColorAt(1, QtCore.Qt.transparent)
+            painter.setPen(QtCore.Qt.NoPen)
+            painter.setBrush(QtGui.QBrush(gradient))
+            painter.drawEllipse(self.glow_rect())
+        painter.setBrush(QtCore.Qt.NoBrush)
+        for effect_overlay, center, start, bounds in reversed(self.effects):
+            if effect_overlay is not overlay or not rect.intersects(bounds):
+                continue
+            if time.perf_counter() > deadline:
+                self.skipped += 1
+                break
+            progress = min(max((self.clock - start) * 1000 / RIPPLE_DURATION_MS, 0.0), 1.0)
+            eased = 1 - (1 - progress) ** 3
+            color.setAlphaF(1 - progress)
+            painter.setPen(QtGui.QPen(color, RIPPLE_WIDTH))
+            radius = 6 + (RIPPLE_RADIUS - 6) * eased
+            painter.drawEllipse(QtCore.QPointF(center), radius, radius)
+        painter.restore()
+
+class StrokeLayer:
+    def __init__(self, size, dpr=1.0, color=ANNOTATION_COLOR, width=ANNOTATION_WIDTH):
+        self.size = size
+        self.dpr = dpr
+        self.width = width
+        self.pen = QtGui.QPen(QtGui.QColor(color), width, QtCore.Qt.SolidLine, QtCore.Qt.RoundCap, QtCore.Qt.RoundJoin)
+        self.image = None
+        self.baked = None
+        self.strokes = collections.deque()
+        self.current = None
+        self.last_point = None
+        self.bounds = QtCore.QRect()
+
+    def new_image(self):
+        image = QtGui.QImage(self.size * self.dpr, QtGui.QImage.Format_ARGB32_Premultiplied)
+        image.fill(QtCore.Qt.transparent)
+        image.setDevicePixelRatio(self.dpr)
+        return image
+
+    def painter(self, image):
+        painter = QtGui.QPainter(image)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setPen(self.pen)
+        return painter
+
+    def segment_rect(self, a, b):
+        margin = self.width + 1
+        return QtCore.QRect(a, b).normalized().adjusted(-margin, -margin, margin, margin)
+
+    def begin(self, pos, sequence):
+        if self.image is None:
+            self.image = self.new_image()
+        self.current = (sequence, array('i', (pos.x(), pos.y())))
+        self.last_point = pos
+        painter = self.painter(self.image)
+        painter.drawPoint(pos)
+        painter.end()
+        rect = self.segment_rect(pos, pos)
+        self.bounds = self.bounds.united(rect)
+        return rect
+
+    def add_point(self, pos):
+        if self.current is None:
+            return QtCore.QRect()
+        delta = pos - self.last_point
+        if abs(delta.x()) + abs(delta.y()) < ANNOTATION_MIN_DISTANCE:
+            return QtCore.QRect()
+        painter = self.painter(self.image)
+        painter.drawLine(self.last_point, pos)
+        painter.end()
+        self.current[1].extend((pos.x(), pos.y()))
+        rect = self.segment_rect(self.last_point, pos)
+        self.last_point = pos
+        self.bounds = self.bounds.united(rect)
+        return rect
+
+    def end(self):
+        if self.current is None:
+            return
+        self.strokes.append(self.current)
+        self.current = None
+        self.last_point = None
+        while len(self.strokes) > ANNOTATION_UNDO_LIMIT:
+            if self.baked is None:
+                self.baked = self.new_image()
+            self.draw_stroke(self.baked, self.strokes.popleft()[1])
+
+    def draw_stroke(self, image, points):
+        painter = self.painter(image)
+        if len(points) == 2:
+            painter.drawPoint(points[0], points[1])
+        else:
+            painter.drawPolyline(QtGui.QPolygon(list(points)))
+        painter.end()
+
+    def last_sequence(self):
+        return self.strokes[-1][0] if self.strokes else -1
+
+    def undo(self):
+        self.end()
+        if not self.strokes:
+            return QtCore.QRect()
+        self.strokes.pop()
+        self.image = self.baked.copy() if self.baked is not None else self.new_image()
+        for sequence, points in self.strokes:
+            self.draw_stroke(self.image, points)
+        return self.bounds
+
+    def clear(self):
+        rect = self.bounds
+        self.image = None
+        self.baked = None
+        self.strokes.clear()
+        self.current = None
+        self.last_point = None
+        self.bounds = QtCore.QRect()
+        return rect
+
+    def draw(self, painter, rect):
+        source = QtCore.QRectF(rect.x() * self.dpr, rect.y() * self.dpr, rect.width() * self.dpr, rect.height() * self.dpr)
+        painter.drawImage(QtCore.QRectF(rect), self.image, source)
+
+    def memory_bytes(self):
+        images = [image for image in (self.image, self.baked) if image is not None]
+        points = sum(len(points) * points.itemsize for sequence, points in self.strokes)
+        return sum(image.sizeInBytes() for image in images) + points
+
+class FrameStats:
+    FIELDS = ('time', 'latency_ms', 'paint_ms', 'area', 'interval_ms')
+
+    def __init__(self, refresh_rate=60, capacity=STATS_CAPACITY):
+        self.capacity = capacity
+        self.columns = [array('d', [0.0]) * capacity for _ in self.FIELDS]
+        self.clicks = array('d', [0.0]) * STATS_CLICK_CAPACITY
+        self.index = 0
+        self.count = 0
+        self.click_index = 0
+        self.click_count = 0
+        self.frame_budget_ms = 1000 / max(refresh_rate, 1)
+        self.late_frames = 0
+        self.dropped_frames = 0
+        self.input_time = None
+        self.last_paint = None
+        self.started = time.perf_counter()
+
+    def mark_input(self):
+        if self.input_time is None:
+            self.input_time = time.perf_counter()
+
+    def record_paint(self, start, end, area):
+        latency = (end - self.input_time) * 1000 if self.input_time is not None else 0.0
+        interval = (start - self.last_paint) * 1000 if self.last_paint is not None else 0.0
+        self.input_time = None
+        self.last_paint = start
+        if latency > self.frame_budget_ms:
+            self.late_frames += 1
+            self.dropped_frames += int(latency // self.frame_budget_ms)
+        i = self.index
+        time_col, latency_col, paint_col, area_col, interval_col = self.columns
+        time_col[i] = start - self.started
+        latency_col[i] = latency
+        paint_col[i] = (end - start) * 1000
+        area_col[i] = area
+        interval_col[i] = interval
+        self.index = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def record_click(self, latency_ms):
+        self.clicks[self.click_index] = latency_ms
+        self.click_index = (self.click_index + 1) % len(self.clicks)
+        self.click_count = min(self.click_count + 1, len(self.clicks))
+
+    def ordered(self, column, index, count):
+        start = (index - count) % len(column)
+        return [column[(start + i) % len(column)] for i in range(count)]
+
+    def rows(self):
+        columns = [self.ordered(column, self.index, self.count) for column in self.columns]
+        return list(zip(*columns))
+
+    def click_latencies(self):
+        return self.ordered(self.clicks, self.click_index, self.click_count)
+
+    def summary(self):
+        recent = min(self.count, 120)
+        latency = self.ordered(self.columns[1], self.index, recent)
+        paint = self.ordered(self.columns[2], self.index, recent)
+        area = self.ordered(self.columns[3], self.index, recent)
+        times = self.ordered(self.columns[0], self.index, self.count)
+        now = time.perf_counter() - self.started
+        clicks = self.click_latencies()
+        return {
+            'frames': self.count,
+            'fps': sum(1 for t in times if now - t <= 1.0),
+            'latency_ms': sum(latency) / recent if recent else 0.0,
+            'latency_max_ms': max(latency) if recent else 0.0,
+            'paint_ms': sum(paint) / recent if recent else 0.0,
+            'paint_max_ms': max(paint) if recent else 0.0,
+            'area': sum(area) / recent if recent else 0.0,
+            'late_frames': self.late_frames,
+            'dropped_frames': self.dropped_frames,
+            'click_to_sound_ms': clicks[-1] if clicks else None,
+            'click_to_sound_max_ms': max(clicks) if clicks else None,
+        }
+
+    def export(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if path.endswith('.csv'):
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(self.FIELDS)
+                writer.writerows(self.rows())
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'summary': self.summary(),
+                    'fields': self.FIELDS,
+                    'frames': self.rows(),
+                    'click_to_sound_ms': self.click_latencies(),
+                }, f, ensure_ascii=False)
+        return path
+
+class OneEuroFilter:
+    def __init__(self, min_cutoff=1.0, beta=0.0, d_cutoff=FILTER_DERIVATIVE_CUTOFF):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self.value = 0.0
+        self.velocity = 0.0
+        self.last_time = None
+
+    @staticmethod
+    def alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def filter(self, value, t):
+        if self.last_time is None:
+            self.value = value
+            self.velocity = 0.0
+            self.last_time = t
+            return value
+        dt = t - self.last_time
+        if dt <= 0:
+            return self.value
+        self.last_time = t
+        a_d = self.alpha(self.d_cutoff, dt)
+        self.velocity = a_d * (value - self.value) / dt + (1 - a_d) * self.velocity
+        a = self.alpha(self.min_cutoff + self.beta * abs(self.velocity), dt)
+        self.value = a * value + (1 - a) * self.value
+        return self.value
+
+class MotionFilter:
+    def __init__(self, min_cutoff=1.0, beta=0.0, prediction_ms=0):
+        self.enabled = False
+        self.x = OneEuroFilter()
+        self.y = OneEuroFilter()
+        self.prediction = 0.0
+        self.configure(min_cutoff, beta, prediction_ms)
+
+    def configure(self, min_cutoff, beta, prediction_ms):
+        for axis in (self.x, self.y):
+            axis.min_cutoff = min_cutoff
+            axis.beta = beta
+        self.prediction = prediction_ms / 1000
+
+    def reset(self):
+        self.x.reset()
+        self.y.reset()
+
+    def filter(self, x, y, t):
+        fx = self.x.filter(x, t) + self.x.velocity * self.prediction
+        fy = self.y.filter(y, t) + self.y.velocity * self.prediction
+        return fx, fy
+
+    def filter_point(self, point, t):
+        fx, fy = self.filter(point.x(), point.y(), t)
+        return QtCore.QPoint(round(fx), round(fy))
+
+_opengl_available = None
+
+def opengl_available():
+    global _opengl_available
+    if _opengl_available is None:
+        context = QtGui.QOpenGLContext()
+        surface = QtGui.QOffscreenSurface()
+        surface.create()
+        _opengl_available = context.create() and surface.isValid() and context.makeCurrent(surface)
+        if _opengl_available:
+            context.doneCurrent()
+    return _opengl_available
+
+def resolve_renderer(renderer):
+    if renderer == 'opengl' and opengl_available():
+        return 'opengl'
+    return 'raster'
+
+class GlOverlayView(QtWidgets.QOpenGLWidget):
+    def __init__(self, overlay):
+        super().__init__(overlay)
+        self.overlay = overlay
+        surface_format = QtGui.QSurfaceFormat.defaultFormat()
+        surface_format.setAlphaBufferSize(8)
+        self.setFormat(surface_format)
+        self.setAttribute(QtCore.Qt.WA_AlwaysStackOnTop)
+        self.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents)
+        self.setUpdateBehavior(QtWidgets.QOpenGLWidget.PartialUpdate)
+        self.setGeometry(overlay.rect())
+        self.dirty = self.rect()
+
+    def update_rect(self, rect):
+        self.dirty = self.dirty.united(rect)
+        self.update()
+
+    def resizeGL(self, width, height):
+        self.dirty = self.rect()
+
+    def paintGL(self):
+        rect = self.dirty.intersected(self.rect())
+        self.dirty = QtCore.QRect()
+        if rect.isEmpty():
+            return
+        stats = self.overlay.resources.stats
+        start = time.perf_counter() if stats is not None else 0.0
+        painter = QtGui.QPainter(self)
+        draws_pointer = self.draw(painter, rect)
+        painter.end()
+        if stats is not None and draws_pointer:
+            stats.record_paint(start, time.perf_counter(), rect.width() * rect.height())
+
+    def draw(self, painter, rect):
+        overlay = self.overlay
+        painter.setClipRect(rect)
+        painter.setCompositionMode(QtGui.QPainter.CompositionMode_Source)
+        painter.fillRect(rect, QtCore.Qt.transparent)
+        painter.setCompositionMode(QtGui.QPainter.CompositionMode_SourceOver)
+        if overlay.backdrop is not None:
+            overlay.draw_backdrop(painter, rect)
+        if overlay.pointer_style == 'spotlight':
+            overlay.draw_spotlight(painter, rect)
+        if overlay.layer is not None and overlay.layer.image is not None and rect.intersects(overlay.layer.bounds):
+            overlay.layer.draw(painter, rect.intersected(overlay.layer.bounds))
+        if rect.intersects(overlay.resources.effects.bounds(overlay)):
+            overlay.resources.effects.draw(painter, overlay, rect)
+        draws_pointer = overlay.pointer_visible and rect.intersects(overlay._painted_rect)
+        if draws_pointer:
+            overlay.draw_pointer(painter)
+        if overlay.show_hud and rect.intersects(overlay.hud_rect()):
+            overlay.draw_hud(painter)
+        return draws_pointer
+
+def trace_path(trace_format):
+    name = time.strftime('trace_%Y%m%d_%H%M%S') + ('.csv' if trace_format == 'csv' else '.json')
+    return os.path.join(TRACES_PATH, name)
+
+def recording_path():
+    return os.path.join(RECORDINGS_PATH, time.strftime('session_%Y%m%d_%H%M%S.ptrec'))
+
+def zigzag(value):
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+def unzigzag(value):
+    return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+def read_varint(data, pos):
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+class SessionRecorder:
+    def __init__(self, path, start_pos):
+        self.path = path
+        self.file = None
+        self.buffer = bytearray(RECORDING_HEADER.pack(RECORDING_MAGIC, RECORDING_VERSION, start_pos.x(), start_pos.y()))
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.start_time = time.perf_counter()
+        self.last_time_us = 0
+        self.last_x = start_pos.x()
+        self.last_y = start_pos.y()
+        self.event_count = 0
+        self.bytes_written = 0
+
+    def write_varint(self, value):
+        while value > 0x7f:
+            self.buffer.append((value & 0x7f) | 0x80)
+            value >>= 7
+        self.buffer.append(value)
+
+    def write_event(self, kind):
+        now_us = int((time.perf_counter() - self.start_time) * 1000000)
+        self.buffer.append(kind)
+        self.write_varint(max(0, now_us - self.last_time_us))
+        self.last_time_us = max(now_us, self.last_time_us)
+        self.event_count += 1
+
+    def record_move(self, pos):
+        self.write_event(RECORD_MOVE)
+        self.write_varint(zigzag(pos.x() - self.last_x))
+        self.write_varint(zigzag(pos.y() - self.last_y))
+        self.last_x = pos.x()
+        self.last_y = pos.y()
+        if len(self.buffer) >= RECORDING_CHUNK_BYTES:
+            self.flush()
+
+    def record_button(self, down):
+        self.write_event(RECORD_BUTTON_DOWN if down else RECORD_BUTTON_UP)
+        if len(self.buffer) >= RECORDING_CHUNK_BYTES:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer or not self.event_count:
+            return
+        if self.file is None and self.path is not None:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self.file = open(self.path, 'wb')
+            except OSError:
+                self.path = None
+        if self.file is None:
+            del self.buffer[:]
+            return
+        self.bytes_written += len(self.buffer)
+        self.executor.submit(self.file.write, bytes(self.buffer))
+        del self.buffer[:]
+
+    def close(self):
+        self.flush()
+        if self.file is not None:
+            self.executor.submit(self.file.close)
+        self.executor.shutdown(wait=True)
+
+def iter_recording(path):
+    with open(path, 'rb') as f:
+        header = f.read(RECORDING_HEADER.size)
+        if len(header) < RECORDING_HEADER.size:
+            raise ValueError('Файл записи повреждён')
+        magic, version, x, y = RECORDING_HEADER.unpack(header)
+        if magic != RECORDING_MAGIC or version != RECORDING_VERSION:
+            raise ValueError('Это не файл записи Pointer')
+        yield 0.0, RECORD_MOVE, x, y
+        data = b''
+        pos = 0
+        time_us = 0
+        while True:
+            chunk = f.read(RECORDING_CHUNK_BYTES)
+            if not chunk:
+                return
+            data = data[pos:] + chunk
+            pos = 0
+            while pos < len(data):
+                try:
+                    kind = data[pos]
+                    dt, end = read_varint(data, pos + 1)
+                    if kind == RECORD_MOVE:
+                        dx, end = read_varint(data, end)
+                        dy, end = read_varint(data, end)
+                except IndexError:
+                    break
+                pos = end
+                time_us += dt
+                if kind == RECORD_MOVE:
+                    x += unzigzag(dx)
+                    y += unzigzag(dy)
+                yield time_us / 1000000, kind, x, y
+
+class ReplaySource(PointerInputSource):
+    finished = QtCore.pyqtSignal()
+
+    def __init__(self, path, speed=1.0, parent=None):
+        super().__init__(parent)
+        self.events = iter_recording(path)
+        self.next_event = next(self.events)
+        self.speed = max(speed, 0.01)
+        self.start_time = None
+        self.paused_at = None
+        self.timer = QtCore.QTimer(self)
+        self.timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.emit_due)
+
+    def start(self):
+        now = time.perf_counter()
+        if self.start_time is None:
+            self.start_time = now
+        elif self.paused_at is not None:
+            self.start_time += now - self.paused_at
+        self.paused_at = None
+        self.schedule()
+
+    def stop(self):
+        if self.timer.isActive():
+            self.paused_at = time.perf_counter()
+        self.timer.stop()
+
+    def schedule(self):
+        if self.next_event is None:
+            self.finished.emit()
+            return
+        delay = self.start_time + self.next_event[0] / self.speed - time.perf_counter()
+        self.timer.start(max(0, int(delay * 1000)))
+
+    def emit_due(self):
+        now = time.perf_counter()
+        while self.next_event is not None and self.start_time + self.next_event[0] / self.speed <= now:
+            event_time, kind, x, y = self.next_event
+            if kind == RECORD_MOVE:
+                self.moved.emit(QtCore.QPoint(x, y))
+            else:
+                self.left_button_changed.emit(kind == RECORD_BUTTON_DOWN)
+            self.next_event = next(self.events, None)
+        self.schedule()
+
+class OverlayResources(QtCore.QObject):
+    def __init__(self, sound_click_path, sound_loop_path, settings, parent=None, input_source=None):
+        super().__init__(parent)
+        track_resource('overlay_resources', self)
+        self.frame_cache = RotationFrameCache()
+        self.style_buffers = PointerStyleBuffers()
+        self.effects = EffectScheduler(self)
+        self.effects.set_enabled(settings['click_effects'])
+        self.click_sound = ClickSoundEngine(sound_click_path, settings['volume'], parent=self)
+        self.hold_sound = HoldLoopPlayer(sound_loop_path, settings['volume'], parent=self)
+        if input_source is None:
+            input_source = create_input_source(settings['input_backend'], self, settings)
+            self.recorder = self.create_recorder(settings, input_source)
+        else:
+            input_source.setParent(self)
+            self.recorder = None
+        self.input_source = input_source
+        self.renderer = resolve_renderer(settings['renderer'])
+        self.settings = settings
+        self.backdrop = None
+        self.set_backdrop(settings['backdrop_image'])
+        self.motion_filter = MotionFilter()
+        self.configure_motion_filter()
+        self.stroke_count = 0
+        self.stats = None
+        if settings['instrumentation']:
+            screen = QtWidgets.QApplication.primaryScreen()
+            self.stats = FrameStats(screen.refreshRate() if screen else 60)
+            self.click_sound.sound_started.connect(self.stats.record_click)
+
+    def set_volume(self, volume):
+        self.click_sound.set_volume(volume)
+        self.hold_sound.set_volume(volume)
+
+    def create_recorder(self, settings, input_source):
+        if not settings['record_session']:
+            return None
+        recorder = SessionRecorder(recording_path(), QtGui.QCursor.pos())
+        input_source.moved.connect(recorder.record_move)
+        input_source.left_button_changed.connect(recorder.record_button)
+        return recorder
+
+    def configure_motion_filter(self):
+        self.motion_filter.configure(
+            self.settings['filter_min_cutoff'], self.settings['filter_beta'], self.settings['prediction_ms']
+        )
+        self.motion_filter.enabled = self.settings['motion_filter']
+        self.motion_filter.reset()
+
+    def set_backdrop(self, path):
+        if self.backdrop is not None:
+            self.backdrop.close()
+            self.backdrop = None
+        if path and self.settings['overlay_mode'] != 'follower':
+            try:
+                self.backdrop = BackdropPyramid(path, self.settings['backdrop_cache_mb'] * 1024 * 1024)
+            except (OSError, ValueError):
+                return
+            self.backdrop.start()
+
+    def memory_bytes(self):
+        backdrop = self.backdrop.memory_bytes() if self.backdrop is not None else 0
+        return self.frame_cache.memory_bytes() + self.style_buffers.memory_bytes() + self.hold_sound.memory_bytes + backdrop
+
+    def close(self):
+        self.hold_sound.stop()
+        self.click_sound.stop()
+        self.input_source.close()
+        self.effects.timer.stop()
+        self.frame_cache.clear()
+        self.style_buffers.clear()
+        if self.backdrop is not None:
+            self.backdrop.close()
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+        if self.stats is not None and self.stats.count:
+            try:
+                self.stats.export(trace_path(self.settings['trace_format']))
+            except OSError:
+                pass
 
 class CursorOverlay(QtWidgets.QWidget):
-    def __init__(self, cursor_img_path, sound_click_path, sound_loop_path, settings, on_close_callback=None, on_cursor_change=None, screen=None):
+    def __init__(self, cursor_img_path, sound_click_path, sound_loop_path, settings, on_close_callback=None, on_cursor_change=None, screen=None, resources=None, hidden=False):
         super().__init__()
-        self.setWindowFlags(QtCore.Qt.FramelessWindowHint | QtCore.Qt.WindowStaysOnTopHint | QtCore.Qt.Tool)
+        track_resource('overlays', self)
+        self.settings = settings
+        self.follower = self.settings['overlay_mode'] == 'follower'
+        flags = QtCore.Qt.FramelessWindowHint | QtCore.Qt.WindowStaysOnTopHint | QtCore.Qt.Tool
+        if self.follower:
+            flags |= QtCore.Qt.WindowTransparentForInput
+        self.setWindowFlags(flags)
         self.setAttribute(QtCore.Qt.WA_TranslucentBackground)
         self.setAttribute(QtCore.Qt.WA_NoSystemBackground, True)
         self.setAttribute(QtCore.Qt.WA_ShowWithoutActivating)
         self.setCursor(QtCore.Qt.BlankCursor)
 
-        if os.path.exists('icon.ico'):
-            self.setWindowIcon(QtGui.QIcon('icon.ico'))
+        if os.path.exists(ICON_PATH):
+            self.setWindowIcon(QtGui.QIcon(ICON_PATH))
 
+        self.owns_resources = resources is None
+        if self.owns_resources:
+            resources = OverlayResources(sound_click_path, sound_loop_path, settings, self)
+        self.resources = resources
+        self.pointer_visible = True
+        self.hidden = hidden
+        self.on_escape = None
+        self.screen = screen
+        self.gl_view = None
+        self.layer = None
+        self.annotations = False
+        self.on_undo = None
+        self.on_clear = None
         self.cursor_img_path = cursor_img_path
         self.update_cursor_image()
+        if self.resources.renderer == 'opengl':
+            self.gl_view = GlOverlayView(self)
 
-        self.cursor_pos = QtGui.QCursor.pos()
+        self.cursor_pos = self.get_relative_cursor_pos()
         self.rotation = 0
+        self.pointer_style = 'pointer'
+        self.backdrop = None
+        self.backdrop_scale = 1.0
+        self.backdrop_offset = QtCore.QPointF()
+        self.pan_anchor = None
+        self._painted_rect = QtCore.QRect()
+
+        self.tilt_animation = QtCore.QVariantAnimation(self)
+        self.tilt_animation.setDuration(TILT_DURATION_MS)
+        self.tilt_animation.setEasingCurve(QtCore.QEasingCurve.OutCubic)
+        self.tilt_animation.valueChanged.connect(self.set_rotation)
+
+        self.raw_pointer_pos = QtGui.QCursor.pos()
+        self.settle_timer = QtCore.QTimer(self)
+        self.settle_timer.setSingleShot(True)
+        self.settle_timer.setInterval(FILTER_SETTLE_MS)
+        self.settle_timer.timeout.connect(self.settle_pointer)
+        self.lens_timer = QtCore.QTimer(self)
+        self.lens_timer.setInterval(MAGNIFIER_REFRESH_MS)
+        self.lens_timer.timeout.connect(self.refresh_lens)
         
-        self.screen = screen
         self.setup_screen(screen)
         
         self.mouse_down = False
-        self.settings = settings
         self.on_close_callback = on_close_callback
         self.on_cursor_change = on_cursor_change
 
-        self.active_click_players = []
         self.sound_click_path = sound_click_path
-        self.player_loop = QtMultimedia.QMediaPlayer()
-        self.player_loop.setMedia(QtMultimedia.QMediaContent(QtCore.QUrl.fromLocalFile(sound_loop_path)))
-        self.player_loop.setVolume(self.settings['volume'])
-        self.player_loop.mediaStatusChanged.connect(self.loop_sound_if_needed)
         self._closed = False
 
-        self.poll_timer = QtCore.QTimer(self)
-        self.poll_timer.timeout.connect(self.poll_mouse)
-        self.poll_timer.start(10)
         self._last_mouse_down = False
+        self.hud_timer = QtCore.QTimer(self)
+        self.hud_timer.timeout.connect(self.update_hud)
+        self.set_hud_visible(self.settings['show_hud'])
+        self.set_annotation_mode(self.settings['annotation_mode'])
+        self.set_pointer_style(self.settings['pointer_style'])
+        self.set_backdrop(self.resources.backdrop)
+        if self.owns_resources:
+            self.resources.input_source.moved.connect(self.handle_pointer_move)
+            self.resources.input_source.left_button_changed.connect(self.handle_left_button)
+            self.resources.input_source.start()
 
     def setup_screen(self, screen=None):
-        if screen:
+        if self.follower:
+            self.resize(self.follower_size())
+            self.follow_cursor()
+            if self.hidden:
+                self.winId()
+            elif self.pointer_visible:
+                self.show()
+        else:
+            if not screen:
+                screen = QtWidgets.QApplication.primaryScreen()
+            if self.windowHandle():
+                self.windowHandle().setScreen(screen)
             self.setGeometry(screen.geometry())
+            if self.hidden:
+                self.winId()
+            else:
+                self.showFullScreen()
+        self.update_pointer()
+
+    def set_screen(self, screen):
+        self.update_region(self._painted_rect)
+        self._painted_rect = QtCore.QRect()
+        self.screen = screen
+        if self.layer is not None:
+            self.layer = self.create_layer()
+        self.cursor_pos = self.get_relative_cursor_pos()
+        self.update_cursor_image()
+        self.setup_screen(screen)
+
+    def device_pixel_ratio(self):
+        screen = self.screen or QtWidgets.QApplication.primaryScreen()
+        return screen.devicePixelRatio()
+
+    def load_cursor_pixmap(self):
+        return asset_cache().scaled_pixmap(self.cursor_img_path, CURSOR_SCALE, True, self.device_pixel_ratio())
+
+    def update_cursor_image(self):
+        key = (self.cursor_img_path, self.device_pixel_ratio())
+        rotated = self.resources.renderer == 'raster'
+        self.rotation_frames = self.resources.frame_cache.frames_for(key, self.load_cursor_pixmap, rotated)
+        self.cursor_img = self.rotation_frames[0]
+
+    def change_cursor(self, cursor_img_path):
+        self.cursor_img_path = cursor_img_path
+        self.update_cursor_image()
+        if self.follower:
+            self.resize(self.follower_size())
+            self.follow_cursor()
+        self.update_pointer()
+
+    def follower_size(self):
+        sizes = [self.frame_size(angle) for angle in tilt_angles()]
+        w = max(size.width() for size in sizes)
+        h = max(size.height() for size in sizes)
+        return QtCore.QSize(w + 2 * DIRTY_RECT_MARGIN, h + 2 * DIRTY_RECT_MARGIN)
+
+    def screen_origin(self):
+        if self.screen:
+            return self.screen.geometry().topLeft()
+        return QtCore.QPoint(0, 0)
+
+    def draw_pos(self):
+        if self.follower:
+            return QtCore.QPoint(self.width() // 2, self.height() // 2)
+        return self.cursor_pos
+
+    def follow_cursor(self):
+        self.move(self.screen_origin() + self.cursor_pos - self.draw_pos())
+
+    def current_frame(self):
+        return self.rotation_frames.get(self.rotation, self.cursor_img)
+
+    def frame_size(self, angle):
+        frame = self.rotation_frames.get(angle)
+        if frame is not None:
+            return logical_size(frame)
+        size = logical_size(self.cursor_img)
+        rect = QtGui.QTransform().rotate(angle).mapRect(QtCore.QRectF(0, 0, size.width(), size.height()))
+        return rect.toAlignedRect().size()
+
+    def spotlight_rect(self):
+        radius = self.settings['spotlight_radius']
+        pos = self.draw_pos()
+        return QtCore.QRect(pos.x() - radius, pos.y() - radius, 2 * radius, 2 * radius)
+
+    def lens_source_rect(self):
+        side = max(1, int(round(self.settings['magnifier_size'] / self.settings['magnifier_zoom'])))
+        pos = self.draw_pos()
+        return QtCore.QRect(pos.x() - side // 2, pos.y() - side // 2, side, side)
+
+    def lens_rect(self):
+        size = self.settings['magnifier_size']
+        pos = self.draw_pos()
+        offset = size // 2 + MAGNIFIER_GAP
+        x = pos.x() + offset if pos.x() + offset + size // 2 <= self.width() else pos.x() - offset
+        y = pos.y() - offset if pos.y() - offset - size // 2 >= 0 else pos.y() + offset
+        return QtCore.QRect(x - size // 2, y - size // 2, size, size)
+
+    def pointer_rect(self):
+        if self.pointer_style == 'magnifier':
+            rect = self.lens_source_rect().adjusted(-4, -4, 4, 4).united(self.lens_rect())
         else:
-            primary_screen = QtWidgets.QApplication.primaryScreen()
-            self.setGeometry(primary_screen.geometry())
-        
-        self.showFullScreen()
+            size = self.frame_size(self.rotation)
+            pos = self.draw_pos()
+            w = size.width()
+            h = size.height()
+            rect = QtCore.QRect(pos.x() - w // 2, pos.y() - h // 2, w, h)
+            if self.pointer_style == 'spotlight':
+                rect = rect.united(self.spotlight_rect())
+        return rect.adjusted(-DIRTY_RECT_MARGIN, -DIRTY_RECT_MARGIN, DIRTY_RECT_MARGIN, DIRTY_RECT_MARGIN)
+
+    def update_pointer(self):
+        if self.resources.stats is not None:
+            self.resources.stats.mark_input()
+        rect = self.pointer_rect() if self.pointer_visible else QtCore.QRect()
+        if self.pointer_style == 'magnifier' and self.lens_timer.isActive():
+            self.capture_lens()
+        self.update_region(self._painted_rect.united(rect))
+        self._painted_rect = rect
+        self.resources.effects.follow(self)
+
+    def set_rotation(self, value):
+        angle = int(round(value))
+        if angle != self.rotation:
+            self.rotation = angle
+            self.update_pointer()
+
+    def animate_tilt(self, target):
+        self.tilt_animation.stop()
+        self.tilt_animation.setStartValue(float(self.rotation))
+        self.tilt_animation.setEndValue(float(target))
+        self.tilt_animation.start()
+
+    def set_volume(self, volume):
+        self.resources.set_volume(volume)
+
+    def set_pointer_style(self, style):
+        if style not in dict(POINTER_STYLES) or self.follower:
+            style = 'pointer'
+        if style != self.pointer_style:
+            self.pointer_style = style
+            self.update_region(self.rect())
+        self.sync_lens_timer()
+        self.update_pointer()
+
+    def sync_lens_timer(self):
+        if self.pointer_style == 'magnifier' and self.pointer_visible and not self.hidden and not self._closed:
+            self.lens_timer.start()
+        else:
+            self.lens_timer.stop()
+
+    def capture_lens(self):
+        screen = self.screen or QtWidgets.QApplication.primaryScreen()
+        source = self.lens_source_rect()
+        self.resources.style_buffers.capture(screen, source, self.settings['magnifier_size'], self.device_pixel_ratio())
+
+    def refresh_lens(self):
+        self.capture_lens()
+        self.update_region(self.lens_rect())
+
+    def update_region(self, rect):
+        if self.gl_view is not None:
+            self.gl_view.update_rect(rect)
+        else:
+            self.update(rect)
+
+    def set_backdrop(self, backdrop):
+        if self.backdrop is not None:
+            self.backdrop.release(self)
+            self.backdrop.level_ready.disconnect(self.on_backdrop_level)
+            self.backdrop.tile_ready.disconnect(self.on_backdrop_tile)
+        self.backdrop = None if self.follower else backdrop
+        self.pan_anchor = None
+        if self.backdrop is not None:
+            self.backdrop.level_ready.connect(self.on_backdrop_level)
+            self.backdrop.tile_ready.connect(self.on_backdrop_tile)
+            self.fit_backdrop()
+        self.update_region(self.rect())
+
+    def backdrop_fit_scale(self):
+        size = self.backdrop.size
+        return min(self.width() / size.width(), self.height() / size.height())
+
+    def fit_backdrop(self):
+        size = self.backdrop.size
+        self.backdrop_scale = self.backdrop_fit_scale()
+        self.backdrop_offset = QtCore.QPointF(
+            (self.width() - size.width() * self.backdrop_scale) / 2,
+            (self.height() - size.height() * self.backdrop_scale) / 2
+        )
+        self.update_region(self.rect())
+
+    def zoom_backdrop(self, factor, anchor):
+        fit = self.backdrop_fit_scale()
+        scale = min(max(self.backdrop_scale * factor, fit), max(fit, BACKDROP_MAX_ZOOM))
+        self.backdrop_offset = anchor - (anchor - self.backdrop_offset) * (scale / self.backdrop_scale)
+        self.backdrop_scale = scale
+        self.pan_backdrop(QtCore.QPointF())
+
+    def pan_backdrop(self, delta):
+        size = self.backdrop.size
+        w = size.width() * self.backdrop_scale
+        h = size.height() * self.backdrop_scale
+        x = min(max(self.backdrop_offset.x() + delta.x(), self.width() / 2 - w), self.width() / 2)
+        y = min(max(self.backdrop_offset.y() + delta.y(), self.height() / 2 - h), self.height() / 2)
+        self.backdrop_offset = QtCore.QPointF(x, y)
+        self.update_region(self.rect())
+
+    def backdrop_image_rect(self, rect):
+        area = QtCore.QRectF(rect).translated(-self.backdrop_offset)
+        area = QtCore.QRectF(area.topLeft() / self.backdrop_scale, area.size() / self.backdrop_scale)
+        return area.intersected(QtCore.QRectF(0, 0, self.backdrop.size.width(), self.backdrop.size.height()))
+
+    def backdrop_screen_rect(self, rect):
+        return QtCore.QRectF(self.backdrop_offset + rect.topLeft() * self.backdrop_scale, rect.size() * self.backdrop_scale)
+
+    def on_backdrop_level(self, level):
+        self.update_region(self.rect())
+
+    def on_backdrop_tile(self, key):
+        rect = self.backdrop_screen_rect(self.backdrop.tile_rect(key)).toAlignedRect().adjusted(-1, -1, 1, 1)
+        if rect.intersects(self.rect()) and not self.hidden:
+            self.update_region(rect)
+
+    def create_layer(self):
+        screen = self.screen or QtWidgets.QApplication.primaryScreen()
+        return StrokeLayer(screen.geometry().size(), self.device_pixel_ratio())
+
+    def set_annotation_mode(self, enabled):
+        self.annotations = bool(enabled) and not self.follower
+        if self.annotations and self.layer is None:
+            self.layer = self.create_layer()
+        if not self.annotations and self.layer is not None:
+            self.layer.end()
+
+    def undo_annotation(self):
+        if self.layer is not None:
+            self.update_region(self.layer.undo())
+
+    def clear_annotations(self):
+        if self.layer is not None:
+            self.update_region(self.layer.clear())
+
+    def hud_rect(self):
+        return QtCore.QRect(*HUD_RECT)
+
+    def set_hud_visible(self, visible):
+        self.show_hud = bool(visible) and self.resources.stats is not None and not self.follower
+        if self.show_hud:
+            self.hud_timer.start(HUD_REFRESH_MS)
+        else:
+            self.hud_timer.stop()
+        self.update_region(self.hud_rect())
+
+    def update_hud(self):
+        if self.pointer_visible:
+            self.update_region(self.hud_rect())
+
+    def draw_hud(self, painter):
+        summary = self.resources.stats.summary()
+        click = summary['click_to_sound_ms']
+        counts = resource_counts()
+        lines = [
+            f"FPS: {summary['fps']}",
+            f"Задержка: {summary['latency_ms']:.1f} мс (макс. {summary['latency_max_ms']:.1f})",
+            f"Отрисовка: {summary['paint_ms']:.2f} мс (макс. {summary['paint_max_ms']:.2f})",
+            f"Площадь: {summary['area']:.0f} px",
+            f"Опоздавшие/пропущенные: {summary['late_frames']}/{summary['dropped_frames']}",
+            f"Клик→звук: {click:.1f} мс" if click is not None else "Клик→звук: -",
+            f"Оверлеи/звуки/таймеры: {counts['overlays']}/{counts['click_voices'] + counts['hold_players']}/{counts['active_timers']}",
+        ]
+        rect = self.hud_rect()
+        painter.fillRect(rect, QtGui.QColor(0, 0, 0, 170))
+        painter.setPen(QtGui.QColor('#f0f0f0'))
+        painter.drawText(rect.adjusted(8, 6, -8, -6), QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop, '\n'.join(lines))
+
+    def activate(self, previous=None):
+        if previous is not None:
+            self.mouse_down = previous.mouse_down
+            self._last_mouse_down = previous._last_mouse_down
+            self.rotation = previous.rotation
+            if previous.tilt_animation.state() == QtCore.QAbstractAnimation.Running:
+                self.animate_tilt(previous.tilt_animation.endValue())
+        self.pointer_visible = True
+        if self.follower and not self.hidden:
+            self.show()
+        self.sync_lens_timer()
+        self.update_pointer()
+
+    def deactivate(self):
+        self.tilt_animation.stop()
+        self.settle_timer.stop()
+        self.resources.effects.discard(self)
+        if self.layer is not None:
+            self.layer.end()
+        self.pointer_visible = False
+        self.sync_lens_timer()
+        if self.follower:
+            self.hide()
+        self.update_pointer()
+
+    def park(self):
+        self.hidden = True
+        self.tilt_animation.stop()
+        self.settle_timer.stop()
+        self.hud_timer.stop()
+        self.lens_timer.stop()
+        self.resources.effects.discard(self)
+        if self.backdrop is not None:
+            self.backdrop.release(self)
+        self.pan_anchor = None
+        self.rotation = 0
+        self.mouse_down = False
+        self._last_mouse_down = False
+        self._painted_rect = QtCore.QRect()
+        self.hide()
+
+    def unpark(self):
+        self.hidden = False
+        self.cursor_pos = self.get_relative_cursor_pos()
+        self.set_hud_visible(self.settings['show_hud'])
+        self.sync_lens_timer()
+        self.setup_screen(self.screen)
+
+    def get_relative_cursor_pos(self, global_pos=None):
+        if global_pos is None:
+            global_pos = QtGui.QCursor.pos()
+        if self.screen:
+            screen_geometry = self.screen.geometry()
+            relative_x = global_pos.x() - screen_geometry.x()
+            relative_y = global_pos.y() - screen_geometry.y()
+            return QtCore.QPoint(relative_x, relative_y)
+        else:
+            return global_pos
+
+    def handle_pointer_move(self, global_pos):
+        if self._closed or not self.isVisible():
+            return
+        motion_filter = self.resources.motion_filter
+        if motion_filter.enabled:
+            self.raw_pointer_pos = global_pos
+            global_pos = motion_filter.filter_point(global_pos, time.perf_counter())
+            if global_pos != self.raw_pointer_pos:
+                self.settle_timer.start()
+        pos = self.get_relative_cursor_pos(global_pos)
+        if pos != self.cursor_pos:
+            self.cursor_pos = pos
+            if self.follower:
+                self.follow_cursor()
+            else:
+                if self.annotations and self.mouse_down:
+                    self.extend_stroke()
+                self.update_pointer()
+
+    def settle_pointer(self):
+        self.handle_pointer_move(self.raw_pointer_pos)
+
+    def handle_left_button(self, left_down):
+        if self._closed or not self.isVisible():
+            return
+        if left_down and not self._last_mouse_down:
+            self.handle_mouse_press()
+        elif not left_down and self._last_mouse_down:
+            self.handle_mouse_release()
+        self._last_mouse_down = left_down
+
+    def handle_mouse_press(self):
+        self.resources.click_sound.play()
+        self.animate_tilt(TILT_ANGLE)
+        self.mouse_down = True
+        if not self.follower:
+            self.resources.effects.add_ripple(self, self.draw_pos())
+        if self.annotations:
+            self.extend_stroke()
+        else:
+            self.resources.hold_sound.play()
+            if not self.follower:
+                self.resources.effects.press(self)
+
+    def handle_mouse_release(self):
+        self.mouse_down = False
+        if self.layer is not None:
+            self.layer.end()
+        self.resources.effects.release(self)
+        self.resources.hold_sound.release()
+        self.animate_tilt(0)
+
+    def extend_stroke(self):
+        if self.layer.current is None:
+            self.resources.stroke_count += 1
+            rect = self.layer.begin(self.cursor_pos, self.resources.stroke_count)
+        else:
+            rect = self.layer.add_point(self.cursor_pos)
+        if not rect.isNull():
+            self.update_region(rect)
+
+    def draw_backdrop(self, painter, rect):
+        backdrop = self.backdrop
+        painter.save()
+        painter.setCompositionMode(QtGui.QPainter.CompositionMode_Source)
+        painter.fillRect(rect, QtGui.QColor(BACKDROP_FILL))
+        painter.setCompositionMode(QtGui.QPainter.CompositionMode_SourceOver)
+        screen = self.backdrop_image_rect(self.rect())
+        visible = self.backdrop_image_rect(rect)
+        if backdrop.ready <= backdrop.top and not screen.isEmpty() and not visible.isEmpty():
+            level = backdrop.level_for(1 / (self.backdrop_scale * self.device_pixel_ratio()))
+            keys = backdrop.tiles_in(level, visible)
+            if backdrop.request(backdrop.tiles_in(level, screen), self):
+                keys = backdrop.tiles_in(backdrop.top, visible) + keys
+            if self.pan_anchor is None:
+                painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+            painter.translate(self.backdrop_offset)
+            painter.scale(self.backdrop_scale, self.backdrop_scale)
+            for key in keys:
+                tile = backdrop.tile(key)
+                if tile is not None:
+                    painter.drawImage(backdrop.tile_rect(key), tile)
+        painter.restore()
+
+    def draw_spotlight(self, painter, rect):
+        painter.save()
+        painter.setCompositionMode(QtGui.QPainter.CompositionMode_Source)
+        painter.fillRect(rect, QtGui.QColor(*SPOTLIGHT_DIM))
+        if self.pointer_visible:
+            hole = self.resources.style_buffers.spotlight_hole(self.settings['spotlight_radius'], self.device_pixel_ratio())
+            painter.drawImage(self.spotlight_rect().topLeft(), hole)
+        painter.restore()
+
+    def draw_lens(self, painter):
+        buffers = self.resources.style_buffers
+        lens = self.lens_rect()
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        if buffers.lens_valid and buffers.lens_key == (self.settings['magnifier_size'], self.device_pixel_ratio()):
+            painter.drawImage(lens.topLeft(), buffers.lens)
+        else:
+            painter.setPen(QtCore.Qt.NoPen)
+            painter.setBrush(QtGui.QColor(*SPOTLIGHT_DIM))
+            painter.drawEllipse(lens)
+        center = lens.center()
+        painter.setBrush(QtCore.Qt.NoBrush)
+        painter.setPen(QtGui.QPen(QtGui.QColor(255, 255, 255, 160), 1))
+        painter.drawLine(center.x() - 6, center.y(), center.x() + 6, center.y())
+        painter.drawLine(center.x(), center.y() - 6, center.x(), center.y() + 6)
+        painter.setPen(QtGui.QPen(QtGui.QColor('#2a82da' if self.mouse_down else '#f0f0f0'), 2))
+        painter.drawEllipse(lens.adjusted(1, 1, -1, -1))
+        painter.drawEllipse(self.lens_source_rect().adjusted(-3, -3, 3, 3))
+        painter.restore()
+
+    def draw_pointer(self, painter):
+        if self.pointer_style == 'magnifier':
+            self.draw_lens(painter)
+            return
+        pos = self.draw_pos()
+        if self.gl_view is not None:
+            size = logical_size(self.cursor_img)
+            painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+            painter.translate(pos)
+            painter.rotate(self.rotation)
+            painter.drawPixmap(-size.width() // 2, -size.height() // 2, self.cursor_img)
+            painter.resetTransform()
+        else:
+            frame = self.current_frame()
+            size = logical_size(frame)
+            painter.drawPixmap(pos.x() - size.width() // 2, pos.y() - size.height() // 2, frame)
+
+    def resizeEvent(self, event):
+        if self.gl_view is not None:
+            self.gl_view.setGeometry(self.rect())
+        if self.backdrop is not None:
+            self.fit_backdrop()
+        super().resizeEvent(event)
+
+    def mousePressEvent(self, event):
+        if self.backdrop is not None and event.button() in (QtCore.Qt.RightButton, QtCore.Qt.MiddleButton):
+            self.pan_anchor = event.localPos()
+
+    def mouseMoveEvent(self, event):
+        if self.pan_anchor is not None:
+            pos = event.localPos()
+            self.pan_backdrop(pos - self.pan_anchor)
+            self.pan_anchor = pos
+
+    def mouseReleaseEvent(self, event):
+        if self.pan_anchor is not None and event.button() in (QtCore.Qt.RightButton, QtCore.Qt.MiddleButton):
+            self.pan_anchor = None
+            self.update_region(self.rect())
+
+    def wheelEvent(self, event):
+        steps = event.angleDelta().y() / 120
+        if self.backdrop is not None and steps:
+            self.zoom_backdrop(BACKDROP_ZOOM_STEP ** steps, event.posF())
+
+    def paintEvent(self, event):
+        if self.gl_view is not None:
+            return
+        draws_pointer = event.rect().intersects(self._painted_rect)
+        draws_hud = self.show_hud and event.rect().intersects(self.hud_rect())
+        draws_layer = self.layer is not None and self.layer.image is not None and event.rect().intersects(self.layer.bounds)
+        draws_effects = event.rect().intersects(self.resources.effects.bounds(self))
+        dims = self.pointer_style == 'spotlight'
+        if not draws_pointer and not draws_hud and not draws_layer and not draws_effects and not dims and self.backdrop is None:
+            return
+        stats = self.resources.stats
+        start = time.perf_counter() if stats is not None else 0.0
+        painter = QtGui.QPainter(self)
+        painter.setClipRect(event.rect())
+        if self.backdrop is not None:
+            self.draw_backdrop(painter, event.rect())
+        if dims:
+            self.draw_spotlight(painter, event.rect())
+        if draws_layer:
+            self.layer.draw(painter, event.rect().intersected(self.layer.bounds))
+        if draws_effects:
+            self.resources.effects.draw(painter, self, event.rect())
+        if draws_pointer:
+            self.draw_pointer(painter)
+        if draws_hud:
+            self.draw_hud(painter)
+        painter.end()
+        if stats is not None and draws_pointer:
+            rect = event.rect()
+            stats.record_paint(start, time.perf_counter(), rect.width() * rect.height())
+
+    def keyPressEvent(self, event):
+        if event.key() == QtCore.Qt.Key_Escape:
+            if self.on_escape:
+                self.on_escape()
+            else:
+                self.close_overlay()
+        elif event.matches(QtGui.QKeySequence.Undo):
+            if self.on_undo:
+                self.on_undo()
+            else:
+                self.undo_annotation()
+        elif event.key() == QtCore.Qt.Key_Delete:
+            if self.on_clear:
+                self.on_clear()
+            else:
+                self.clear_annotations()
+        elif event.key() == QtCore.Qt.Key_Home and self.backdrop is not None:
+            self.fit_backdrop()
+
+    def close_overlay(self):
+        if self._closed:
+            return
+        self._closed = True
+        self.tilt_animation.stop()
+        self.settle_timer.stop()
+        self.hud_timer.stop()
+        self.lens_timer.stop()
+        self.resources.effects.discard(self)
+        if self.backdrop is not None:
+            self.backdrop.release(self)
+        if self.owns_resources:
+            self.resources.close()
+        if self.on_close_callback:
+            self.on_close_callback()
+        self.close()
+
+class OverlayGroup(QtCore.QObject):
+    backdrop_failed = QtCore.pyqtSignal(str)
+    shown_changed = QtCore.pyqtSignal(bool)
+
+    def __init__(self, cursor_img_path, sound_click_path, sound_loop_path, settings, on_close_callback=None, on_cursor_change=None, screens=(), resident=False, hidden=False, input_source=None):
+        super().__init__()
+        track_resource('overlay_groups', self)
+        self.cursor_img_path = cursor_img_path
+        self.sound_click_path = sound_click_path
+        self.sound_loop_path = sound_loop_path
+        self.settings = settings
+        self.on_close_callback = on_close_callback
+        self.on_cursor_change = on_cursor_change
+        self.resources = OverlayResources(sound_click_path, sound_loop_path, settings, self, input_source)
+        self.watch_backdrop()
+        self.overlays = []
+        self.active = None
+        self.resident = resident
+        self.hidden = hidden
+        self._closed = False
+        self.resources.input_source.moved.connect(self.handle_pointer_move)
+        self.resources.input_source.left_button_changed.connect(self.handle_left_button)
+        self.set_screens(screens)
+        if not self.hidden:
+            self.resources.input_source.start()
+
+    def set_screens(self, screens):
+        if self._closed:
+            return
+        kept = [overlay for overlay in self.overlays if overlay.screen in screens]
+        spare = [overlay for overlay in self.overlays if overlay.screen not in screens]
+        covered = [overlay.screen for overlay in kept]
+        for screen in screens:
+            if screen in covered:
+                continue
+            if spare:
+                overlay = spare.pop(0)
+                overlay.set_screen(screen)
+            else:
+                overlay = CursorOverlay(
+                    self.cursor_img_path, self.sound_click_path, self.sound_loop_path, self.settings,
+                    self.close_overlay, self.on_cursor_change, screen, self.resources, self.hidden
+                )
+                overlay.on_escape = self.request_close
+                overlay.on_undo = self.undo_annotation
+                overlay.on_clear = self.clear_annotations
+            kept.append(overlay)
+        for overlay in spare:
+            overlay.on_close_callback = None
+            overlay.close_overlay()
+            overlay.deleteLater()
+        self.overlays = kept
+        if self.active not in self.overlays:
+            self.active = None
+        self.handle_pointer_move(QtGui.QCursor.pos())
+        for overlay in self.overlays:
+            if overlay is not self.active:
+                overlay.deactivate()
+
+    def overlay_at(self, global_pos):
+        for overlay in self.overlays:
+            if overlay.screen and overlay.screen.geometry().contains(global_pos):
+                return overlay
+        return None
+
+    def handle_pointer_move(self, global_pos):
+        overlay = self.overlay_at(global_pos) or self.active
+        if overlay is None and self.overlays:
+            overlay = self.overlays[0]
+        if overlay is not self.active:
+            previous = self.active
+            self.active = overlay
+            if overlay is not None:
+                overlay.activate(previous)
+            if previous is not None:
+                previous.deactivate()
+        if self.active is not None:
+            self.active.handle_pointer_move(global_pos)
 
-    def update_cursor_image(self):
-        orig_pixmap = QtGui.QPixmap(self.cursor_img_path)
-        w = int(orig_pixmap.width() * CURSOR_SCALE)
-        h = int(orig_pixmap.height() * CURSOR_SCALE)
-        scaled_pixmap = orig_pixmap.scaled(w, h, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-        scaled_pixmap = scaled_pixmap.transformed(QtGui.QTransform().scale(-1, 1))
-        self.cursor_img = scaled_pixmap
+    def handle_left_button(self, left_down):
+        if self.active is not None:
+            self.active.handle_left_button(left_down)
 
     def change_cursor(self, cursor_img_path):
         self.cursor_img_path = cursor_img_path
-        self.update_cursor_image()
-        self.update()
+        for overlay in self.overlays:
+            overlay.change_cursor(cursor_img_path)
 
     def set_volume(self, volume):
-        for player in self.active_click_players:
-            player.setVolume(volume)
-        self.player_loop.setVolume(volume)
+        self.resources.set_volume(volume)
 
-    def get_relative_cursor_pos(self):
-        global_pos = QtGui.QCursor.pos()
-        if self.screen:
-            screen_geometry = self.screen.geometry()
-            relative_x = global_pos.x() - screen_geometry.x()
-            relative_y = global_pos.y() - screen_geometry.y()
-            return QtCore.QPoint(relative_x, relative_y)
-        else:
-            return global_pos
+    def set_hud_visible(self, visible):
+        for overlay in self.overlays:
+            overlay.set_hud_visible(visible)
 
-    def poll_mouse(self):
-        if self._closed or not self.isVisible():
+    def configure_motion_filter(self):
+        self.resources.configure_motion_filter()
+
+    def set_annotation_mode(self, enabled):
+        for overlay in self.overlays:
+            overlay.set_annotation_mode(enabled)
+
+    def set_pointer_style(self, style):
+        for overlay in self.overlays:
+            overlay.set_pointer_style(style)
+
+    def set_click_effects(self, enabled):
+        self.resources.effects.set_enabled(enabled)
+
+    def set_backdrop(self, path):
+        self.resources.set_backdrop(path)
+        self.watch_backdrop()
+        for overlay in self.overlays:
+            overlay.set_backdrop(self.resources.backdrop)
+
+    def watch_backdrop(self):
+        if self.resources.backdrop is not None:
+            self.resources.backdrop.failed.connect(self.on_backdrop_failed)
+
+    def on_backdrop_failed(self, message):
+        if self.sender() is not self.resources.backdrop:
             return
-        pos = self.get_relative_cursor_pos()
-        if pos != self.cursor_pos:
-            self.cursor_pos = pos
-            self.update()
-        buttons = QtWidgets.QApplication.mouseButtons()
-        left_down = bool(buttons & QtCore.Qt.LeftButton)
-        if left_down and not self._last_mouse_down:
-            self.handle_mouse_press()
-        elif not left_down and self._last_mouse_down:
-            self.handle_mouse_release()
-        self._last_mouse_down = left_down
+        self.set_backdrop('')
+        self.backdrop_failed.emit(message)
 
-    def handle_mouse_press(self):
-        player = QtMultimedia.QMediaPlayer()
-        player.setMedia(QtMultimedia.QMediaContent(QtCore.QUrl.fromLocalFile(self.sound_click_path)))
-        player.setVolume(self.settings['volume'])
-        player.mediaStatusChanged.connect(lambda status, p=player: self.cleanup_click_player(status, p))
-        self.active_click_players.append(player)
-        player.play()
-        self.rotation = -15
-        self.update()
-        self.mouse_down = True
-        self.player_loop.stop()
-        self.player_loop.play()
+    def undo_annotation(self):
+        layered = [overlay for overlay in self.overlays if overlay.layer is not None]
+        if layered:
+            max(layered, key=lambda overlay: overlay.layer.last_sequence()).undo_annotation()
 
-    def cleanup_click_player(self, status, player):
-        if status == QtMultimedia.QMediaPlayer.EndOfMedia:
-            if player in self.active_click_players:
-                self.active_click_players.remove(player)
-                player.deleteLater()
+    def clear_annotations(self):
+        for overlay in self.overlays:
+            overlay.clear_annotations()
 
-    def handle_mouse_release(self):
-        self.mouse_down = False
-        self.player_loop.stop()
-        self.rotation = 0
-        self.update()
+    def isVisible(self):
+        return not self._closed and any(overlay.isVisible() for overlay in self.overlays)
 
-    def loop_sound_if_needed(self, status):
-        if status == QtMultimedia.QMediaPlayer.EndOfMedia and self.mouse_down:
-            self.player_loop.stop()
-            self.player_loop.play()
+    def is_shown(self):
+        return not self._closed and not self.hidden
 
-    def paintEvent(self, event):
-        painter = QtGui.QPainter(self)
-        painter.setRenderHint(QtGui.QPainter.Antialiasing)
-        painter.translate(self.cursor_pos.x(), self.cursor_pos.y())
-        painter.rotate(self.rotation)
-        painter.drawPixmap(-self.cursor_img.width() // 2, -self.cursor_img.height() // 2, self.cursor_img)
+    def show_overlay(self, screens):
+        if self._closed:
+            return
+        if self.hidden:
+            self.hidden = False
+            for overlay in self.overlays:
+                overlay.unpark()
+        self.set_screens(screens)
+        self.resources.input_source.start()
+        self.shown_changed.emit(True)
 
-    def keyPressEvent(self, event):
-        if event.key() == QtCore.Qt.Key_Escape:
+    def hide_overlay(self):
+        if self._closed or self.hidden:
+            return
+        self.hidden = True
+        self.resources.input_source.stop()
+        self.resources.hold_sound.stop()
+        for overlay in self.overlays:
+            overlay.park()
+        self.shown_changed.emit(False)
+        self.trim_memory()
+
+    def request_close(self):
+        if self.resident:
+            self.hide_overlay()
+        else:
+            self.close_overlay()
+
+    def resident_memory_bytes(self):
+        return self.resources.memory_bytes() + asset_cache().memory_bytes()
+
+    def annotation_memory_bytes(self):
+        return sum(overlay.layer.memory_bytes() for overlay in self.overlays if overlay.layer is not None)
+
+    def trim_memory(self):
+        keep = {(overlay.cursor_img_path, overlay.device_pixel_ratio()) for overlay in self.overlays}
+        self.resources.frame_cache.trim(keep)
+        self.resources.style_buffers.clear()
+        if self.resources.backdrop is not None:
+            self.resources.backdrop.trim()
+        asset_cache().trim()
+        drawn = any(overlay.layer is not None and overlay.layer.image is not None for overlay in self.overlays)
+        if not drawn and self.resident_memory_bytes() > self.settings['resident_memory_limit_mb'] * 1024 * 1024:
             self.close_overlay()
 
     def close_overlay(self):
         if self._closed:
             return
         self._closed = True
-        self.player_loop.stop()
-        self.poll_timer.stop()
-        for player in self.active_click_players:
-            player.stop()
-            player.deleteLater()
-        self.active_click_players.clear()
+        for overlay in self.overlays:
+            overlay.on_close_callback = None
+            overlay.close_overlay()
+            overlay.deleteLater()
+        self.overlays = []
+        self.active = None
+        self.resources.close()
         if self.on_close_callback:
             self.on_close_callback()
-        self.close()
+
+class StartupProfiler(QtCore.QObject):
+    def __init__(self, started, output=None, parent=None):
+        super().__init__(parent)
+        self.started = started
+        self.last = started
+        self.output = output
+        self.phases = []
+        self.assets_ms = None
+        self.window_ms = None
+        self.window_at = None
+        self.window = None
+        self.reported = False
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append({'phase': phase, 'ms': (now - self.last) * 1000, 'at_ms': (now - self.started) * 1000})
+        self.last = now
+
+    def mark_assets(self):
+        if self.assets_ms is None:
+            self.assets_ms = (time.perf_counter() - self.started) * 1000
+            self.maybe_report()
+
+    def watch(self, window):
+        self.window = window
+        window.installEventFilter(self)
+        QtCore.QTimer.singleShot(STARTUP_TIMEOUT_MS, self.report)
+
+    def eventFilter(self, obj, event):
+        if obj is self.window and event.type() == QtCore.QEvent.Paint:
+            self.window.removeEventFilter(self)
+            QtCore.QTimer.singleShot(0, self.on_first_paint)
+        return False
+
+    def on_first_paint(self):
+        self.mark('first_paint')
+        self.window_at = time.time()
+        self.window_ms = self.phases[-1]['at_ms']
+        self.maybe_report()
+
+    def maybe_report(self):
+        if self.window_ms is not None and self.assets_ms is not None:
+            self.report()
+
+    def report(self):
+        if self.reported:
+            return
+        self.reported = True
+        print('⏱️ Запуск Pointer:')
+        for phase in self.phases:
+            print(f"  {phase['phase']:<14} {phase['ms']:8.1f} мс")
+        if self.assets_ms is not None:
+            print(f"  {'assets':<14} готово через {self.assets_ms:.1f} мс (в фоне)")
+        if self.window_ms is not None:
+            status = '✅' if self.window_ms <= STARTUP_BUDGET_MS else '⚠️'
+            print(f"{status} Окно готово через {self.window_ms:.1f} мс (бюджет {STARTUP_BUDGET_MS} мс)")
+        else:
+            print(f"⚠️ Окно не отрисовалось за {STARTUP_TIMEOUT_MS} мс")
+        if self.output:
+            report = {
+                'phases': self.phases,
+                'assets_ready_ms': self.assets_ms,
+                'window_ready_ms': self.window_ms,
+                'window_ready_at': self.window_at,
+                'budget_ms': STARTUP_BUDGET_MS,
+            }
+            with open(self.output, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        QtWidgets.QApplication.instance().quit()
 
 class PointerApp(QtWidgets.QWidget):
-    def __init__(self):
+    thumbnail_ready = QtCore.pyqtSignal(int, int)
+    pack_import_finished = QtCore.pyqtSignal(object)
+
+    def __init__(self, profiler=None):
         super().__init__()
         self.setWindowTitle('Pointer')
+        self.profiler = profiler
         
-        if os.path.exists('icon.ico'):
-            self.setWindowIcon(QtGui.QIcon('icon.ico'))
+        if os.path.exists(ICON_PATH):
+            self.setWindowIcon(QtGui.QIcon(ICON_PATH))
         
-        self.settings = load_settings()
+        self.settings = SettingsStore(load_settings())
+        QtWidgets.QApplication.instance().aboutToQuit.connect(self.settings.close)
+        self.packs = list_packs()
+        self.pack = self.find_pack(self.settings['pack'])
+        if self.profiler is not None:
+            self.profiler.mark('settings')
+        self.import_executor = ThreadPoolExecutor(max_workers=1)
+        self.thumbnail_ready.connect(self.on_thumbnail_ready)
+        self.pack_import_finished.connect(self.on_pack_import_finished)
+        self.thumbnail_generation = 0
         self.selected_cursor_index = 0
         self.overlay = None
-        self.init_ui()
+        self.tray = None
         self.apply_dark_theme()
+        self.init_ui()
         self.resize(550, 600)
+        self.hotkey = GlobalHotkey(self)
+        self.hotkey.activated.connect(self.toggle_pointer)
+        QtWidgets.QApplication.instance().aboutToQuit.connect(self.hotkey.unregister)
+        self.register_hotkey()
+        self.apply_tray_mode()
+        QtCore.QTimer.singleShot(STARTUP_DEFER_MS, self.finish_startup)
+        if self.profiler is not None:
+            self.profiler.mark('ui')
+
+    def finish_startup(self):
+        self.prepare_pack_assets()
+        if self.settings['tray_mode']:
+            self.prewarm_overlay()
 
     def init_ui(self):
         main_layout = QtWidgets.QVBoxLayout(self)
@@ -200,103 +3599,47 @@ class PointerApp(QtWidgets.QWidget):
 
         title = QtWidgets.QLabel('<h1 style="color: #2a82da; margin: 0;">👆 Pointer</h1>')
         title.setAlignment(QtCore.Qt.AlignCenter)
-        title.setStyleSheet('font-size: 24px; font-weight: bold; margin-bottom: 10px;')
+        title.setObjectName('title')
         main_layout.addWidget(title)
 
         cursor_group = QtWidgets.QGroupBox("Выбор указки")
-        cursor_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                color: #f0f0f0;
-                border: 2px solid #2a82da;
-                border-radius: 8px;
-                margin-top: 10px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-            }
-        """)
-        
-        cursor_layout = QtWidgets.QHBoxLayout(cursor_group)
-        cursor_layout.setSpacing(15)
         
+        cursor_group_layout = QtWidgets.QVBoxLayout(cursor_group)
+        self.cursor_layout = QtWidgets.QHBoxLayout()
+        self.cursor_layout.setSpacing(15)
         self.cursor_buttons = []
-        for i, (name, filename) in enumerate(CURSORS):
-            btn = QtWidgets.QPushButton()
-            btn.setCheckable(True)
-            btn.setAutoExclusive(True)
-            pix = QtGui.QPixmap(os.path.join(ASSETS_PATH, filename)).scaled(80, 80, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-            pix = pix.transformed(QtGui.QTransform().scale(-1, 1))
-            btn.setIcon(QtGui.QIcon(pix))
-            btn.setIconSize(QtCore.QSize(80, 80))
-            btn.setFixedSize(100, 100)
-            btn.setToolTip(name)
-            btn.setStyleSheet("""
-                QPushButton {
-                    background: #31363b;
-                    border: 3px solid #2a82da;
-                    border-radius: 8px;
-                    padding: 5px;
-                }
-                QPushButton:checked {
-                    border-color: #4a9eea;
-                    background: #2a82da;
-                }
-                QPushButton:hover {
-                    border-color: #4a9eea;
-                    background: #3a3f44;
-                }
-            """)
-            if i == self.selected_cursor_index:
-                btn.setChecked(True)
-            btn.clicked.connect(lambda checked, idx=i: self.select_cursor(idx))
-            self.cursor_buttons.append(btn)
-            cursor_layout.addWidget(btn)
+        self.populate_cursor_buttons()
+        cursor_group_layout.addLayout(self.cursor_layout)
+
+        pack_layout = QtWidgets.QHBoxLayout()
+        pack_label = QtWidgets.QLabel("🎒 Набор:")
+        pack_label.setFixedWidth(100)
+
+        self.pack_combo = QtWidgets.QComboBox()
+        self.populate_pack_combo()
+        self.pack_combo.currentIndexChanged.connect(self.on_pack_changed)
+
+        self.import_btn = QtWidgets.QPushButton("📂 Импорт...")
+        self.import_btn.setToolTip("Импорт набора указок и звуков из zip-архива или папки (pack.json или любое изображение в папке)")
+        self.import_btn.setObjectName('toolButton')
+        self.import_btn.clicked.connect(self.on_import_pack)
+
+        pack_layout.addWidget(pack_label)
+        pack_layout.addWidget(self.pack_combo)
+        pack_layout.addWidget(self.import_btn)
+        pack_layout.addStretch()
+        cursor_group_layout.addLayout(pack_layout)
         
         main_layout.addWidget(cursor_group)
 
+
         self.start_btn = QtWidgets.QPushButton('🚀 Включить указку')
         self.start_btn.setFixedHeight(50)
-        self.start_btn.setStyleSheet("""
-            QPushButton {
-                background: linear-gradient(135deg, #2a82da, #1e6bb8);
-                color: white;
-                border: 3px solid #4a9eea;
-                border-radius: 10px;
-                font-size: 16px;
-                font-weight: bold;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: linear-gradient(135deg, #1e6bb8, #2a82da);
-                border-color: #5ab0fa;
-            }
-            QPushButton:pressed {
-                background: linear-gradient(135deg, #1a5a9e, #1e6bb8);
-            }
-        """)
-        self.start_btn.clicked.connect(self.start_pointer)
+        self.start_btn.setObjectName('startButton')
+        self.start_btn.clicked.connect(self.toggle_pointer)
         main_layout.addWidget(self.start_btn)
 
         settings_group = QtWidgets.QGroupBox("Настройки")
-        settings_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                color: #f0f0f0;
-                border: 2px solid #2a82da;
-                border-radius: 8px;
-                margin-top: 10px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-            }
-        """)
         
         settings_layout = QtWidgets.QVBoxLayout(settings_group)
         settings_layout.setSpacing(15)
@@ -304,37 +3647,15 @@ class PointerApp(QtWidgets.QWidget):
         volume_layout = QtWidgets.QHBoxLayout()
         volume_label = QtWidgets.QLabel("🔊 Громкость:")
         volume_label.setFixedWidth(100)
-        volume_label.setStyleSheet("color: #f0f0f0; font-weight: bold;")
         
         self.volume_slider = QtWidgets.QSlider(QtCore.Qt.Horizontal)
         self.volume_slider.setMinimum(0)
         self.volume_slider.setMaximum(100)
         self.volume_slider.setValue(self.settings['volume'])
-        self.volume_slider.setStyleSheet("""
-            QSlider::groove:horizontal {
-                border: 1px solid #444;
-                height: 10px;
-                background: #31363b;
-                margin: 2px 0;
-                border-radius: 5px;
-            }
-            QSlider::handle:horizontal {
-                background: #2a82da;
-                border: 2px solid #4a9eea;
-                width: 20px;
-                margin: -5px 0;
-                border-radius: 10px;
-            }
-            QSlider::sub-page:horizontal {
-                background: #2a82da;
-                border-radius: 5px;
-            }
-        """)
         self.volume_slider.valueChanged.connect(self.on_volume_changed)
         
         self.volume_value = QtWidgets.QLabel(f"{self.settings['volume']}%")
         self.volume_value.setFixedWidth(50)
-        self.volume_value.setStyleSheet("color: #f0f0f0; font-weight: bold;")
         
         volume_layout.addWidget(volume_label)
         volume_layout.addWidget(self.volume_slider)
@@ -344,59 +3665,217 @@ class PointerApp(QtWidgets.QWidget):
         screen_layout = QtWidgets.QHBoxLayout()
         screen_label = QtWidgets.QLabel("🖥️ Монитор:")
         screen_label.setFixedWidth(100)
-        screen_label.setStyleSheet("color: #f0f0f0; font-weight: bold;")
         
         self.screen_combo = QtWidgets.QComboBox()
-        screens = QtWidgets.QApplication.screens()
-        for i, screen in enumerate(screens):
-            screen_name = f"Монитор {i+1}"
-            if screen == QtWidgets.QApplication.primaryScreen():
-                screen_name += " (основной)"
-            self.screen_combo.addItem(screen_name)
-        
-        selected_screen = min(self.settings['selected_screen'], len(screens) - 1)
-        self.screen_combo.setCurrentIndex(selected_screen)
+        self.populate_screen_combo()
         self.screen_combo.currentIndexChanged.connect(self.on_screen_changed)
-        self.screen_combo.setStyleSheet("""
-            QComboBox {
-                background: #31363b;
-                color: #f0f0f0;
-                border: 2px solid #2a82da;
-                border-radius: 6px;
-                padding: 5px;
-                font-weight: bold;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                border-left: 5px solid transparent;
-                border-right: 5px solid transparent;
-                border-top: 5px solid #2a82da;
-            }
-            QComboBox QAbstractItemView {
-                background: #31363b;
-                color: #f0f0f0;
-                border: 2px solid #2a82da;
-                selection-background-color: #2a82da;
-            }
-        """)
+        QtWidgets.QApplication.instance().screenAdded.connect(self.on_screen_added)
+        QtWidgets.QApplication.instance().screenRemoved.connect(self.on_screen_removed)
         
         screen_layout.addWidget(screen_label)
         screen_layout.addWidget(self.screen_combo)
         screen_layout.addStretch()
         settings_layout.addLayout(screen_layout)
+
+        mode_layout = QtWidgets.QHBoxLayout()
+        mode_label = QtWidgets.QLabel("🪟 Режим:")
+        mode_label.setFixedWidth(100)
+
+        self.mode_combo = QtWidgets.QComboBox()
+        for mode, mode_name in OVERLAY_MODES:
+            self.mode_combo.addItem(mode_name, mode)
+        mode_index = self.mode_combo.findData(self.settings['overlay_mode'])
+        self.mode_combo.setCurrentIndex(max(mode_index, 0))
+        self.mode_combo.currentIndexChanged.connect(self.on_mode_changed)
+
+        mode_layout.addWidget(mode_label)
+        mode_layout.addWidget(self.mode_combo)
+        mode_layout.addStretch()
+        settings_layout.addLayout(mode_layout)
+
+        style_layout = QtWidgets.QHBoxLayout()
+        style_label = QtWidgets.QLabel("🔦 Стиль:")
+        style_label.setFixedWidth(100)
+
+        self.style_combo = QtWidgets.QComboBox()
+        for style, style_name in POINTER_STYLES:
+            self.style_combo.addItem(style_name, style)
+        style_index = self.style_combo.findData(self.settings['pointer_style'])
+        self.style_combo.setCurrentIndex(max(style_index, 0))
+        self.style_combo.setToolTip("Прожектор затемняет экран вокруг курсора, лупа увеличивает область под курсором (только в полноэкранном режиме)")
+        self.style_combo.currentIndexChanged.connect(self.on_style_changed)
+
+        self.effects_checkbox = QtWidgets.QCheckBox("💫 Эффекты кликов")
+        self.effects_checkbox.setToolTip("Расходящиеся круги при клике и свечение при удержании кнопки (только в полноэкранном режиме)")
+        self.effects_checkbox.setChecked(self.settings['click_effects'])
+        self.effects_checkbox.toggled.connect(self.on_click_effects_toggled)
+
+        style_layout.addWidget(style_label)
+        style_layout.addWidget(self.style_combo)
+        style_layout.addWidget(self.effects_checkbox)
+        style_layout.addStretch()
+        settings_layout.addLayout(style_layout)
+
+        backdrop_layout = QtWidgets.QHBoxLayout()
+        backdrop_label = QtWidgets.QLabel("🖼️ Фон:")
+        backdrop_label.setFixedWidth(100)
+
+        backdrop_btn = QtWidgets.QPushButton("📂 Выбрать...")
+        backdrop_btn.setObjectName('toolButton')
+        backdrop_btn.setToolTip("Изображение под указкой: колесо - масштаб, правая или средняя кнопка - перемещение, Home - вписать (только в полноэкранном режиме)")
+        backdrop_btn.clicked.connect(self.on_choose_backdrop)
+        self.backdrop_clear_btn = QtWidgets.QPushButton("✖ Убрать")
+        self.backdrop_clear_btn.setObjectName('toolButton')
+        self.backdrop_clear_btn.clicked.connect(lambda: self.set_backdrop(''))
+        self.backdrop_name = QtWidgets.QLabel()
+
+        backdrop_layout.addWidget(backdrop_label)
+        backdrop_layout.addWidget(backdrop_btn)
+        backdrop_layout.addWidget(self.backdrop_clear_btn)
+        backdrop_layout.addWidget(self.backdrop_name)
+        backdrop_layout.addStretch()
+        settings_layout.addLayout(backdrop_layout)
+        self.update_backdrop_label()
+
+        renderer_layout = QtWidgets.QHBoxLayout()
+        renderer_label = QtWidgets.QLabel("🎨 Отрисовка:")
+        renderer_label.setFixedWidth(100)
+
+        self.renderer_combo = QtWidgets.QComboBox()
+        for renderer, renderer_name in RENDERERS:
+            self.renderer_combo.addItem(renderer_name, renderer)
+        renderer_index = self.renderer_combo.findData(self.settings['renderer'])
+        self.renderer_combo.setCurrentIndex(max(renderer_index, 0))
+        self.renderer_combo.setToolTip("OpenGL переносит смешивание и поворот указки на видеокарту; без OpenGL используется программная отрисовка")
+        self.renderer_combo.currentIndexChanged.connect(self.on_renderer_changed)
+
+        renderer_layout.addWidget(renderer_label)
+        renderer_layout.addWidget(self.renderer_combo)
+        renderer_layout.addStretch()
+        settings_layout.addLayout(renderer_layout)
+
+        stats_layout = QtWidgets.QHBoxLayout()
+        self.stats_checkbox = QtWidgets.QCheckBox("📈 Запись метрик")
+        self.stats_checkbox.setToolTip("Сохраняет трассу кадров в папку traces при выключении указки")
+        self.stats_checkbox.setChecked(self.settings['instrumentation'])
+        self.stats_checkbox.toggled.connect(self.on_instrumentation_toggled)
+
+        self.hud_checkbox = QtWidgets.QCheckBox("HUD")
+        self.hud_checkbox.setChecked(self.settings['show_hud'])
+        self.hud_checkbox.toggled.connect(self.on_hud_toggled)
+
+        stats_layout.addWidget(self.stats_checkbox)
+        stats_layout.addWidget(self.hud_checkbox)
+        stats_layout.addStretch()
+        settings_layout.addLayout(stats_layout)
+
+        filter_layout = QtWidgets.QHBoxLayout()
+        self.filter_checkbox = QtWidgets.QCheckBox("🎯 Сглаживание")
+        self.filter_checkbox.setToolTip("Убирает дрожание указки и прогнозирует движение, чтобы скрыть задержку")
+        self.filter_checkbox.setChecked(self.settings['motion_filter'])
+        self.filter_checkbox.toggled.connect(self.on_motion_filter_changed)
+
+        self.prediction_spin = QtWidgets.QSpinBox()
+        self.prediction_spin.setRange(0, 50)
+        self.prediction_spin.setPrefix("Прогноз: ")
+        self.prediction_spin.setSuffix(" мс")
+        self.prediction_spin.setValue(self.settings['prediction_ms'])
+        self.prediction_spin.setToolTip("На сколько миллисекунд вперёд указка экстраполирует движение курсора")
+        self.prediction_spin.valueChanged.connect(self.on_motion_filter_changed)
+
+        self.cutoff_spin = QtWidgets.QDoubleSpinBox()
+        self.cutoff_spin.setRange(0.1, 10.0)
+        self.cutoff_spin.setSingleStep(0.1)
+        self.cutoff_spin.setPrefix("Частота: ")
+        self.cutoff_spin.setSuffix(" Гц")
+        self.cutoff_spin.setValue(self.settings['filter_min_cutoff'])
+        self.cutoff_spin.setToolTip("Меньше - сильнее сглаживание дрожания при медленном движении")
+        self.cutoff_spin.valueChanged.connect(self.on_motion_filter_changed)
+
+        self.beta_spin = QtWidgets.QDoubleSpinBox()
+        self.beta_spin.setRange(0.0, 1.0)
+        self.beta_spin.setDecimals(3)
+        self.beta_spin.setSingleStep(0.001)
+        self.beta_spin.setPrefix("Реакция: ")
+        self.beta_spin.setValue(self.settings['filter_beta'])
+        self.beta_spin.setToolTip("Больше - меньше отставание при быстром движении")
+        self.beta_spin.valueChanged.connect(self.on_motion_filter_changed)
+
+        filter_layout.addWidget(self.filter_checkbox)
+        filter_layout.addWidget(self.prediction_spin)
+        filter_layout.addWidget(self.cutoff_spin)
+        filter_layout.addWidget(self.beta_spin)
+        filter_layout.addStretch()
+        settings_layout.addLayout(filter_layout)
+
+        annotation_layout = QtWidgets.QHBoxLayout()
+        self.annotation_checkbox = QtWidgets.QCheckBox("✏️ Рисование")
+        self.annotation_checkbox.setToolTip("Удерживайте левую кнопку мыши, чтобы рисовать поверх экрана (Ctrl+Z - отменить, Delete - очистить)")
+        self.annotation_checkbox.setChecked(self.settings['annotation_mode'])
+        self.annotation_checkbox.toggled.connect(self.on_annotation_toggled)
+
+        undo_btn = QtWidgets.QPushButton("↩️ Отменить")
+        undo_btn.setObjectName('toolButton')
+        undo_btn.clicked.connect(self.undo_annotation)
+        clear_btn = QtWidgets.QPushButton("🧹 Очистить")
+        clear_btn.setObjectName('toolButton')
+        clear_btn.clicked.connect(self.clear_annotations)
+
+        annotation_layout.addWidget(self.annotation_checkbox)
+        annotation_layout.addWidget(undo_btn)
+        annotation_layout.addWidget(clear_btn)
+        annotation_layout.addStretch()
+        settings_layout.addLayout(annotation_layout)
+
+        record_layout = QtWidgets.QHBoxLayout()
+        self.record_checkbox = QtWidgets.QCheckBox("⏺️ Запись сессии")
+        self.record_checkbox.setToolTip("Сохраняет движение указки и клики в папку recordings")
+        self.record_checkbox.setChecked(self.settings['record_session'])
+        self.record_checkbox.toggled.connect(self.on_record_toggled)
+
+        self.replay_btn = QtWidgets.QPushButton("▶️ Воспроизвести...")
+        self.replay_btn.setObjectName('toolButton')
+        self.replay_btn.clicked.connect(self.choose_replay)
+
+        self.replay_speed_spin = QtWidgets.QDoubleSpinBox()
+        self.replay_speed_spin.setRange(0.25, 8.0)
+        self.replay_speed_spin.setSingleStep(0.25)
+        self.replay_speed_spin.setSuffix("x")
+        self.replay_speed_spin.setValue(self.settings['replay_speed'])
+        self.replay_speed_spin.setToolTip("Скорость воспроизведения записи")
+        self.replay_speed_spin.valueChanged.connect(self.on_replay_speed_changed)
+
+        record_layout.addWidget(self.record_checkbox)
+        record_layout.addWidget(self.replay_btn)
+        record_layout.addWidget(self.replay_speed_spin)
+        record_layout.addStretch()
+        settings_layout.addLayout(record_layout)
+
+        tray_layout = QtWidgets.QHBoxLayout()
+        self.tray_checkbox = QtWidgets.QCheckBox("📌 Работать в трее")
+        self.tray_checkbox.setToolTip("Указка создаётся заранее и включается горячей клавишей без задержки")
+        self.tray_checkbox.setChecked(self.settings['tray_mode'])
+        self.tray_checkbox.toggled.connect(self.on_tray_toggled)
+
+        hotkey_label = QtWidgets.QLabel("⌨️ Клавиша:")
+        self.hotkey_edit = QtWidgets.QKeySequenceEdit(QtGui.QKeySequence(self.settings['hotkey'], QtGui.QKeySequence.PortableText))
+        self.hotkey_edit.editingFinished.connect(self.on_hotkey_changed)
+
+        tray_layout.addWidget(self.tray_checkbox)
+        tray_layout.addWidget(hotkey_label)
+        tray_layout.addWidget(self.hotkey_edit)
+        tray_layout.addStretch()
+        settings_layout.addLayout(tray_layout)
         main_layout.addWidget(settings_group)
 
         info_layout = QtWidgets.QVBoxLayout()
         
         tips_label = QtWidgets.QLabel("💡 Подсказки:")
-        tips_label.setStyleSheet("color: #2a82da; font-weight: bold; font-size: 14px;")
+        tips_label.setObjectName('tipsTitle')
         info_layout.addWidget(tips_label)
         
-        tips_text = QtWidgets.QLabel("• ESC - выключить указку")
-        tips_text.setStyleSheet("color: #888; font-size: 12px; margin-left: 10px;")
+        tips_text = QtWidgets.QLabel("• ESC или кнопка выше - выключить указку\n• В режиме окна за курсором ESC не доходит - используйте кнопку или горячую клавишу\n• Ctrl+Z / Delete - отменить / очистить рисунок\n• Горячая клавиша - включить/выключить указку из любого окна")
+        tips_text.setObjectName('tipsText')
         info_layout.addWidget(tips_text)
         
         main_layout.addLayout(info_layout)
@@ -405,25 +3884,7 @@ class PointerApp(QtWidgets.QWidget):
         github_btn.setFixedSize(80, 35)
         github_btn.setToolTip("GitHub")
         github_btn.clicked.connect(lambda: QtGui.QDesktopServices.openUrl(QtCore.QUrl("https://github.com/dreamtydev")))
-        github_btn.setStyleSheet("""
-            QPushButton {
-                background: #31363b;
-                color: #f0f0f0;
-                border: 2px solid #2a82da;
-                border-radius: 6px;
-                padding: 8px;
-                font-weight: bold;
-                font-size: 12px;
-            }
-            QPushButton:hover {
-                border-color: #4a9eea;
-                background: #3a3f44;
-            }
-            QPushButton:pressed {
-                background: #2a82da;
-                color: #fff;
-            }
-        """)
+        github_btn.setObjectName('githubButton')
         
         github_layout = QtWidgets.QHBoxLayout()
         github_layout.addWidget(github_btn)
@@ -432,43 +3893,288 @@ class PointerApp(QtWidgets.QWidget):
         
         self.setLayout(main_layout)
 
+    def populate_cursor_buttons(self):
+        for btn in self.cursor_buttons:
+            self.cursor_layout.removeWidget(btn)
+            btn.deleteLater()
+        self.cursor_buttons = []
+        self.thumbnail_generation += 1
+        thumbnail_size = QtCore.QSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE)
+        for i, (name, path) in enumerate(self.pack['cursors']):
+            btn = QtWidgets.QPushButton()
+            btn.setCheckable(True)
+            btn.setAutoExclusive(True)
+            btn.setIconSize(thumbnail_size)
+            btn.setFixedSize(100, 100)
+            btn.setToolTip(name)
+            btn.setObjectName('cursorButton')
+            if i == self.selected_cursor_index:
+                btn.setChecked(True)
+            btn.clicked.connect(lambda checked, idx=i: self.select_cursor(idx))
+            self.cursor_buttons.append(btn)
+            self.cursor_layout.addWidget(btn)
+            future = asset_cache().prepare(path, thumbnail_size, True, self.devicePixelRatioF())
+            if future is None:
+                self.on_thumbnail_ready(self.thumbnail_generation, i)
+            else:
+                future.add_done_callback(lambda f, generation=self.thumbnail_generation, idx=i: self.thumbnail_ready.emit(generation, idx))
+
+    def on_thumbnail_ready(self, generation, idx):
+        if generation != self.thumbnail_generation:
+            return
+        name, path = self.pack['cursors'][idx]
+        thumbnail_size = QtCore.QSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE)
+        pix = asset_cache().pixmap(path, thumbnail_size, True, self.devicePixelRatioF())
+        self.cursor_buttons[idx].setIcon(QtGui.QIcon(pix))
+        if self.profiler is not None and all(not btn.icon().isNull() for btn in self.cursor_buttons):
+            self.profiler.mark_assets()
+
+    def find_pack(self, pack_id):
+        for pack in self.packs:
+            if pack['id'] == pack_id:
+                return pack
+        return self.packs[0]
+
+    def populate_pack_combo(self):
+        self.pack_combo.blockSignals(True)
+        self.pack_combo.clear()
+        for pack in self.packs:
+            self.pack_combo.addItem(pack['name'], pack['id'])
+        self.pack_combo.setCurrentIndex(max(self.pack_combo.findData(self.pack['id']), 0))
+        self.pack_combo.blockSignals(False)
+
+    def prepare_pack_assets(self):
+        screen = QtWidgets.QApplication.primaryScreen()
+        dpr = screen.devicePixelRatio() if screen else 1.0
+        for name, path in self.pack['cursors']:
+            asset_cache().prepare_scaled(path, CURSOR_SCALE, True, dpr)
+
+    def current_cursor_path(self):
+        name, path = self.pack['cursors'][self.selected_cursor_index]
+        return path
+
+    def on_pack_changed(self, index):
+        self.pack = self.find_pack(self.pack_combo.itemData(index))
+        self.settings['pack'] = self.pack['id']
+        self.settings.schedule_save()
+        self.selected_cursor_index = 0
+        self.populate_cursor_buttons()
+        self.prepare_pack_assets()
+        if self.overlay:
+            self.restart_pointer()
+
+    def on_import_pack(self):
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, 'Импорт набора указок', '', 'Наборы указок (*.zip pack.json);;Все файлы (*)'
+        )
+        if not path:
+            return
+        self.import_btn.setEnabled(False)
+        future = self.import_executor.submit(import_pack, path)
+        future.add_done_callback(self.pack_import_finished.emit)
+
+    def on_pack_import_finished(self, future):
+        self.import_btn.setEnabled(True)
+        try:
+            pack = future.result()
+        except (OSError, ValueError, KeyError, TypeError, zipfile.BadZipFile) as e:
+            QtWidgets.QMessageBox.warning(self, 'Импорт набора', f'Не удалось импортировать набор: {e}')
+            return
+        self.packs = list_packs()
+        self.populate_pack_combo()
+        self.pack_combo.setCurrentIndex(self.pack_combo.findData(pack['id']))
+
+    def init_tray(self):
+        icon = self.windowIcon()
+        if icon.isNull():
+            icon = self.style().standardIcon(QtWidgets.QStyle.SP_ComputerIcon)
+        self.tray = QtWidgets.QSystemTrayIcon(icon, self)
+        self.tray.setToolTip('Pointer')
+        self.tray_menu = QtWidgets.QMenu(self)
+        self.tray_menu.addAction('👆 Включить/выключить указку', self.toggle_pointer)
+        self.tray_menu.addAction('🪟 Открыть окно', self.show_window)
+        self.memory_action = self.tray_menu.addAction('')
+        self.memory_action.setEnabled(False)
+        self.resources_action = self.tray_menu.addAction('')
+        self.resources_action.setEnabled(False)
+        self.tray_menu.addSeparator()
+        self.tray_menu.addAction('❌ Выход', QtWidgets.QApplication.instance().quit)
+        self.tray_menu.aboutToShow.connect(self.update_memory_action)
+        self.tray.setContextMenu(self.tray_menu)
+        self.tray.activated.connect(self.on_tray_activated)
+
+    def apply_tray_mode(self, prewarm=False):
+        tray_mode = self.settings['tray_mode'] and QtWidgets.QSystemTrayIcon.isSystemTrayAvailable()
+        if tray_mode and self.tray is None:
+            self.init_tray()
+        if self.tray is not None:
+            self.tray.setVisible(tray_mode)
+        QtWidgets.QApplication.instance().setQuitOnLastWindowClosed(not tray_mode)
+        if self.settings['tray_mode'] and prewarm:
+            QtCore.QTimer.singleShot(0, self.prewarm_overlay)
+
+    def update_memory_action(self):
+        if self.overlay:
+            memory = self.overlay.resident_memory_bytes() / (1024 * 1024)
+            annotations = self.overlay.annotation_memory_bytes() / (1024 * 1024)
+            text = f"💾 Память: {memory:.1f} / {self.settings['resident_memory_limit_mb']} МБ"
+            if annotations:
+                text += f", рисунки {annotations:.1f} МБ"
+            self.memory_action.setText(text)
+        else:
+            self.memory_action.setText('💾 Указка не загружена')
+        counts = resource_counts()
+        self.resources_action.setText(
+            f"🧩 Объекты: оверлеи {counts['overlays']}, звуки {counts['click_voices'] + counts['hold_players']}, таймеры {counts['active_timers']}/{counts['timers']}"
+        )
+
+    def on_tray_activated(self, reason):
+        if reason == QtWidgets.QSystemTrayIcon.Trigger:
+            self.toggle_pointer()
+        elif reason == QtWidgets.QSystemTrayIcon.DoubleClick:
+            self.show_window()
+
+    def show_window(self):
+        self.showNormal()
+        self.raise_()
+        self.activateWindow()
+
+    def closeEvent(self, event):
+        if self.tray is not None and self.tray.isVisible():
+            event.ignore()
+            self.hide()
+        else:
+            super().closeEvent(event)
+
+    def register_hotkey(self):
+        if self.settings['hotkey']:
+            self.hotkey.register(self.settings['hotkey'])
+        else:
+            self.hotkey.unregister()
+
+    def on_hotkey_changed(self):
+        sequence = self.hotkey_edit.keySequence()
+        hotkey = QtGui.QKeySequence(sequence[0]).toString(QtGui.QKeySequence.PortableText) if sequence.count() else ''
+        if hotkey == self.settings['hotkey']:
+            return
+        self.settings['hotkey'] = hotkey
+        self.settings.schedule_save()
+        self.register_hotkey()
+
+    def on_tray_toggled(self, checked):
+        self.settings['tray_mode'] = checked
+        self.settings.schedule_save()
+        if self.overlay:
+            self.overlay.resident = checked
+            if not self.overlay.isVisible():
+                self.overlay.close_overlay()
+                self.overlay = None
+        self.apply_tray_mode(prewarm=True)
+
+    def prewarm_overlay(self):
+        if self.overlay or not self.settings['tray_mode']:
+            return
+        self.overlay = OverlayGroup(
+            self.current_cursor_path(), self.pack['click'], self.pack['hold'], self.settings,
+            self.on_overlay_close, self.on_cursor_change, self.target_screens(), resident=True, hidden=True
+        )
+        self.attach_overlay()
+        self.overlay.trim_memory()
+
+    def available_screens(self, removed=None):
+        return [screen for screen in QtWidgets.QApplication.screens() if screen is not removed]
+
+    def populate_screen_combo(self, removed=None):
+        self.screen_combo.blockSignals(True)
+        self.screen_combo.clear()
+        screens = self.available_screens(removed)
+        for i, screen in enumerate(screens):
+            screen_name = f"Монитор {i+1}"
+            if screen == QtWidgets.QApplication.primaryScreen():
+                screen_name += " (основной)"
+            self.screen_combo.addItem(screen_name, i)
+        if len(screens) > 1:
+            self.screen_combo.addItem("Все мониторы", ALL_SCREENS)
+        index = self.screen_combo.findData(self.settings['selected_screen'])
+        if index < 0:
+            index = min(max(self.settings['selected_screen'], 0), len(screens) - 1)
+        self.screen_combo.setCurrentIndex(index)
+        self.screen_combo.blockSignals(False)
+
+    def target_screens(self, removed=None):
+        screens = self.available_screens(removed)
+        if not screens:
+            return []
+        if self.settings['selected_screen'] == ALL_SCREENS:
+            return screens
+        return [screens[min(max(self.settings['selected_screen'], 0), len(screens) - 1)]]
+
     def select_cursor(self, idx):
         self.selected_cursor_index = idx
         for i, btn in enumerate(self.cursor_buttons):
             btn.setChecked(i == idx)
-        if self.overlay and self.overlay.isVisible():
-            name, filename = CURSORS[idx]
-            img_path = os.path.join(ASSETS_PATH, filename)
-            self.overlay.change_cursor(img_path)
+        if self.overlay:
+            self.overlay.change_cursor(self.current_cursor_path())
 
     def start_pointer(self):
+        img_path = self.current_cursor_path()
+        if self.overlay and self.overlay.resident:
+            self.overlay.change_cursor(img_path)
+            self.overlay.show_overlay(self.target_screens())
+            return
         if self.overlay:
             self.overlay.close_overlay()
             self.overlay = None
-        name, filename = CURSORS[self.selected_cursor_index]
-        img_path = os.path.join(ASSETS_PATH, filename)
         
-        screens = QtWidgets.QApplication.screens()
-        selected_screen_index = min(self.settings['selected_screen'], len(screens) - 1)
-        selected_screen = screens[selected_screen_index]
-        
-        self.overlay = CursorOverlay(
-            img_path, SOUND_CLICK, SOUND_LOOP, self.settings, 
-            self.on_overlay_close, self.on_cursor_change, selected_screen
+        self.overlay = OverlayGroup(
+            img_path, self.pack['click'], self.pack['hold'], self.settings, 
+            self.on_overlay_close, self.on_cursor_change, self.target_screens(),
+            resident=self.settings['tray_mode']
         )
-        self.overlay.show()
+        self.attach_overlay()
+
+    def attach_overlay(self):
+        self.overlay.backdrop_failed.connect(self.on_backdrop_failed)
+        self.overlay.shown_changed.connect(self.update_start_button)
+        self.update_start_button()
+
+    def update_start_button(self):
+        if self.overlay and self.overlay.is_shown():
+            self.start_btn.setText('⏹️ Выключить указку')
+        else:
+            self.start_btn.setText('🚀 Включить указку')
+
+    def stop_pointer(self):
+        if not self.overlay:
+            return
+        if self.overlay.resident:
+            self.overlay.hide_overlay()
+        else:
+            self.overlay.close_overlay()
+            self.overlay = None
+            self.update_start_button()
 
     def toggle_pointer(self):
+        if self.overlay and self.overlay.is_shown():
+            self.stop_pointer()
+        else:
+            self.start_pointer()
+
+    def restart_pointer(self):
+        visible = self.overlay is not None and self.overlay.isVisible()
         if self.overlay:
             self.overlay.close_overlay()
             self.overlay = None
-        else:
+        if visible:
             self.start_pointer()
+        else:
+            self.prewarm_overlay()
 
     def on_overlay_close(self):
         if self.overlay:
-            self.overlay.close()
+            self.overlay.deleteLater()
         self.overlay = None
+        self.update_start_button()
 
     def on_cursor_change(self, cursor_index):
         self.selected_cursor_index = cursor_index
@@ -478,84 +4184,170 @@ class PointerApp(QtWidgets.QWidget):
     def on_volume_changed(self, value):
         self.settings['volume'] = value
         self.volume_value.setText(f"{value}%")
-        save_settings(self.settings)
+        self.settings.schedule_save()
         if self.overlay:
             self.overlay.set_volume(value)
 
     def on_screen_changed(self, index):
-        self.settings['selected_screen'] = index
-        save_settings(self.settings)
+        self.settings['selected_screen'] = self.screen_combo.itemData(index)
+        self.settings.schedule_save()
+        if self.overlay:
+            self.overlay.set_screens(self.target_screens())
+
+    def on_screen_added(self, screen):
+        self.refresh_screens()
+
+    def on_screen_removed(self, screen):
+        self.refresh_screens(screen)
+
+    def refresh_screens(self, removed=None):
+        self.populate_screen_combo(removed)
+        if self.overlay:
+            self.overlay.set_screens(self.target_screens(removed))
+
+    def on_mode_changed(self, index):
+        self.settings['overlay_mode'] = self.mode_combo.itemData(index)
+        self.settings.schedule_save()
+        if self.overlay:
+            self.restart_pointer()
+
+    def on_style_changed(self, index):
+        self.settings['pointer_style'] = self.style_combo.itemData(index)
+        self.settings.schedule_save()
+        if self.overlay:
+            self.overlay.set_pointer_style(self.settings['pointer_style'])
+
+    def on_click_effects_toggled(self, checked):
+        self.settings['click_effects'] = checked
+        self.settings.schedule_save()
+        if self.overlay:
+            self.overlay.set_click_effects(checked)
+
+    def update_backdrop_label(self):
+        path = self.settings['backdrop_image']
+        self.backdrop_name.setText(os.path.basename(path) if path else 'нет')
+        self.backdrop_name.setToolTip(path)
+        self.backdrop_clear_btn.setEnabled(bool(path))
+
+    def on_choose_backdrop(self):
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, 'Фоновое изображение', os.path.dirname(self.settings['backdrop_image']), BACKDROP_FILTER
+        )
+        if not path:
+            return
+        try:
+            BackdropPyramid(path, 0)
+        except (OSError, ValueError) as e:
+            QtWidgets.QMessageBox.warning(self, 'Фоновое изображение', f'Не удалось открыть изображение: {e}')
+            return
+        self.set_backdrop(path)
+
+    def set_backdrop(self, path):
+        self.settings['backdrop_image'] = path
+        self.settings.schedule_save()
+        self.update_backdrop_label()
+        if self.overlay:
+            self.overlay.set_backdrop(path)
+
+    def on_backdrop_failed(self, message):
+        self.set_backdrop('')
+        QtWidgets.QMessageBox.warning(self, 'Фоновое изображение', f'Не удалось подготовить изображение: {message}')
+
+    def on_renderer_changed(self, index):
+        self.settings['renderer'] = self.renderer_combo.itemData(index)
+        self.settings.schedule_save()
+        if self.overlay:
+            self.restart_pointer()
+
+    def on_motion_filter_changed(self, *args):
+        self.settings['motion_filter'] = self.filter_checkbox.isChecked()
+        self.settings['prediction_ms'] = self.prediction_spin.value()
+        self.settings['filter_min_cutoff'] = self.cutoff_spin.value()
+        self.settings['filter_beta'] = self.beta_spin.value()
+        self.settings.schedule_save()
+        if self.overlay:
+            self.overlay.configure_motion_filter()
+
+    def on_annotation_toggled(self, checked):
+        self.settings['annotation_mode'] = checked
+        self.settings.schedule_save()
+        if self.overlay:
+            self.overlay.set_annotation_mode(checked)
+
+    def undo_annotation(self):
+        if self.overlay:
+            self.overlay.undo_annotation()
+
+    def clear_annotations(self):
+        if self.overlay:
+            self.overlay.clear_annotations()
+
+    def on_record_toggled(self, checked):
+        self.settings['record_session'] = checked
+        self.settings.schedule_save()
+        if self.overlay:
+            self.restart_pointer()
+
+    def on_replay_speed_changed(self, value):
+        self.settings['replay_speed'] = value
+        self.settings.schedule_save()
+
+    def choose_replay(self):
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, 'Воспроизведение записи', RECORDINGS_PATH, 'Записи Pointer (*.ptrec)'
+        )
+        if path:
+            self.start_replay(path)
+
+    def start_replay(self, path):
+        try:
+            source = ReplaySource(path, self.settings['replay_speed'])
+        except (OSError, ValueError) as e:
+            QtWidgets.QMessageBox.warning(self, 'Воспроизведение записи', f'Не удалось открыть запись: {e}')
+            return
         if self.overlay:
             self.overlay.close_overlay()
             self.overlay = None
-            self.start_pointer()
+        self.overlay = OverlayGroup(
+            self.current_cursor_path(), self.pack['click'], self.pack['hold'], self.settings,
+            self.on_overlay_close, self.on_cursor_change, self.target_screens(), input_source=source
+        )
+        self.attach_overlay()
+        source.finished.connect(self.overlay.close_overlay)
+
+    def on_instrumentation_toggled(self, checked):
+        self.settings['instrumentation'] = checked
+        self.settings.schedule_save()
+        if self.overlay:
+            self.restart_pointer()
+
+    def on_hud_toggled(self, checked):
+        self.settings['show_hud'] = checked
+        self.settings.schedule_save()
+        if self.overlay:
+            self.overlay.set_hud_visible(checked)
 
     def apply_dark_theme(self):
-        dark_qss = """
-        QWidget { 
-            background: #232629; 
-            color: #f0f0f0; 
-            font-family: 'Segoe UI', Arial, sans-serif;
-        }
-        QMainWindow, QDialog { 
-            background: #232629; 
-        }
-        QGroupBox {
-            color: #f0f0f0;
-            background: #2a2e32;
-            border: 2px solid #2a82da;
-            border-radius: 8px;
-            margin-top: 10px;
-            padding-top: 10px;
-        }
-        QGroupBox::title {
-            subcontrol-origin: margin;
-            left: 10px;
-            padding: 0 5px 0 5px;
-            color: #f0f0f0;
-        }
-        QLabel {
-            color: #f0f0f0;
-        }
-        QMenuBar {
-            background: #232629;
-            color: #f0f0f0;
-            border: none;
-        }
-        QMenuBar::item {
-            background: transparent;
-            color: #f0f0f0;
-            padding: 4px 8px;
-        }
-        QMenuBar::item:selected {
-            background: #2a82da;
-            color: #ffffff;
-        }
-        QMenu {
-            background: #31363b;
-            color: #f0f0f0;
-            border: 1px solid #444;
-        }
-        QMenu::item {
-            padding: 4px 20px;
-        }
-        QMenu::item:selected {
-            background: #2a82da;
-            color: #ffffff;
-        }
-        QTitleBar {
-            background: #232629;
-            color: #f0f0f0;
-        }
-        """
-        self.setStyleSheet(dark_qss)
+        self.setStyleSheet(APP_STYLESHEET)
 
 if __name__ == '__main__':
+    if '--check-imports' in sys.argv[1:]:
+        from PyQt5 import QtMultimedia
+        sys.exit(0)
+    profiler = None
+    for arg in sys.argv[1:]:
+        if arg == '--profile-startup' or arg.startswith('--profile-startup='):
+            profiler = StartupProfiler(STARTUP_STARTED, arg.partition('=')[2] or None)
+            profiler.mark('import')
     app = QtWidgets.QApplication(sys.argv)
     
-    if os.path.exists('icon.ico'):
-        app.setWindowIcon(QtGui.QIcon('icon.ico'))
+    if os.path.exists(ICON_PATH):
+        app.setWindowIcon(QtGui.QIcon(ICON_PATH))
+    if profiler is not None:
+        profiler.mark('qt')
     
-    window = PointerApp()
+    window = PointerApp(profiler)
+    if profiler is not None:
+        profiler.watch(window)
     window.show()
     sys.exit(app.exec_()) 
\ No newline at end of file
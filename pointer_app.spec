@@ -0,0 +1,101 @@
+# -*- mode: python ; coding: utf-8 -*-
+import os
+import sys
+
+ROOT = os.path.abspath(SPECPATH)
+PREBUILT = os.path.join(ROOT, 'build', 'prebuilt')
+
+ASSETS = ['default.png', 'default_reverse.png', 'knock.wav', 'hold.wav']
+
+EXCLUDES = [
+    'tkinter', 'unittest', 'pydoc', 'doctest', 'pdb', 'lib2to3', 'sqlite3',
+    'xmlrpc', 'http.server', 'distutils', 'setuptools', 'pip',
+    'PyQt5.QtOpenGL', 'PyQt5.QtPrintSupport', 'PyQt5.QtSvg', 'PyQt5.QtXml',
+    'PyQt5.QtXmlPatterns', 'PyQt5.QtSql', 'PyQt5.QtTest', 'PyQt5.QtDBus', 'PyQt5.QtDesigner',
+    'PyQt5.QtHelp', 'PyQt5.QtQml', 'PyQt5.QtQuick', 'PyQt5.QtQuick3D', 'PyQt5.QtQuickWidgets',
+    'PyQt5.QtWebChannel', 'PyQt5.QtWebSockets', 'PyQt5.QtWebEngine', 'PyQt5.QtWebEngineCore',
+    'PyQt5.QtWebEngineWidgets', 'PyQt5.QtBluetooth', 'PyQt5.QtNfc', 'PyQt5.QtLocation',
+    'PyQt5.QtPositioning', 'PyQt5.QtSensors', 'PyQt5.QtSerialPort', 'PyQt5.QtRemoteObjects',
+    'PyQt5.QtTextToSpeech', 'PyQt5.QtMultimediaWidgets', 'PyQt5.QtX11Extras', 'PyQt5.QtWinExtras',
+    'PyQt5.QAxContainer', 'PyQt5.uic',
+]
+
+QT_LIBRARIES = (
+    'Core', 'Gui', 'Widgets', 'Multimedia', 'Network', 'DBus', 'XcbQpa', 'WaylandClient',
+)
+
+QT_PLUGINS = {
+    'platforms': ('qwindows', 'qxcb', 'qwayland', 'qoffscreen'),
+    'imageformats': ('qjpeg', 'qgif', 'qico', 'qwebp', 'qtiff'),
+    'audio': None,
+    'styles': None,
+    'xcbglintegrations': None,
+    'wayland-shell-integration': None,
+    'wayland-graphics-integration-client': None,
+    'wayland-decoration-client': None,
+    'platforminputcontexts': ('composeplatforminputcontextplugin', 'ibusplatforminputcontextplugin'),
+}
+
+QT_DROPPED_FILES = ('opengl32sw.dll',)
+
+def qt_keep(dest):
+    parts = dest.replace('\\', '/').split('/')
+    if len(parts) < 3 or parts[0] != 'PyQt5' or parts[1] != 'Qt5':
+        return True
+    name = parts[-1]
+    if parts[2] in ('translations', 'qml', 'qsci'):
+        return False
+    if name in QT_DROPPED_FILES:
+        return False
+    if parts[2] == 'plugins':
+        allowed = QT_PLUGINS.get(parts[3], ()) if len(parts) > 4 else ()
+        stem = name[3:] if name.startswith('lib') else name
+        return allowed is None or any(stem.startswith(prefix) for prefix in allowed)
+    stem = name[3:] if name.startswith('lib') else name
+    if stem.startswith('Qt5'):
+        return stem[3:].split('.')[0] in QT_LIBRARIES
+    return True
+
+datas = [(os.path.join(ROOT, 'src', 'assets', name), os.path.join('src', 'assets')) for name in ASSETS]
+datas.append((os.path.join(ROOT, 'icon.ico'), '.'))
+if os.path.isdir(PREBUILT):
+    datas.append((PREBUILT, os.path.join('src', 'assets', 'prebuilt')))
+
+a = Analysis(
+    [os.path.join(ROOT, 'pointer_app.py')],
+    pathex=[ROOT],
+    binaries=[],
+    datas=datas,
+    hiddenimports=['PyQt5.QtMultimedia', 'PyQt5.QtNetwork'],
+    hookspath=[],
+    runtime_hooks=[],
+    excludes=EXCLUDES,
+    noarchive=False,
+)
+a.binaries = [entry for entry in a.binaries if qt_keep(entry[0])]
+a.datas = [entry for entry in a.datas if qt_keep(entry[0])]
+
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='pointer_app',
+    icon=os.path.join(ROOT, 'icon.ico'),
+    console=False,
+    debug=False,
+    strip=sys.platform != 'win32',
+    upx=False,
+    contents_directory='.',
+)
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=sys.platform != 'win32',
+    upx=False,
+    name='pointer_app',
+)
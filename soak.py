@@ -0,0 +1,210 @@
+import os
+import sys
+import gc
+import json
+import time
+import argparse
+import platform
+import statistics
+import shutil
+import tempfile
+import threading
+import ctypes
+import ctypes.util
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5 import QtWidgets, QtGui, QtCore
+
+import pointer_app
+import benchmark
+
+DEFAULT_OUTPUT = 'soak_results.json'
+WARMUP_CYCLES = 200
+QUICK_CYCLES = 1000
+MOVES_PER_CYCLE = 60
+CLICKS_PER_CYCLE = 20
+TRAY_EVERY = 10
+TRAY_TOGGLES = 5
+BACKDROP_SIDE = 1024
+RSS_GROWTH_LIMIT_KB = 8
+TOLERANCES = {'open_files': 2, 'threads': 2}
+STABLE_KEYS = pointer_app.RESOURCE_KINDS + ('timers', 'active_timers', 'widgets')
+
+def open_files():
+    for path in ('/proc/self/fd', '/dev/fd'):
+        try:
+            return len(os.listdir(path))
+        except OSError:
+            continue
+    return None
+
+def load_malloc_trim():
+    path = ctypes.util.find_library('c')
+    try:
+        return ctypes.CDLL(path).malloc_trim if path else None
+    except (OSError, AttributeError):
+        return None
+
+malloc_trim = load_malloc_trim()
+
+def flush(app):
+    for _ in range(3):
+        app.sendPostedEvents(None, QtCore.QEvent.DeferredDelete)
+        app.processEvents()
+    gc.collect()
+    if malloc_trim is not None:
+        malloc_trim(0)
+
+def take_sample(app, cycle, start):
+    flush(app)
+    sample = {
+        'cycle': cycle,
+        'elapsed_s': time.perf_counter() - start,
+        'rss_bytes': benchmark.rss_bytes(),
+        'open_files': open_files(),
+        'threads': threading.active_count(),
+        'widgets': len(QtWidgets.QApplication.allWidgets()),
+        'python_objects': len(gc.get_objects()),
+    }
+    sample.update(pointer_app.resource_counts())
+    return sample
+
+def drive(app, group, cycle):
+    screen = QtWidgets.QApplication.primaryScreen().geometry()
+    for i, point in enumerate(benchmark.cursor_path('random_walk', MOVES_PER_CYCLE, screen.width(), screen.height(), seed=cycle)):
+        group.handle_pointer_move(point + screen.topLeft())
+        if i % 10 == 0:
+            app.processEvents()
+    for _ in range(CLICKS_PER_CYCLE):
+        group.handle_left_button(True)
+        app.processEvents()
+        group.handle_left_button(False)
+        app.processEvents()
+
+def run_cycle(app, window, cycle):
+    window.start_pointer()
+    group = window.overlay
+    drive(app, group, cycle)
+    screens = window.target_screens()
+    group.set_screens([])
+    group.set_screens(screens)
+    drive(app, group, cycle + 1)
+    window.stop_pointer()
+    app.processEvents()
+
+def run_tray_cycle(app, window, cycle, backdrop):
+    window.settings['tray_mode'] = True
+    window.prewarm_overlay()
+    window.set_backdrop(backdrop)
+    for i in range(TRAY_TOGGLES):
+        window.toggle_pointer()
+        drive(app, window.overlay, cycle + i)
+        window.toggle_pointer()
+        app.processEvents()
+    pyramid = window.overlay.resources.backdrop if window.overlay else None
+    window.set_backdrop('')
+    if pyramid is not None and pyramid.executor is not None:
+        pyramid.executor.shutdown(wait=True)
+    window.settings['tray_mode'] = False
+    if window.overlay:
+        window.overlay.close_overlay()
+    app.processEvents()
+
+def slope(samples, key):
+    points = [(sample['cycle'], sample[key]) for sample in samples if sample[key] is not None]
+    slopes = [(y2 - y1) / (x2 - x1) for i, (x1, y1) in enumerate(points) for x2, y2 in points[i + 1:] if x2 != x1]
+    return statistics.median(slopes) if slopes else 0.0
+
+def verdict(samples, rss_limit_kb):
+    steady = [sample for sample in samples if sample['cycle'] >= WARMUP_CYCLES] or samples
+    first, last = steady[0], steady[-1]
+    failures = []
+    for key in STABLE_KEYS:
+        if last[key] > first[key]:
+            failures.append(f'{key}: {first[key]} -> {last[key]}')
+    for key, tolerance in TOLERANCES.items():
+        if first[key] is not None and last[key] - first[key] > tolerance:
+            failures.append(f'{key}: {first[key]} -> {last[key]}')
+    rss_slope = slope(steady, 'rss_bytes')
+    if rss_slope > rss_limit_kb * 1024:
+        failures.append(f'rss: {rss_slope / 1024:.1f} КБ/цикл (лимит {rss_limit_kb})')
+    return {
+        'steady_from_cycle': first['cycle'],
+        'rss_bytes_per_cycle': rss_slope,
+        'open_files_per_cycle': slope(steady, 'open_files'),
+        'python_objects_per_cycle': slope(steady, 'python_objects'),
+        'failures': failures,
+        'passed': not failures,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Длительный прогон Pointer: циклы включения, переключения экранов и серии кликов')
+    parser.add_argument('--cycles', type=int, default=2000)
+    parser.add_argument('--quick', action='store_true')
+    parser.add_argument('--sample-every', type=int)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--audio', action='store_true', help='настоящий QtMultimedia вместо заглушек')
+    parser.add_argument('--rss-limit-kb', type=float, default=RSS_GROWTH_LIMIT_KB, help='допустимый рост RSS на цикл после прогрева')
+    args = parser.parse_args()
+
+    cycles = QUICK_CYCLES if args.quick else args.cycles
+    sample_every = args.sample_every or max(1, cycles // 50)
+    app = QtWidgets.QApplication(sys.argv)
+    if not args.audio:
+        benchmark.stub_audio()
+    root = tempfile.mkdtemp()
+    benchmark.isolate_user_data(root)
+    backdrop = os.path.join(root, 'backdrop.jpg')
+    benchmark.synthetic_backdrop(backdrop, BACKDROP_SIDE)
+
+    print(f'🔁 Длительный прогон Pointer: {cycles} циклов...')
+    window = benchmark.make_window()
+    window.show()
+    start = time.perf_counter()
+    samples = [take_sample(app, 0, start)]
+    for cycle in range(1, cycles + 1):
+        if cycle % TRAY_EVERY == 0:
+            run_tray_cycle(app, window, cycle, backdrop)
+        else:
+            run_cycle(app, window, cycle)
+        if cycle % sample_every == 0 or cycle == cycles:
+            sample = take_sample(app, cycle, start)
+            samples.append(sample)
+            rss = sample['rss_bytes'] / (1024 * 1024) if sample['rss_bytes'] is not None else 0.0
+            print(
+                f"  цикл {cycle}/{cycles}: RSS {rss:.1f} МБ, оверлеи {sample['overlays']}, "
+                f"звуки {sample['click_voices'] + sample['hold_players']}, таймеры {sample['timers']}, "
+                f"файлы {sample['open_files']}, потоки {sample['threads']}"
+            )
+    window.settings.close()
+    window.close()
+    flush(app)
+    shutil.rmtree(root, ignore_errors=True)
+
+    result = verdict(samples, args.rss_limit_kb)
+    report = {
+        'revision': benchmark.git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'qt': QtCore.QT_VERSION_STR,
+        'platform': platform.platform(),
+        'qpa': QtGui.QGuiApplication.platformName(),
+        'audio': 'qtmultimedia' if args.audio else 'stub',
+        'cycles': cycles,
+        'verdict': result,
+        'samples': samples,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"  RSS: {result['rss_bytes_per_cycle'] / 1024:+.2f} КБ/цикл, файлы: {result['open_files_per_cycle']:+.3f}/цикл")
+    if result['passed']:
+        print(f'✅ Утечек не найдено, результаты в {args.output}')
+        return 0
+    print('❌ Ресурсы растут:')
+    for failure in result['failures']:
+        print(f'  {failure}')
+    return 1
+
+if __name__ == '__main__':
+    sys.exit(main())